@@ -41,6 +41,51 @@ export default function CSVUploadScreen({ navigation }: any) {
     }
   };
 
+  const fetchJSON = async (path: string, token: string | null) => {
+    const response = await fetch(`${API_BASE_URL}${path}`, {
+      headers: { Authorization: `Bearer ${token}` },
+    });
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.error || "Request failed");
+    }
+    return data;
+  };
+
+  const waitForImport = async (jobId: number, token: string | null) => {
+    let job = await fetchJSON(`/bulk/jobs/${jobId}`, token);
+    while (job.status === "queued" || job.status === "running") {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      job = await fetchJSON(`/bulk/jobs/${jobId}`, token);
+    }
+    if (job.status === "failed") {
+      throw new Error(job.error || "Import failed");
+    }
+
+    const created: any[] = [];
+    let page = 1;
+    let hasNext = true;
+    while (hasNext) {
+      const results = await fetchJSON(
+        `/bulk/jobs/${jobId}/results?status=created&page=${page}&per_page=500`,
+        token
+      );
+      created.push(...results.results);
+      hasNext = results.has_next;
+      page += 1;
+    }
+
+    const createdAttendees = created.filter((user) => user.role === "Attendee");
+    const createdAttendants = created.filter((user) => user.role === "Attendant");
+    return {
+      attendees_created: createdAttendees.length,
+      attendants_created: createdAttendants.length,
+      failed_count: job.failed_count,
+      created_attendees: createdAttendees,
+      created_attendants: createdAttendants,
+    };
+  };
+
   const uploadCSV = async () => {
     if (!selectedFile) {
       Alert.alert("No File", "Please select a CSV file first");
@@ -67,13 +112,16 @@ export default function CSVUploadScreen({ navigation }: any) {
         body: formData,
       });
 
-      const data = await response.json();
+      const queued = await response.json();
 
       if (!response.ok) {
-        throw new Error(data.error || "Upload failed");
+        throw new Error(queued.error || "Upload failed");
       }
 
-      // Store results to display passwords
+      // The import runs in the background; wait for the job, then page through the results
+      const data = await waitForImport(queued.job.id, token);
+
+      // Store results to display the created accounts
       setUploadResults(data);
 
       // Show success message
@@ -196,7 +244,7 @@ export default function CSVUploadScreen({ navigation }: any) {
                 <View key={index} style={styles.userCredential}>
                   <Text style={styles.credentialName}>• {user.name}</Text>
                   <Text style={styles.credentialEmail}>  Email: {user.email}</Text>
-                  <Text style={styles.credentialPassword}>  Password: {user.password}</Text>
+                  <Text style={styles.credentialPassword}>  Password: sent in the welcome email</Text>
                   <Text style={styles.credentialUnits}>  Units: {user.units || "None"}</Text>
                 </View>
               ))}
@@ -212,7 +260,7 @@ export default function CSVUploadScreen({ navigation }: any) {
                 <View key={index} style={styles.userCredential}>
                   <Text style={styles.credentialName}>• {user.name}</Text>
                   <Text style={styles.credentialEmail}>  Email: {user.email}</Text>
-                  <Text style={styles.credentialPassword}>  Password: {user.password}</Text>
+                  <Text style={styles.credentialPassword}>  Password: sent in the welcome email</Text>
                   <Text style={styles.credentialUnits}>  Units: {user.units || "None"}</Text>
                 </View>
               ))}
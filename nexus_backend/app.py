@@ -1,3 +1,4 @@
+import click
 from app import create_app, db
 
 app = create_app()
@@ -31,6 +32,34 @@ def create_admin():
 
         print(f'Admin user created: {admin.email} / admin123')
 
+@app.cli.command()
+@click.option('--target-ms', default=250, show_default=True, help='Latency budget for one hash.')
+@click.option('--algorithm', type=click.Choice(['scrypt', 'pbkdf2']), default=None,
+              help='Algorithm to benchmark (defaults to PASSWORD_HASH_ALGORITHM).')
+@click.option('--rounds', default=3, show_default=True, help='Hashes timed per candidate cost.')
+def benchmark_hash(target_ms, algorithm, rounds):
+    """Benchmark password hash costs and recommend one for this host."""
+    from app.utils.hashing import benchmark_costs, hash_method
+
+    algorithm = algorithm or app.config['PASSWORD_HASH_ALGORITHM']
+    print(f'Benchmarking {algorithm} on this host (target {target_ms} ms per hash)')
+    print(f'Current policy: {hash_method(app.config["PASSWORD_HASH_ALGORITHM"], app.config["PASSWORD_HASH_COST"])}')
+
+    recommended = None
+    for cost, median_ms in benchmark_costs(algorithm, rounds=rounds):
+        fits = median_ms <= target_ms
+        if fits:
+            recommended = cost
+        print(f'  cost={cost:<10} {median_ms:>9.2f} ms {"ok" if fits else "over budget"}')
+
+    if recommended is None:
+        print('No candidate fits the budget; raise --target-ms or add CPU.')
+        return
+
+    print(f'Recommended: {hash_method(algorithm, recommended)}')
+    print(f'  PASSWORD_HASH_ALGORITHM={algorithm}')
+    print(f'  PASSWORD_HASH_COST={recommended}')
+
 @app.cli.command()
 def create_attendant():
     """Create a test attendant (teacher) user."""
@@ -85,6 +114,17 @@ def create_attendee():
         print(f' Attendee created: {attendee.email} / student123')
         print(f'   Serial: {attendee.serial}')
 
+@app.cli.command()
+def rebuild_attendance_counters():
+    """Rebuild per-session and per-attendee attendance counters from scratch."""
+    with app.app_context():
+        from app.models.attendance_counts import AttendanceCounts
+
+        sessions, attendees = AttendanceCounts.rebuild(db.session)
+        db.session.commit()
+
+        print(f'Attendance counters rebuilt: {sessions} sessions, {attendees} attendees')
+
 if __name__ == '__main__':
     # Run: flask db upgrade for new tables
     app.run(debug=True, host='0.0.0.0', port=3000)
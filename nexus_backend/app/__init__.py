@@ -24,9 +24,57 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+
+    # Password hashing pool
+    from app.utils.hashing import init_hashing
+    init_hashing(app)
     
     # Import models (needed for migrations)
-    from app.models import admin_model, attendant_model, attendee_model, password_reset, session_model, attendance
+    from app.models import admin_model, attendant_model, attendee_model, password_reset, session_model, attendance, device_model, user_directory, outbound_email, import_job, active_attendance, cache_version, enrollment, attendance_counts
+
+    # Cache of authenticated users for auth_required/admin_required
+    from app.utils.principal_cache import init_principal_cache
+    init_principal_cache(app)
+
+    # In-process registry of active BLE beacons
+    from app.utils.ble_registry import init_ble_registry
+    init_ble_registry(app)
+
+    # In-process index of active sessions by course
+    from app.utils.session_directory import init_session_directory
+    init_session_directory(app)
+
+    # Version counters behind ETags on polled endpoints
+    from app.utils.etag import init_etags
+    init_etags(app)
+
+    # RSSI smoothing for BLE check-ins
+    from app.services.proximity import init_proximity
+    init_proximity(app)
+
+    # Batched last_login writes
+    from app.utils.last_login import init_last_login_buffer
+    init_last_login_buffer(app)
+
+    # Background mail dispatcher
+    from app.utils.email import init_mail
+    init_mail(app)
+
+    # Background CSV import workers
+    from app.services.import_jobs import init_import_jobs
+    init_import_jobs(app)
+
+    # Group-commit check-in writer (opt-in)
+    from app.services.checkin_pipeline import init_checkin_pipeline
+    init_checkin_pipeline(app)
+
+    # Live attendance streams for attendant dashboards
+    from app.services.live_attendance import init_live_attendance
+    init_live_attendance(app)
+
+    # Columnar attendance snapshot behind /reports
+    from app.services.attendance_analytics import init_attendance_analytics
+    init_attendance_analytics(app)
     
     # Register blueprints
     from app.routes.auth_routes import auth_bp
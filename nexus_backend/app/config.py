@@ -41,3 +41,101 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-flask-secret-key')
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
     TESTING = os.getenv('TESTING', 'False').lower() == 'true'
+
+    # Password hashing pool (defaults to one worker per CPU; 0 hashes inline)
+    HASH_POOL_WORKERS = int(os.getenv('HASH_POOL_WORKERS')) if os.getenv('HASH_POOL_WORKERS') else None
+    HASH_POOL_QUEUE_SIZE = int(os.getenv('HASH_POOL_QUEUE_SIZE', '64'))
+    HASH_POOL_TIMEOUT = float(os.getenv('HASH_POOL_TIMEOUT', '30'))
+    HASH_POOL_RETRY_AFTER = int(os.getenv('HASH_POOL_RETRY_AFTER', '2'))
+
+    # Password hashing policy: 'scrypt' (cost = N) or 'pbkdf2' (cost = iterations).
+    # Hashes made with an older policy are upgraded on the next successful login.
+    PASSWORD_HASH_ALGORITHM = os.getenv('PASSWORD_HASH_ALGORITHM', 'scrypt')
+    PASSWORD_HASH_COST = int(os.getenv('PASSWORD_HASH_COST')) if os.getenv('PASSWORD_HASH_COST') else None
+
+    # Per-process cache of authenticated users, keyed by JWT identity
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', '60'))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', '10000'))
+
+    # Seconds between batched last_login writes (0 writes on every login)
+    LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv('LAST_LOGIN_FLUSH_INTERVAL', '5'))
+
+    # Outbound mail: requests enqueue into outbound_emails and a background
+    # dispatcher sends them over pooled SMTP connections
+    MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
+    MAIL_PORT = int(os.getenv('MAIL_PORT', '587'))
+    MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', 'True').lower() == 'true'
+    MAIL_USE_AUTH = os.getenv('MAIL_USE_AUTH', 'True').lower() == 'true'
+    MAIL_USERNAME = os.getenv('MAIL_USERNAME')
+    MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER')
+    MAIL_POOL_SIZE = int(os.getenv('MAIL_POOL_SIZE', '2'))
+    MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', '50'))
+    MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', '5'))
+    MAIL_RETRY_BACKOFF = float(os.getenv('MAIL_RETRY_BACKOFF', '30'))
+    MAIL_POLL_INTERVAL = float(os.getenv('MAIL_POLL_INTERVAL', '5'))
+    # Days to keep emails that failed permanently (their bodies are cleared at once)
+    MAIL_RETENTION_DAYS = float(os.getenv('MAIL_RETENTION_DAYS', '7'))
+
+    # Rows per chunk (and per commit) for CSV user imports
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv('BULK_IMPORT_CHUNK_SIZE', '500'))
+
+    # Parallel password hashing for CSV imports: worker processes (defaults to
+    # one per CPU) and the batch size below which hashing stays inline
+    BULK_HASH_WORKERS = int(os.getenv('BULK_HASH_WORKERS')) if os.getenv('BULK_HASH_WORKERS') else None
+    BULK_HASH_PARALLEL_THRESHOLD = int(os.getenv('BULK_HASH_PARALLEL_THRESHOLD', '64'))
+
+    # Background CSV import jobs: worker threads per process, scheduler poll
+    # interval, and how long a running job may go without a heartbeat before
+    # another worker resumes it. Uploads are kept in IMPORT_UPLOAD_DIR
+    # (defaults to instance/imports) until their job completes.
+    IMPORT_WORKERS = int(os.getenv('IMPORT_WORKERS', '2'))
+    IMPORT_POLL_INTERVAL = float(os.getenv('IMPORT_POLL_INTERVAL', '10'))
+    IMPORT_JOB_STALE_SECONDS = float(os.getenv('IMPORT_JOB_STALE_SECONDS', '300'))
+    IMPORT_UPLOAD_DIR = os.getenv('IMPORT_UPLOAD_DIR')
+
+    # Group-commit check-ins: queue them and let one writer thread commit
+    # everything that arrives within CHECKIN_COMMIT_WINDOW_MS together
+    CHECKIN_GROUP_COMMIT = os.getenv('CHECKIN_GROUP_COMMIT', 'False').lower() == 'true'
+    CHECKIN_COMMIT_WINDOW_MS = float(os.getenv('CHECKIN_COMMIT_WINDOW_MS', '5'))
+    CHECKIN_MAX_BATCH = int(os.getenv('CHECKIN_MAX_BATCH', '500'))
+    CHECKIN_TIMEOUT = float(os.getenv('CHECKIN_TIMEOUT', '10'))
+    # Retry-After (seconds) sent when a check-in times out in the queue
+    CHECKIN_RETRY_AFTER = int(os.getenv('CHECKIN_RETRY_AFTER', '1'))
+
+    # Seconds between checks for beacon changes made by other workers
+    BLE_REGISTRY_CHECK_INTERVAL = float(os.getenv('BLE_REGISTRY_CHECK_INTERVAL', '5'))
+
+    # Seconds between checks for session changes made by other workers
+    # (session discovery endpoints answer from an in-process index)
+    SESSION_DIRECTORY_CHECK_INTERVAL = float(os.getenv('SESSION_DIRECTORY_CHECK_INTERVAL', '2'))
+
+    # Seconds between checks for attendance written by other workers (behind
+    # attendance ETags), and how many ids below the newest row are watched
+    # for rows that commit out of id order
+    ATTENDANCE_VERSION_CHECK_INTERVAL = float(os.getenv('ATTENDANCE_VERSION_CHECK_INTERVAL', '1'))
+    ATTENDANCE_VERSION_LAG_WINDOW = int(os.getenv('ATTENDANCE_VERSION_LAG_WINDOW', '1000'))
+
+    # Seconds a loaded report snapshot is served before attendance changes
+    # trigger a reload (each reload reads the whole attendance table)
+    REPORT_SNAPSHOT_MAX_AGE = float(os.getenv('REPORT_SNAPSHOT_MAX_AGE', '30'))
+
+    # BLE proximity: RSSI samples kept per (student device, beacon), how many
+    # pairs to track, when idle pairs are dropped, and the default thresholds
+    # (sessions can override them; exit defaults to enter - hysteresis)
+    PROXIMITY_WINDOW = int(os.getenv('PROXIMITY_WINDOW', '5'))
+    PROXIMITY_MAX_DEVICES = int(os.getenv('PROXIMITY_MAX_DEVICES', '50000'))
+    PROXIMITY_IDLE_SECONDS = float(os.getenv('PROXIMITY_IDLE_SECONDS', '300'))
+    PROXIMITY_ENTER_THRESHOLD = int(os.getenv('PROXIMITY_ENTER_THRESHOLD', '-65'))
+    PROXIMITY_HYSTERESIS = int(os.getenv('PROXIMITY_HYSTERESIS', '5'))
+
+    # Live attendance streams (SSE): streams per worker, how often other
+    # workers' check-ins are picked up, full recount interval, keep-alive
+    # interval, how many unsent events a client may fall behind by and how
+    # many ids below the newest row are re-checked for late commits
+    LIVE_MAX_CONNECTIONS = int(os.getenv('LIVE_MAX_CONNECTIONS', '100'))
+    LIVE_POLL_INTERVAL = float(os.getenv('LIVE_POLL_INTERVAL', '1'))
+    LIVE_RECOUNT_INTERVAL = float(os.getenv('LIVE_RECOUNT_INTERVAL', '30'))
+    LIVE_HEARTBEAT_SECONDS = float(os.getenv('LIVE_HEARTBEAT_SECONDS', '15'))
+    LIVE_QUEUE_SIZE = int(os.getenv('LIVE_QUEUE_SIZE', '256'))
+    LIVE_LAG_WINDOW = int(os.getenv('LIVE_LAG_WINDOW', '1000'))
@@ -5,6 +5,8 @@ from app.models.attendee_model import Attendee
 from app.models.session_model import Session
 from app.models.attendance import Attendance
 from app.models.password_reset import PasswordReset
+from app.models.user_directory import UserDirectory
+from app.models.outbound_email import OutboundEmail
 
 __all__ = [
     'Admin',
@@ -12,6 +14,8 @@ __all__ = [
     'Attendee',
     'Session',
     'Attendance',
-    'PasswordReset'
+    'PasswordReset',
+    'UserDirectory',
+    'OutboundEmail'
 ]
 
@@ -0,0 +1,98 @@
+from app import db
+from sqlalchemy import event, inspect
+from app.models.attendance import Attendance
+from app.models.session_model import Session
+
+
+class ActiveAttendance(db.Model):
+    """Attendance in sessions that are still running.
+
+    A row exists for every attendance record whose session is active, so
+    "is this attendee already in another active session?" is one indexed
+    lookup instead of a scan over every active session. Rows are added when
+    attendance is recorded or a session (re)starts, and removed when a
+    session ends; mapper events below cover ORM writes and ``sync`` covers
+    bulk statements.
+    """
+    __tablename__ = 'active_attendance'
+
+    attendee_id = db.Column(db.Integer, db.ForeignKey('attendees.id'), primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('sessions.id'), primary_key=True, index=True)
+
+    @staticmethod
+    def conflicting_session(attendee_id, session_id):
+        """Return (id, title) of another active session the attendee is in, or None"""
+        return db.session.execute(
+            db.select(Session.id, Session.title)
+            .join(ActiveAttendance, ActiveAttendance.session_id == Session.id)
+            .where(ActiveAttendance.attendee_id == attendee_id, ActiveAttendance.session_id != session_id)
+            .limit(1)
+        ).first()
+
+    @staticmethod
+    def conflicting_attendees(attendee_ids, session_id):
+        """Subset of attendee_ids already in a different active session"""
+        if not attendee_ids:
+            return set()
+        return set(db.session.execute(
+            db.select(ActiveAttendance.attendee_id).where(
+                ActiveAttendance.attendee_id.in_(attendee_ids),
+                ActiveAttendance.session_id != session_id
+            )
+        ).scalars())
+
+    @staticmethod
+    def sync(connection, *criteria):
+        """Add rows for attendance in active sessions matching ``criteria``.
+
+        ``connection`` may be a Connection or the ORM session; rows already
+        present are skipped.
+        """
+        table = ActiveAttendance.__table__
+        attendance = Attendance.__table__
+        sessions = Session.__table__
+        already_active = db.select(table.c.attendee_id).where(
+            table.c.attendee_id == attendance.c.attendee_id,
+            table.c.session_id == attendance.c.session_id
+        ).exists()
+        connection.execute(table.insert().from_select(
+            ['attendee_id', 'session_id'],
+            db.select(attendance.c.attendee_id, attendance.c.session_id)
+            .join(sessions, sessions.c.id == attendance.c.session_id)
+            .where(sessions.c.is_active == True, ~already_active, *criteria)
+        ))
+
+    @staticmethod
+    def clear_session(connection, session_id):
+        """Remove every row for a session that has ended"""
+        table = ActiveAttendance.__table__
+        connection.execute(table.delete().where(table.c.session_id == session_id))
+
+
+@event.listens_for(Attendance, 'after_insert')
+def _attendance_inserted(mapper, connection, target):
+    ActiveAttendance.sync(connection, Attendance.__table__.c.id == target.id)
+
+
+@event.listens_for(Attendance, 'after_delete')
+def _attendance_deleted(mapper, connection, target):
+    table = ActiveAttendance.__table__
+    connection.execute(table.delete().where(
+        table.c.attendee_id == target.attendee_id,
+        table.c.session_id == target.session_id
+    ))
+
+
+@event.listens_for(Session, 'after_update')
+def _session_updated(mapper, connection, target):
+    if not inspect(target).attrs.is_active.history.has_changes():
+        return
+    if target.is_active:
+        ActiveAttendance.sync(connection, Attendance.__table__.c.session_id == target.id)
+    else:
+        ActiveAttendance.clear_session(connection, target.id)
+
+
+@event.listens_for(Session, 'before_delete')
+def _session_deleted(mapper, connection, target):
+    ActiveAttendance.clear_session(connection, target.id)
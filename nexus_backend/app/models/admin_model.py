@@ -1,8 +1,10 @@
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.models.user_directory import UserDirectory
+from app.models.user_mixin import UserMixin
+from app.utils.last_login import last_login_buffer
 from datetime import datetime, timezone
 
-class Admin(db.Model):
+class Admin(UserMixin, db.Model):
     __tablename__ = 'admins'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -12,22 +14,16 @@ class Admin(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
     last_login = db.Column(db.DateTime, nullable=True)
     
-    def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
-    
-    def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
-    
-    def update_last_login(self):
-        self.last_login = datetime.now(timezone.utc)
-        db.session.commit()
-    
     def to_dict(self):
+        last_login = last_login_buffer.last_login(self)
         return {
             'id': self.id,
             'name': self.name,
             'email': self.email,
             'role': 'Admin',
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
-        }
\ No newline at end of file
+            'last_login': last_login.isoformat() if last_login else None
+        }
+
+
+UserDirectory.track(Admin, 'Admin')
@@ -10,6 +10,13 @@ class Attendance(db.Model):
     status = db.Column(db.String(20), default='Present')  # Present, Absent, Late
     timestamp = db.Column(db.DateTime, default=datetime.now(timezone.utc))
 
+    # One record per attendee per session, so concurrent submissions upsert
+    __table_args__ = (
+        db.UniqueConstraint('attendee_id', 'session_id', name='uq_attendance_attendee_session'),
+        # The unique constraint leads with attendee_id; this covers per-session lookups
+        db.Index('ix_attendance_session_id', 'session_id'),
+    )
+
     # Relationships
     attendee = db.relationship("Attendee", backref="attendance_records")
     session = db.relationship("Session", backref="attendance_records")
@@ -0,0 +1,200 @@
+from app import db
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.attendance import Attendance
+from app.models.attendee_model import Attendee
+from app.models.session_model import Session
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE, for adding to counters in one statement
+COUNTER_UPSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+class SessionAttendanceCount(db.Model):
+    """Attendance rows (total and Present) recorded for one session"""
+    __tablename__ = 'session_attendance_counts'
+
+    session_id = db.Column(db.Integer, db.ForeignKey('sessions.id'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    present = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AttendeeAttendanceCount(db.Model):
+    """Attendance rows (total and Present) recorded for one attendee"""
+    __tablename__ = 'attendee_attendance_counts'
+
+    attendee_id = db.Column(db.Integer, db.ForeignKey('attendees.id'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    present = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AttendanceCounts:
+    """Materialised attendance counters per session and per attendee.
+
+    Counters change in the same transaction as the attendance rows they
+    count, so reads never need to scan ``attendance``: new check-ins add
+    to them with one upsert per counter table (``add``), bulk status
+    changes recount just the affected keys (``refresh``), mapper events
+    below cover ORM writes, and ``rebuild`` recomputes everything (see
+    ``flask rebuild-attendance-counters``). ``connection`` may be a
+    Connection or the ORM session throughout.
+    """
+
+    COUNTERS = ((SessionAttendanceCount, 'session_id'), (AttendeeAttendanceCount, 'attendee_id'))
+
+    @staticmethod
+    def _present(column):
+        return db.func.coalesce(db.func.sum(db.case((column == 'Present', 1), else_=0)), 0)
+
+    @staticmethod
+    def sessions_with_counts(*criteria):
+        """(session, total, present) for the sessions matching ``criteria``"""
+        return db.session.execute(
+            db.select(Session,
+                      db.func.coalesce(SessionAttendanceCount.total, 0),
+                      db.func.coalesce(SessionAttendanceCount.present, 0))
+            .outerjoin(SessionAttendanceCount, SessionAttendanceCount.session_id == Session.id)
+            .where(*criteria)
+            .order_by(Session.id)
+        ).all()
+
+    @staticmethod
+    def for_attendee(attendee_id):
+        """(total, present) attendance rows recorded for one attendee"""
+        counter = db.session.get(AttendeeAttendanceCount, attendee_id)
+        return (counter.total, counter.present) if counter else (0, 0)
+
+    @staticmethod
+    def add(connection, changes):
+        """Apply (attendee_id, session_id, total delta, present delta) changes"""
+        changes = list(changes)
+        if not changes:
+            return
+        bind = connection if hasattr(connection, 'dialect') else connection.get_bind()
+        insert = COUNTER_UPSERTS.get(bind.dialect.name)
+        for model, key in AttendanceCounts.COUNTERS:
+            deltas = {}
+            for attendee_id, session_id, total, present in changes:
+                counter = deltas.setdefault(attendee_id if key == 'attendee_id' else session_id, [0, 0])
+                counter[0] += total
+                counter[1] += present
+            # Fixed key order so concurrent writers lock counter rows in the same order
+            rows = [{key: value, 'total': total, 'present': present}
+                    for value, (total, present) in sorted(deltas.items()) if total or present]
+            if not rows:
+                continue
+            table = model.__table__
+            if insert is not None:
+                stmt = insert(table)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c[key]],
+                    set_={'total': table.c.total + stmt.excluded.total,
+                          'present': table.c.present + stmt.excluded.present}
+                )
+                connection.execute(stmt, rows)
+                continue
+
+            existing = set(connection.execute(
+                db.select(table.c[key]).where(table.c[key].in_([row[key] for row in rows]))
+            ).scalars())
+            updates = [row for row in rows if row[key] in existing]
+            inserts = [row for row in rows if row[key] not in existing]
+            if updates:
+                connection.execute(
+                    table.update()
+                    .where(table.c[key] == db.bindparam('b_key'))
+                    .values(total=table.c.total + db.bindparam('b_total'),
+                            present=table.c.present + db.bindparam('b_present')),
+                    [{'b_key': row[key], 'b_total': row['total'], 'b_present': row['present']} for row in updates]
+                )
+            if inserts:
+                connection.execute(table.insert(), inserts)
+
+    @staticmethod
+    def refresh(connection, session_ids=(), attendee_ids=()):
+        """Recount the given sessions and attendees from the attendance table"""
+        attendance = Attendance.__table__
+        for (model, key), ids in zip(AttendanceCounts.COUNTERS, (session_ids, attendee_ids)):
+            ids = sorted(set(ids))
+            if not ids:
+                continue
+            table = model.__table__
+            connection.execute(table.delete().where(table.c[key].in_(ids)))
+            connection.execute(table.insert().from_select(
+                [key, 'total', 'present'],
+                db.select(attendance.c[key], db.func.count(), AttendanceCounts._present(attendance.c.status))
+                .where(attendance.c[key].in_(ids))
+                .group_by(attendance.c[key])
+            ))
+
+    @staticmethod
+    def rebuild(connection):
+        """Recompute every counter from scratch; returns (sessions, attendees) counted"""
+        attendance = Attendance.__table__
+        counted = []
+        for model, key in AttendanceCounts.COUNTERS:
+            table = model.__table__
+            connection.execute(table.delete())
+            connection.execute(table.insert().from_select(
+                [key, 'total', 'present'],
+                db.select(attendance.c[key], db.func.count(), AttendanceCounts._present(attendance.c.status))
+                .group_by(attendance.c[key])
+            ))
+            counted.append(connection.execute(db.select(db.func.count()).select_from(table)).scalar())
+        return tuple(counted)
+
+
+def _is_present(status):
+    return 1 if status == 'Present' else 0
+
+
+@event.listens_for(Attendance, 'after_insert')
+def _attendance_inserted(mapper, connection, target):
+    AttendanceCounts.add(connection, [(target.attendee_id, target.session_id, 1, _is_present(target.status))])
+
+
+def _load_previous_key(target, value, oldvalue, initiator):
+    # active_history loads the old value before it is replaced, so a row moved
+    # to another session or attendee can still be taken off the old counter
+    return value
+
+
+for _column in (Attendance.attendee_id, Attendance.session_id):
+    event.listen(_column, 'set', _load_previous_key, active_history=True, retval=True)
+
+
+@event.listens_for(Attendance, 'after_update')
+def _attendance_updated(mapper, connection, target):
+    attrs = inspect(target).attrs
+    histories = [attrs[key].history for key in ('attendee_id', 'session_id', 'status')]
+    if not any(history.has_changes() for history in histories):
+        return
+    old = [history.deleted[0] if history.has_changes() and history.deleted else value
+           for history, value in zip(histories, (target.attendee_id, target.session_id, target.status))]
+    if histories[2].has_changes() and not histories[2].deleted:
+        # Previous status wasn't loaded; recount the old and current keys instead
+        AttendanceCounts.refresh(connection, {old[1], target.session_id}, {old[0], target.attendee_id})
+        return
+    AttendanceCounts.add(connection, [
+        (old[0], old[1], -1, -_is_present(old[2])),
+        (target.attendee_id, target.session_id, 1, _is_present(target.status)),
+    ])
+
+
+@event.listens_for(Attendance, 'after_delete')
+def _attendance_deleted(mapper, connection, target):
+    AttendanceCounts.add(connection, [(target.attendee_id, target.session_id, -1, -_is_present(target.status))])
+
+
+@event.listens_for(Session, 'before_delete')
+def _session_deleted(mapper, connection, target):
+    table = SessionAttendanceCount.__table__
+    connection.execute(table.delete().where(table.c.session_id == target.id))
+
+
+@event.listens_for(Attendee, 'before_delete')
+def _attendee_deleted(mapper, connection, target):
+    table = AttendeeAttendanceCount.__table__
+    connection.execute(table.delete().where(table.c.attendee_id == target.id))
@@ -1,9 +1,11 @@
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.models.user_directory import UserDirectory
+from app.models.user_mixin import UserMixin
+from app.utils.last_login import last_login_buffer
 from datetime import datetime, timezone
 
 
-class Attendee(db.Model):
+class Attendee(UserMixin, db.Model):
     __tablename__ = 'attendees'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -14,21 +16,12 @@ class Attendee(db.Model):
     units = db.Column(db.Text, nullable=True)  # Comma-separated list of units/classes
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
     last_login = db.Column(db.DateTime, nullable=True)
-    
-    def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
-    
-    def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
-    
-    def generate_serial(self):
-        self.serial = f"A-{1000 + self.id}"
-    
-    def update_last_login(self):
-        self.last_login = datetime.now(timezone.utc)
-        db.session.commit()
+
+    SERIAL_PREFIX = 'A-'
+    SERIAL_OFFSET = 1000
     
     def to_dict(self):
+        last_login = last_login_buffer.last_login(self)
         return {
             'id': self.id,
             'name': self.name,
@@ -37,5 +30,8 @@ class Attendee(db.Model):
             'serial': self.serial,
             'units': self.units.split(',') if self.units else [],
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
-        }
\ No newline at end of file
+            'last_login': last_login.isoformat() if last_login else None
+        }
+
+
+UserDirectory.track(Attendee, 'Attendee')
@@ -0,0 +1,59 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app import db
+
+# Dialects with INSERT ... ON CONFLICT (name) DO UPDATE
+VERSION_UPSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+class CacheVersion(db.Model):
+    """Version counters for per-process caches shared across workers.
+
+    Writers bump a named counter in the same transaction as the change;
+    each worker compares the counter with the version it loaded and
+    rebuilds its cache when they differ.
+    """
+    __tablename__ = 'cache_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def current(name):
+        """Current version of a cache (0 if it was never bumped)"""
+        version = db.session.execute(
+            db.select(CacheVersion.version).where(CacheVersion.name == name)
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump(connection, name):
+        """Increment a cache version; ``connection`` may be a Connection or the ORM session.
+
+        A single upsert where the dialect supports it, so concurrent first
+        bumps of a name can't fail the caller's transaction.
+        """
+        table = CacheVersion.__table__
+        bind = connection if hasattr(connection, 'dialect') else connection.get_bind()
+        insert = VERSION_UPSERTS.get(bind.dialect.name)
+        if insert is not None:
+            stmt = insert(table).values(name=name, version=1)
+            connection.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={'version': table.c.version + 1}
+            ))
+            return
+
+        increment = table.update().where(table.c.name == name).values(version=table.c.version + 1)
+        if connection.execute(increment).rowcount:
+            return
+        # First bump of this name: insert in a savepoint, so losing the race
+        # to another writer only rolls back the insert
+        try:
+            with connection.begin_nested():
+                connection.execute(table.insert().values(name=name, version=1))
+        except IntegrityError:
+            connection.execute(increment)
@@ -0,0 +1,100 @@
+from app import db
+from sqlalchemy import event, inspect
+from app.models.attendee_model import Attendee
+from app.models.session_model import Session
+
+
+def parse_units(units):
+    """Course codes in a comma-separated units string, stripped and de-duplicated in order"""
+    if not units:
+        return []
+    seen = {}
+    for unit in units.split(','):
+        unit = unit.strip()
+        if unit:
+            seen.setdefault(unit, None)
+    return list(seen)
+
+
+class Enrollment(db.Model):
+    """Attendee enrollments, one row per (attendee, course code).
+
+    ``Attendee.units`` stays the comma-separated form the API reads and
+    writes; this table indexes it both ways, so "which courses is this
+    attendee in" and "who is enrolled in course X" are index lookups and
+    schedule/roster queries are joins instead of string parsing. Mapper
+    events below keep it in step with ORM writes to ``units``; ``sync``
+    covers bulk statements.
+    """
+    __tablename__ = 'enrollments'
+
+    attendee_id = db.Column(db.Integer, db.ForeignKey('attendees.id'), primary_key=True)
+    course_code = db.Column(db.String(50), primary_key=True)
+
+    # The primary key covers (attendee_id, course_code); this covers rosters
+    __table_args__ = (
+        db.Index('ix_enrollments_course_attendee', 'course_code', 'attendee_id'),
+    )
+
+    @staticmethod
+    def courses_for(attendee_id):
+        """Course codes an attendee is enrolled in"""
+        return db.session.execute(
+            db.select(Enrollment.course_code)
+            .where(Enrollment.attendee_id == attendee_id)
+            .order_by(Enrollment.course_code)
+        ).scalars().all()
+
+    @staticmethod
+    def roster(course_code):
+        """Attendees enrolled in a course"""
+        return db.session.execute(
+            db.select(Attendee)
+            .join(Enrollment, Enrollment.attendee_id == Attendee.id)
+            .where(Enrollment.course_code == course_code)
+            .order_by(Attendee.id)
+        ).scalars().all()
+
+    @staticmethod
+    def sessions_for(attendee_id, *criteria):
+        """Sessions of the courses an attendee is enrolled in"""
+        return db.session.execute(
+            db.select(Session)
+            .join(Enrollment, Enrollment.course_code == Session.course_code)
+            .where(Enrollment.attendee_id == attendee_id, *criteria)
+            .order_by(Session.id)
+        ).scalars().all()
+
+    @staticmethod
+    def sync(connection, units_by_attendee):
+        """Replace the enrollments of each attendee from its units string.
+
+        ``units_by_attendee`` maps attendee id -> units; ``connection`` may
+        be a Connection or the ORM session.
+        """
+        if not units_by_attendee:
+            return
+        table = Enrollment.__table__
+        connection.execute(table.delete().where(table.c.attendee_id.in_(list(units_by_attendee))))
+        rows = [{'attendee_id': attendee_id, 'course_code': course_code}
+                for attendee_id, units in units_by_attendee.items()
+                for course_code in parse_units(units)]
+        if rows:
+            connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Attendee, 'after_insert')
+def _attendee_inserted(mapper, connection, target):
+    if target.units:
+        Enrollment.sync(connection, {target.id: target.units})
+
+
+@event.listens_for(Attendee, 'after_update')
+def _attendee_updated(mapper, connection, target):
+    if inspect(target).attrs.units.history.has_changes():
+        Enrollment.sync(connection, {target.id: target.units})
+
+
+@event.listens_for(Attendee, 'before_delete')
+def _attendee_deleted(mapper, connection, target):
+    Enrollment.sync(connection, {target.id: None})
@@ -0,0 +1,84 @@
+from app import db
+from app.utils.clock import utcnow
+
+
+class ImportJob(db.Model):
+    """A CSV user import executed in the background.
+
+    ``rows_processed`` is updated in the same transaction as each imported
+    chunk, so an interrupted job resumes right after its last committed
+    chunk.
+    """
+    __tablename__ = 'import_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    role = db.Column(db.String(20), nullable=True)  # Attendee, Attendant, or None for mixed uploads
+    file_path = db.Column(db.String(500), nullable=False)
+    filename = db.Column(db.String(255), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    created_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_count = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=True)
+    claimed_by = db.Column(db.String(32), nullable=True)
+    created_at = db.Column(db.DateTime, default=utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def throughput(self):
+        """Rows processed per second since the job started"""
+        if not self.started_at:
+            return 0
+        elapsed = ((self.finished_at or utcnow()) - self.started_at).total_seconds()
+        return round(self.rows_processed / elapsed, 2) if elapsed > 0 else 0
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'role': self.role or 'Mixed',
+            'filename': self.filename,
+            'status': self.status,
+            'rows_processed': self.rows_processed,
+            'created_count': self.created_count,
+            'failed_count': self.failed_count,
+            'rows_per_second': self.throughput(),
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class ImportJobResult(db.Model):
+    """Per-row outcome of an import job, fetched page by page.
+
+    Temporary passwords are not stored; they only go out in the welcome email.
+    """
+    __tablename__ = 'import_job_results'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('import_jobs.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # created, failed
+    name = db.Column(db.String(100), nullable=True)
+    email = db.Column(db.String(120), nullable=True)
+    role = db.Column(db.String(20), nullable=True)
+    serial = db.Column(db.String(20), nullable=True)
+    units = db.Column(db.Text, nullable=True)
+    reason = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_import_job_results_job_status', 'job_id', 'status', 'id'),
+    )
+
+    def to_dict(self):
+        if self.status == 'failed':
+            return {'email': self.email, 'reason': self.reason}
+        return {
+            'name': self.name,
+            'email': self.email,
+            'role': self.role,
+            'serial': self.serial,
+            'units': self.units or ''
+        }
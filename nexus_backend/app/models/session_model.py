@@ -8,9 +8,11 @@ class Session(db.Model):
     title = db.Column(db.String(120), nullable=False)  # Session name
     attendant_name = db.Column(db.String(120), nullable=False)  # Attendant name
     schedule = db.Column(db.String(200), nullable=False)  # Schedule info
-    course_code = db.Column(db.String(50), nullable=False)  # Course code
+    course_code = db.Column(db.String(50), nullable=False, index=True)  # Course code
     is_active = db.Column(db.Boolean, default=True)
     members = db.Column(db.Text, nullable=True)  # JSON string of member IDs
+    rssi_enter_threshold = db.Column(db.Integer, nullable=True)  # dBm to count as present (default PROXIMITY_ENTER_THRESHOLD)
+    rssi_exit_threshold = db.Column(db.Integer, nullable=True)  # dBm to stop counting as present (default enter - PROXIMITY_HYSTERESIS)
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
 
     # Foreign key to attendant/creator
@@ -30,6 +32,8 @@ class Session(db.Model):
             'courseCode': self.course_code,
             'isActive': self.is_active,
             'members': json.loads(self.members) if self.members else [],
+            'rssiEnterThreshold': self.rssi_enter_threshold,
+            'rssiExitThreshold': self.rssi_exit_threshold,
             'createdAt': self.created_at.isoformat() if self.created_at else None
         }
 
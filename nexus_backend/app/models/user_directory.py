@@ -0,0 +1,90 @@
+from app import db
+from sqlalchemy import event, inspect
+
+
+def normalize_email(email):
+    """Normalise an email address for directory lookups"""
+    return (email or '').strip().lower()
+
+
+class UserDirectory(db.Model):
+    """Identity index over admins, attendants and attendees.
+
+    One row per account, keyed on the case-normalised email, so auth
+    endpoints resolve role and id with a single indexed lookup instead of
+    probing each user table in turn. Rows are maintained by mapper events
+    registered through ``UserDirectory.track``.
+    """
+    __tablename__ = 'user_directory'
+
+    email = db.Column(db.String(120), primary_key=True)
+    role = db.Column(db.String(20), nullable=False)  # Admin, Attendant, Attendee
+    user_id = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('role', 'user_id', name='uq_user_directory_role_user'),
+    )
+
+    # role -> model class, filled in by track()
+    models = {}
+
+    @staticmethod
+    def lookup(email):
+        """Return the directory entry for an email, or None"""
+        email = normalize_email(email)
+        if not email:
+            return None
+        return db.session.get(UserDirectory, email)
+
+    @staticmethod
+    def exists(email):
+        """Check if an email is registered under any role"""
+        return UserDirectory.lookup(email) is not None
+
+    @staticmethod
+    def find_user(email):
+        """Return the Admin/Attendant/Attendee owning an email, or None"""
+        entry = UserDirectory.lookup(email)
+        return entry.get_user() if entry else None
+
+    def get_user(self):
+        """Load the user row this entry points at"""
+        model = UserDirectory.models.get(self.role)
+        return db.session.get(model, self.user_id) if model else None
+
+    @property
+    def token_identity(self):
+        """JWT identity for this user (e.g. "attendee_6")"""
+        return f"{self.role.lower()}_{self.user_id}"
+
+    @staticmethod
+    def track(model, role):
+        """Keep the directory in sync with inserts, email changes and deletes on a user model"""
+        UserDirectory.models[role] = model
+        table = UserDirectory.__table__
+
+        @event.listens_for(model, 'after_insert')
+        def _after_insert(mapper, connection, target):
+            connection.execute(table.insert().values(
+                email=normalize_email(target.email),
+                role=role,
+                user_id=target.id
+            ))
+
+        @event.listens_for(model, 'after_update')
+        def _after_update(mapper, connection, target):
+            if not inspect(target).attrs.email.history.has_changes():
+                return
+            connection.execute(
+                table.update()
+                .where(table.c.role == role, table.c.user_id == target.id)
+                .values(email=normalize_email(target.email))
+            )
+
+        @event.listens_for(model, 'after_delete')
+        def _after_delete(mapper, connection, target):
+            connection.execute(
+                table.delete().where(table.c.role == role, table.c.user_id == target.id)
+            )
+
+        return model
@@ -0,0 +1,48 @@
+from app import db
+from app.utils.last_login import last_login_buffer
+from app.utils.hashing import hash_password, verify_password, password_needs_rehash, HashingPoolBusy
+
+
+class UserMixin:
+    """Password, serial and last-login behaviour shared by the user models.
+
+    Serials are ``SERIAL_PREFIX`` followed by ``SERIAL_OFFSET + id``; models
+    without a serial column leave ``SERIAL_PREFIX`` as None.
+    """
+
+    SERIAL_PREFIX = None
+    SERIAL_OFFSET = 0
+
+    def set_password(self, password):
+        self.password_hash = hash_password(password)
+
+    def check_password(self, password):
+        if not verify_password(self.password_hash, password):
+            return False
+        if password_needs_rehash(self.password_hash):
+            self.upgrade_password_hash(password)
+        return True
+
+    def upgrade_password_hash(self, password):
+        """Re-hash with the current policy; skipped if the hashing pool is busy"""
+        try:
+            self.set_password(password)
+        except HashingPoolBusy:
+            return
+        db.session.commit()
+
+    def generate_serial(self):
+        if self.SERIAL_PREFIX is not None:
+            self.serial = self.serial_for(self.id)
+
+    @classmethod
+    def serial_for(cls, user_id):
+        return f"{cls.SERIAL_PREFIX}{cls.SERIAL_OFFSET + user_id}"
+
+    @classmethod
+    def serial_expression(cls):
+        """SQL expression deriving the serial from id, for set-based updates"""
+        return db.literal(cls.SERIAL_PREFIX) + db.cast(cls.id + cls.SERIAL_OFFSET, db.String)
+
+    def update_last_login(self):
+        last_login_buffer.record(self)
@@ -3,8 +3,14 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.attendance import Attendance
 from app.models.attendee_model import Attendee
-from app.services.bluetoothservive import is_attendance_valid
-from app.schemas.attendance_schema import AttendanceMarkSchema, AttendanceResponseSchema
+from app.services.bluetoothservive import is_attendance_valid, validate_observations
+from app.services.attendance_services import AttendanceService
+from app.services.checkin_pipeline import CheckinTimeout, checkin_pipeline, checkin_timeout_response
+from app.services.proximity import proximity_engine
+from app.utils.ble_registry import ble_registry
+from app.utils.fingerprint import clean_ble_id
+from app.utils.principal_cache import parse_identity
+from app.schemas.attendance_schema import AttendanceMarkSchema, AttendanceResponseSchema, BleBatchSchema
 from datetime import datetime, timezone
 
 attendance_bp = Blueprint('attendance_bp', __name__)
@@ -13,7 +19,9 @@ attendance_bp = Blueprint('attendance_bp', __name__)
 @jwt_required()
 def mark_attendance_ble():
     """Main check-in API endpoint for BLE-based attendance"""
-    current_user_id = get_jwt_identity()
+    role, attendee_id = parse_identity(get_jwt_identity())
+    if role != 'Attendee':
+        return jsonify({'error': 'Only attendees can check in'}), 403
     schema = AttendanceMarkSchema()
     
     try:
@@ -21,11 +29,25 @@ def mark_attendance_ble():
     except Exception as e:
         return jsonify({'error': 'Invalid input data', 'details': str(e)}), 400
     
-    # Validate BLE attendance using Grace's logic
+    # Route the scan to the active session run by the beacon's attendant
+    try:
+        route = ble_registry.route(clean_ble_id(data['admin_ble_raw']))
+    except ValueError:
+        route = None
+    if not route:
+        return jsonify({
+            'status': 'FAILED',
+            'message': 'No active session found for this beacon'
+        }), 400
+    session_id, enter_threshold, exit_threshold = route
+    
+    # Validate BLE attendance using Grace's logic, smoothed with the session's thresholds
     result = is_attendance_valid(
         admin_ble_raw=data['admin_ble_raw'],
         student_ble_raw=data['student_ble_raw'],
-        student_rssi_raw=data['student_rssi_raw']
+        student_rssi_raw=data['student_rssi_raw'],
+        rssi_threshold=enter_threshold,
+        exit_threshold=exit_threshold
     )
     
     if result == 'NO':
@@ -34,31 +56,100 @@ def mark_attendance_ble():
             'message': 'Attendance validation failed - weak signal or inactive session'
         }), 400
     
-    # Find active session (simplified - assumes one active session)
+    # Record attendance (group-committed when CHECKIN_GROUP_COMMIT is on)
+    try:
+        attendance, created = checkin_pipeline.check_in(attendee_id, session_id)
+    except CheckinTimeout as e:
+        return checkin_timeout_response(e)
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error marking BLE attendance: {str(e)}")
+        return jsonify({'error': 'Failed to mark attendance'}), 500
+    
+    return jsonify({
+        'status': 'SUCCESS',
+        'message': 'Attendance marked successfully' if created else 'Attendance already marked',
+        'attendance': attendance
+    }), 201 if created else 200
+
+@attendance_bp.route('/attendance/mark-ble/batch', methods=['POST'])
+@jwt_required()
+def mark_attendance_ble_batch():
+    """Batch check-in for attendant phones and room gateways.
+
+    Checks the beacon belongs to the calling attendant and validates it
+    once, runs every reading through the proximity engine with the
+    session's thresholds and records attendance for every accepted student
+    in one commit.
+    """
+    role, attendant_id = parse_identity(get_jwt_identity())
+    if role != 'Attendant':
+        return jsonify({'error': 'Only attendants can upload scan batches'}), 403
+
+    try:
+        data = BleBatchSchema().load(request.json or {})
+    except Exception as e:
+        return jsonify({'error': 'Invalid input data', 'details': str(e)}), 400
+
+    # The beacon must be one of this attendant's, so one attendant can't
+    # check students into another attendant's session
+    try:
+        beacon_owner = ble_registry.attendant_for(clean_ble_id(data['admin_ble_raw']))
+    except ValueError:
+        beacon_owner = None
+    if beacon_owner is None:
+        return jsonify({
+            'status': 'FAILED',
+            'message': 'Beacon is not registered or not active'
+        }), 400
+    if beacon_owner != attendant_id:
+        return jsonify({
+            'status': 'FAILED',
+            'message': 'Beacon belongs to another attendant'
+        }), 403
+
     from app.models.session_model import Session
-    active_session = Session.query.filter_by(is_active=True).first()
+    sessions = Session.query.filter_by(attendant_id=attendant_id, is_active=True)
+    if data.get('session_id') is not None:
+        sessions = sessions.filter_by(id=data['session_id'])
+    active_session = sessions.first()
     if not active_session:
         return jsonify({
             'status': 'FAILED',
             'message': 'No active session found'
         }), 400
-    
-    # Create attendance record
-    attendance = Attendance(
-        attendee_id=current_user_id,
-        session_id=active_session.id,
-        status='Present',
-        timestamp=datetime.now(timezone.utc)
+
+    session_id = active_session.id
+    observations = data['observations']
+    beacon_ok, verdicts = validate_observations(
+        data['admin_ble_raw'],
+        [(obs['student_ble_raw'], obs['student_rssi_raw']) for obs in observations],
+        *proximity_engine.thresholds(active_session)
     )
-    
-    db.session.add(attendance)
-    db.session.commit()
-    
+    if not beacon_ok:
+        return jsonify({
+            'status': 'FAILED',
+            'message': 'Beacon is not registered or not active'
+        }), 400
+
+    try:
+        results, created = AttendanceService.record_observations(session_id, observations, verdicts)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error recording scan batch: {str(e)}")
+        return jsonify({'error': 'Failed to record attendance'}), 500
+
+    accepted = sum(1 for result in results if result['verdict'] == 'YES')
     return jsonify({
         'status': 'SUCCESS',
-        'message': 'Attendance marked successfully',
-        'attendance': AttendanceResponseSchema().dump(attendance.to_dict())
-    }), 201
+        'session_id': session_id,
+        'observations': len(results),
+        'accepted': accepted,
+        'rejected': len(results) - accepted,
+        'results': results,
+        'attendance_created': created
+    }), 200
 
 @attendance_bp.route('/attendance/history', methods=['GET'])
 @jwt_required()
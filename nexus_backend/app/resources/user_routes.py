@@ -3,7 +3,9 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.attendant_model import Attendant
 from app.models.attendee_model import Attendee
+from app.models.user_directory import UserDirectory
 from app.schemas.user_schema import UserCreateSchema, UserResponseSchema
+from app.utils.hashing import HashingPoolBusy, hashing_busy_response
 
 user_bp = Blueprint('user_bp', __name__)
 
@@ -12,12 +14,19 @@ user_bp = Blueprint('user_bp', __name__)
 def create_attendant():
     schema = UserCreateSchema()
     data = schema.load(request.json)
+
+    # Emails are unique across every role
+    if UserDirectory.exists(data['email']):
+        return jsonify({'error': 'Email already exists'}), 400
     
     attendant = Attendant(
         name=data['name'],
         email=data['email']
     )
-    attendant.set_password(data['password'])
+    try:
+        attendant.set_password(data['password'])
+    except HashingPoolBusy as e:
+        return hashing_busy_response(e)
     
     db.session.add(attendant)
     db.session.commit()
@@ -31,12 +40,19 @@ def create_attendant():
 def create_attendee():
     schema = UserCreateSchema()
     data = schema.load(request.json)
+
+    # Emails are unique across every role
+    if UserDirectory.exists(data['email']):
+        return jsonify({'error': 'Email already exists'}), 400
     
     attendee = Attendee(
         name=data['name'],
         email=data['email']
     )
-    attendee.set_password(data['password'])
+    try:
+        attendee.set_password(data['password'])
+    except HashingPoolBusy as e:
+        return hashing_busy_response(e)
     
     db.session.add(attendee)
     db.session.commit()
@@ -4,9 +4,12 @@ from app.models.admin_model import Admin
 from app.models.attendant_model import Attendant
 from app.models.attendee_model import Attendee
 from app.models.session_model import Session
+from app.models.user_directory import UserDirectory
 from app.utils.auth import admin_required
 from app.utils.email import send_welcome_email
+from app.utils.hashing import HashingPoolBusy, hashing_busy_response, hashing_pool
 import secrets
+from datetime import datetime, timezone
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -53,9 +56,7 @@ def create_user(current_user_id):
         email = data['email']
 
         # Check if email exists
-        if (Admin.query.filter_by(email=email).first() or
-            Attendant.query.filter_by(email=email).first() or
-            Attendee.query.filter_by(email=email).first()):
+        if UserDirectory.exists(email):
             return jsonify({'error': 'Email already exists'}), 400
 
         # Create user based on role
@@ -83,6 +84,9 @@ def create_user(current_user_id):
 
         return jsonify(user.to_dict()), 201
 
+    except HashingPoolBusy as e:
+        db.session.rollback()
+        return hashing_busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to create user'}), 500
@@ -157,7 +161,9 @@ def create_session(current_user_id):
             schedule=data.get('schedule', ''),
             course_code=data.get('courseCode', ''),
             attendant_id=current_user_id,
-            is_active=data.get('isActive', True)
+            is_active=data.get('isActive', True),
+            rssi_enter_threshold=data.get('rssiEnterThreshold'),
+            rssi_exit_threshold=data.get('rssiExitThreshold')
         )
         
         # Set members if provided
@@ -206,67 +212,93 @@ def get_analytics(current_user_id):
     except Exception as e:
         return jsonify({'error': 'Failed to fetch analytics'}), 500
 
+# Password hashing pool metrics
+@admin_bp.route('/metrics/hashing', methods=['GET'])
+@admin_required
+def get_hashing_metrics(current_user_id):
+    """Get queue depth and latency of the password hashing pool"""
+    return jsonify(hashing_pool.metrics()), 200
+
 # Full Attendance Report
 @admin_bp.route('/reports/full', methods=['GET'])
 @admin_required
 def get_full_report(current_user_id):
-    """Get comprehensive attendance report"""
+    """Get comprehensive attendance report.
+
+    Counts come from grouped aggregate queries (per session and per
+    attendee) returning plain tuples, so the cost is a handful of queries
+    and memory grows with the number of sessions and students, not with
+    the number of attendance rows.
+    """
     try:
         from app.models.attendance import Attendance
 
-        # Get all sessions
-        all_sessions = Session.query.all()
-        total_sessions = len(all_sessions)
-        active_sessions_count = Session.query.filter_by(is_active=True).count()
-
-        # Get all attendance records
-        all_attendance = Attendance.query.all()
-        total_attendance_records = len(all_attendance)
+        present = db.func.sum(db.case((Attendance.status == 'Present', 1), else_=0))
 
-        # Calculate attendance by status
-        present_count = Attendance.query.filter_by(status='Present').count()
-
-        # Get all attendees
-        all_attendees = Attendee.query.all()
-        total_attendees = len(all_attendees)
+        total_sessions, active_sessions_count = db.session.execute(
+            db.select(db.func.count(Session.id), db.func.sum(db.case((Session.is_active == True, 1), else_=0)))
+        ).one()
+        total_attendance_records, present_count = db.session.execute(
+            db.select(db.func.count(Attendance.id), present)
+        ).one()
+        total_attendees = db.session.execute(db.select(db.func.count(Attendee.id))).scalar()
+        active_sessions_count = active_sessions_count or 0
+        present_count = present_count or 0
 
         # Calculate average attendance percentage
         avg_attendance = (present_count / total_attendance_records * 100) if total_attendance_records > 0 else 0
 
+        # (total, present) per session and per attendee
+        by_session = {
+            session_id: (total, present_in_session)
+            for session_id, total, present_in_session in db.session.execute(
+                db.select(Attendance.session_id, db.func.count(), present).group_by(Attendance.session_id)
+            )
+        }
+        by_attendee = {
+            attendee_id: (total, present_records)
+            for attendee_id, total, present_records in db.session.execute(
+                db.select(Attendance.attendee_id, db.func.count(), present).group_by(Attendance.attendee_id)
+            )
+        }
+
         # Get session details with attendance
         sessions_report = []
-        for session in all_sessions:
-            session_attendance = Attendance.query.filter_by(session_id=session.id).all()
-            present_in_session = len([a for a in session_attendance if a.status == 'Present'])
-
+        for row in db.session.execute(
+            db.select(Session.id, Session.title, Session.course_code, Session.attendant_name,
+                      Session.schedule, Session.is_active, Session.created_at).order_by(Session.id)
+        ):
+            total, present_in_session = by_session.get(row.id, (0, 0))
             sessions_report.append({
-                'id': session.id,
-                'title': session.title,
-                'courseCode': session.course_code,
-                'attendantName': session.attendant_name,
-                'schedule': session.schedule,
-                'isActive': session.is_active,
-                'totalAttendees': len(session_attendance),
+                'id': row.id,
+                'title': row.title,
+                'courseCode': row.course_code,
+                'attendantName': row.attendant_name,
+                'schedule': row.schedule,
+                'isActive': row.is_active,
+                'totalAttendees': total,
                 'presentCount': present_in_session,
-                'attendanceRate': (present_in_session / len(session_attendance) * 100) if len(session_attendance) > 0 else 0,
-                'createdAt': session.created_at.isoformat() if session.created_at else None
+                'attendanceRate': (present_in_session / total * 100) if total > 0 else 0,
+                'createdAt': row.created_at.isoformat() if row.created_at else None
             })
 
         # Get student attendance summary
         students_report = []
-        for attendee in all_attendees:
-            attendee_records = Attendance.query.filter_by(attendee_id=attendee.id).all()
-            present_records = len([r for r in attendee_records if r.status == 'Present'])
-
+        for row in db.session.execute(
+            db.select(Attendee.id, Attendee.name, Attendee.email, Attendee.serial, Attendee.units)
+            .order_by(Attendee.id)
+            .execution_options(yield_per=1000)
+        ):
+            total, present_records = by_attendee.get(row.id, (0, 0))
             students_report.append({
-                'id': attendee.id,
-                'name': attendee.name,
-                'email': attendee.email,
-                'serial': attendee.serial,
-                'enrolledCourses': attendee.units.split(',') if attendee.units else [],
-                'totalSessions': len(attendee_records),
+                'id': row.id,
+                'name': row.name,
+                'email': row.email,
+                'serial': row.serial,
+                'enrolledCourses': row.units.split(',') if row.units else [],
+                'totalSessions': total,
                 'presentCount': present_records,
-                'attendanceRate': (present_records / len(attendee_records) * 100) if len(attendee_records) > 0 else 0
+                'attendanceRate': (present_records / total * 100) if total > 0 else 0
             })
 
         # Sort students by attendance rate (lowest first to identify at-risk students)
@@ -290,4 +322,4 @@ def get_full_report(current_user_id):
         print(f"❌ Error generating report: {str(e)}")
         import traceback
         traceback.print_exc()
-        return jsonify({'error': 'Failed to generate report'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Failed to generate report'}), 500
@@ -1,27 +1,34 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from app import db
-from app.models.attendant_model import Attendant
 from app.models.attendee_model import Attendee
 from app.models.session_model import Session
-from app.models.attendance import Attendance
-from app.utils.auth import auth_required
+from app.models.attendance_counts import AttendanceCounts
+from app.models.enrollment import Enrollment, parse_units
+from app.services.attendance_services import AttendanceService
+from app.services.enrollment_service import EnrollmentError, EnrollmentService, read_serials_csv
+from app.services.live_attendance import LiveStreamFull, live_attendance
+from app.utils.auth import auth_required, current_principal
+from app.utils.etag import versioned_etag, session_version, attendance_version
 
 attendant_bp = Blueprint('attendant', __name__)
 
+
+def _sessions_etag(current_user_id):
+    """ETag inputs for the attendant's sessions with attendance counts"""
+    return current_user_id, session_version(), attendance_version()
+
+
 @attendant_bp.route('/sessions', methods=['GET'])
 @auth_required
+@versioned_etag(_sessions_etag)
 def get_my_sessions(current_user_id):
     """Get sessions created by this attendant with attendance counts"""
     try:
-        sessions = Session.query.filter_by(attendant_id=current_user_id).all()
+        sessions = AttendanceCounts.sessions_with_counts(Session.attendant_id == current_user_id)
         sessions_data = []
 
-        for session in sessions:
+        for session, attendance_count, present_count in sessions:
             session_dict = session.to_dict()
-            # Get actual attendance count for this session
-            attendance_count = Attendance.query.filter_by(session_id=session.id).count()
-            present_count = Attendance.query.filter_by(session_id=session.id, status='Present').count()
-
             session_dict['attendanceCount'] = attendance_count
             session_dict['presentCount'] = present_count
             sessions_data.append(session_dict)
@@ -36,8 +43,8 @@ def create_session(current_user_id):
     """Create new session (Attendant only)"""
     try:
         # Verify user is attendant
-        attendant = Attendant.query.get(current_user_id)
-        if not attendant:
+        attendant = current_principal()
+        if not attendant or attendant.role != 'Attendant':
             return jsonify({'error': 'Only attendants can create sessions'}), 403
 
         data = request.get_json()
@@ -51,7 +58,9 @@ def create_session(current_user_id):
             schedule=data.get('schedule', ''),
             course_code=data.get('courseCode', ''),
             attendant_id=current_user_id,
-            is_active=True
+            is_active=True,
+            rssi_enter_threshold=data.get('rssiEnterThreshold'),
+            rssi_exit_threshold=data.get('rssiExitThreshold')
         )
         
         if data.get('members'):
@@ -82,26 +91,7 @@ def mark_attendance(current_user_id, session_id):
         data = request.get_json()
         attendance_data = data.get('attendance', [])
 
-        for record in attendance_data:
-            attendee_id = record.get('attendee_id')
-            status = record.get('status', 'Present')
-
-            # Check if attendance already exists
-            existing = Attendance.query.filter_by(
-                attendee_id=attendee_id,
-                session_id=session_id
-            ).first()
-
-            if existing:
-                existing.status = status
-            else:
-                attendance = Attendance(
-                    attendee_id=attendee_id,
-                    session_id=session_id,
-                    status=status
-                )
-                db.session.add(attendance)
-        
+        AttendanceService.upsert_session_attendance(session_id, attendance_data)
         db.session.commit()
         return jsonify({'message': 'Attendance marked successfully'}), 200
 
@@ -112,9 +102,10 @@ def mark_attendance(current_user_id, session_id):
 @attendant_bp.route('/students', methods=['GET'])
 @auth_required
 def get_all_students(current_user_id):
-    """Get all students/attendees"""
+    """Get all students/attendees, or the roster of one course with ?courseCode="""
     try:
-        attendees = Attendee.query.all()
+        course_code = request.args.get('courseCode')
+        attendees = Enrollment.roster(course_code) if course_code else Attendee.query.all()
         return jsonify([{
             'id': attendee.id,
             'name': attendee.name,
@@ -142,7 +133,7 @@ def add_student_to_course(current_user_id, student_id):
             return jsonify({'error': 'Student not found'}), 404
 
         # Get current units
-        current_units = [unit.strip() for unit in student.units.split(',')] if student.units else []
+        current_units = parse_units(student.units)
 
         # Check if already enrolled
         if course_code in current_units:
@@ -168,6 +159,54 @@ def add_student_to_course(current_user_id, student_id):
         db.session.rollback()
         return jsonify({'error': 'Failed to add student to course'}), 500
 
+@attendant_bp.route('/students/add-course', methods=['POST'])
+@auth_required
+def add_students_to_course(current_user_id):
+    """Enroll many students in a course in one transaction.
+
+    JSON body: ``courseCode`` plus ``studentIds`` and/or ``serials`` (a list or a
+    comma-separated string). Multipart: ``courseCode`` and a CSV ``file`` of serials.
+    """
+    attendant = current_principal()
+    if not attendant or attendant.role != 'Attendant':
+        return jsonify({'error': 'Only attendants can enroll students'}), 403
+
+    if request.files.get('file'):
+        course_code = request.form.get('courseCode')
+        student_ids = []
+        serials = read_serials_csv(request.files['file'].stream)
+    else:
+        data = request.get_json(silent=True) or {}
+        course_code = data.get('courseCode')
+        student_ids = data.get('studentIds') or []
+        serials = data.get('serials') or []
+        if isinstance(serials, str):
+            serials = serials.replace('\n', ',').split(',')
+        if not isinstance(student_ids, list) or not isinstance(serials, list):
+            return jsonify({'error': 'studentIds and serials must be lists'}), 400
+
+    try:
+        results, enrolled = EnrollmentService.enroll_many(course_code, student_ids, serials)
+        db.session.commit()
+    except EnrollmentError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to add students to course'}), 500
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return jsonify({
+        'message': f'{enrolled} student(s) added to course',
+        'courseCode': course_code.strip(),
+        'enrolled': enrolled,
+        'alreadyEnrolled': counts.get('already_enrolled', 0),
+        'notFound': counts.get('not_found', 0),
+        'results': results
+    }), 200
+
 @attendant_bp.route('/sessions/<int:session_id>/end', methods=['POST'])
 @auth_required
 def end_session(current_user_id, session_id):
@@ -191,28 +230,57 @@ def end_session(current_user_id, session_id):
         db.session.rollback()
         return jsonify({'error': 'Failed to end session'}), 500
 
+@attendant_bp.route('/sessions/<int:session_id>/live', methods=['GET'])
+@auth_required
+def stream_session_attendance(current_user_id, session_id):
+    """Server-sent events of check-ins and present/total counts for an active session.
+
+    Sends a ``counts`` snapshot first, then a ``checkin`` event per new
+    attendance row and ``end`` when the session stops.
+    """
+    attendant = current_principal()
+    if not attendant or attendant.role != 'Attendant':
+        return jsonify({'error': 'Only attendants can watch sessions'}), 403
+
+    session = Session.query.filter_by(id=session_id, attendant_id=current_user_id).first()
+    if not session:
+        return jsonify({'error': 'Session not found or access denied'}), 404
+    if not session.is_active:
+        return jsonify({'error': 'Session is not active'}), 409
+
+    try:
+        subscription = live_attendance.subscribe(session_id)
+    except LiveStreamFull as e:
+        response = jsonify({'error': 'Too many live streams, please retry shortly'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+
+    # Plain generator (no request context), so the DB connection is released while streaming
+    return Response(live_attendance.stream(subscription), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @attendant_bp.route('/schedule', methods=['GET'])
 @auth_required
 def get_attendant_schedule(current_user_id):
     """Get attendant's teaching schedule (all their sessions)"""
     try:
         # Get attendant
-        attendant = Attendant.query.get(current_user_id)
-        if not attendant:
+        attendant = current_principal()
+        if not attendant or attendant.role != 'Attendant':
             return jsonify({'error': 'Attendant not found'}), 404
 
         # Get courses they teach
-        attendant_courses = [unit.strip() for unit in attendant.units.split(',')] if attendant.units else []
+        attendant_courses = parse_units(attendant.units)
 
         # Get all sessions created by this attendant
-        all_sessions = Session.query.filter_by(attendant_id=current_user_id).all()
+        all_sessions = AttendanceCounts.sessions_with_counts(Session.attendant_id == current_user_id)
 
         # Format schedule data
         schedule = []
-        for session in all_sessions:
-            attendance_count = Attendance.query.filter_by(session_id=session.id).count()
-            present_count = Attendance.query.filter_by(session_id=session.id, status='Present').count()
-
+        for session, attendance_count, present_count in all_sessions:
             schedule.append({
                 'id': session.id,
                 'courseCode': session.course_code,
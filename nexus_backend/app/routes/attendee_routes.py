@@ -1,35 +1,44 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from app import db
-from app.models.attendee_model import Attendee
 from app.models.session_model import Session
 from app.models.attendance import Attendance
-from app.utils.auth import auth_required
+from app.models.active_attendance import ActiveAttendance
+from app.models.attendance_counts import AttendanceCounts
+from app.models.enrollment import Enrollment, parse_units
+from app.services.checkin_pipeline import CheckinTimeout, checkin_pipeline, checkin_timeout_response
+from app.utils.auth import auth_required, current_principal
+from app.utils.etag import versioned_etag, session_version
+from app.utils.session_directory import session_directory
 
 attendee_bp = Blueprint('attendee', __name__)
 
+
+def _sessions_etag(current_user_id):
+    """ETag inputs for session listings: sessions version plus the attendee's units"""
+    principal = current_principal()
+    if not principal:
+        return None
+    units = principal.units if principal.role == 'Attendee' else None
+    return principal.role, current_user_id, units, session_version()
+
+
 @attendee_bp.route('/sessions', methods=['GET'])
 @auth_required
+@versioned_etag(_sessions_etag)
 def get_available_sessions(current_user_id):
     """Get sessions available to this attendee based on their registered units"""
     try:
         # Get attendee's registered units
-        attendee = Attendee.query.get(current_user_id)
-        if not attendee:
+        attendee = current_principal()
+        if not attendee or attendee.role != 'Attendee':
             return jsonify({'error': 'Attendee not found'}), 404
 
         # Get attendee's units as a list
-        attendee_units = [unit.strip() for unit in attendee.units.split(',')] if attendee.units else []
-
-        # Get all active sessions
-        sessions = Session.query.filter(Session.is_active == True).all()
-        available_sessions = []
+        attendee_units = parse_units(attendee.units)
 
-        for session in sessions:
-            # Check if session's course_code matches any of attendee's units
-            if session.course_code in attendee_units:
-                available_sessions.append(session.to_dict())
-
-        return jsonify(available_sessions), 200
+        # Active sessions for those courses, served from the course index
+        payload = session_directory.sessions_for_units(attendee_units)
+        return current_app.response_class(payload, mimetype='application/json'), 200
     except Exception as e:
         return jsonify({'error': 'Failed to fetch sessions'}), 500
 
@@ -47,58 +56,50 @@ def join_session(current_user_id, session_id):
             return jsonify({'error': 'Session is not active'}), 400
 
         # Get attendee
-        attendee = Attendee.query.get(current_user_id)
-        if not attendee:
+        principal = current_principal()
+        if not principal or principal.role != 'Attendee':
             return jsonify({'error': 'Attendee not found'}), 404
 
         # Check if attendee is already in another active session
-        active_sessions = Session.query.filter(Session.is_active == True).all()
-        for active_session in active_sessions:
-            existing_attendance = Attendance.query.filter_by(
-                attendee_id=current_user_id,
-                session_id=active_session.id
-            ).first()
-
-            if existing_attendance and active_session.id != session_id:
-                return jsonify({
-                    'error': f'You are already in another active session: "{active_session.title}". Please wait for it to end before joining a new session.'
-                }), 409
+        active_session = ActiveAttendance.conflicting_session(current_user_id, session_id)
+        if active_session:
+            return jsonify({
+                'error': f'You are already in another active session: "{active_session.title}". Please wait for it to end before joining a new session.'
+            }), 409
+
+        # Mark attendance first (already-marked check-ins come back with created=False),
+        # so a failed or timed-out join can simply be retried
+        attendance, created = checkin_pipeline.check_in(current_user_id, session_id)
 
         # Auto-enroll attendee in the course if not already enrolled
-        attendee_units = [unit.strip() for unit in attendee.units.split(',')] if attendee.units else []
-        if session.course_code not in attendee_units:
-            # Add the course to attendee's units (auto-enrollment)
-            attendee_units.append(session.course_code)
-            attendee.units = ','.join(attendee_units)
-
-        # Check if already marked attendance
-        existing_attendance = Attendance.query.filter_by(
-            attendee_id=current_user_id,
-            session_id=session_id
-        ).first()
-
-        if existing_attendance:
+        if session.course_code not in parse_units(principal.units):
+            # The cached units may be stale, so re-read (and lock) the row before writing
+            attendee = principal.instance()
+            if attendee is None:
+                return jsonify({'error': 'Attendee not found'}), 404
+            attendee_units = parse_units(attendee.units)
+            if session.course_code not in attendee_units:
+                # Add the course to attendee's units (auto-enrollment)
+                attendee_units.append(session.course_code)
+                attendee.units = ','.join(attendee_units)
+            db.session.commit()
+
+        if not created:
             return jsonify({
                 'message': 'Attendance already marked',
-                'attendance': existing_attendance.to_dict()
+                'attendance': attendance
             }), 200
 
-        # Mark attendance
-        attendance = Attendance(
-            attendee_id=current_user_id,
-            session_id=session_id,
-            status='Present'
-        )
-
-        db.session.add(attendance)
-        db.session.commit()
-
         return jsonify({
             'message': 'Attendance marked successfully',
-            'attendance': attendance.to_dict()
+            'attendance': attendance
         }), 201
+    except CheckinTimeout as e:
+        return checkin_timeout_response(e)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        db.session.rollback()
+        print(f"❌ Error joining session: {str(e)}")
+        return jsonify({'error': 'Failed to join session'}), 500
 
 @attendee_bp.route('/attendance', methods=['GET'])
 @auth_required
@@ -126,16 +127,12 @@ def get_my_attendance(current_user_id):
 def get_profile(current_user_id):
     """Get attendee profile"""
     try:
-        attendee = Attendee.query.get(current_user_id)
-        if not attendee:
+        attendee = current_principal()
+        if not attendee or attendee.role != 'Attendee':
             return jsonify({'error': 'Attendee not found'}), 404
 
         # Get attendance stats
-        total_sessions = Attendance.query.filter_by(attendee_id=current_user_id).count()
-        present_count = Attendance.query.filter_by(
-            attendee_id=current_user_id,
-            status='Present'
-        ).count()
+        total_sessions, present_count = AttendanceCounts.for_attendee(current_user_id)
 
         attendance_rate = (present_count / total_sessions * 100) if total_sessions > 0 else 0
 
@@ -152,30 +149,17 @@ def get_profile(current_user_id):
 
 @attendee_bp.route('/sessions/scan', methods=['GET'])
 @auth_required
+@versioned_etag(_sessions_etag)
 def scan_all_sessions(current_user_id):
     """Scan for ALL active sessions (not filtered by enrolled courses)"""
     try:
-        # Get all active sessions
-        sessions = Session.query.filter(Session.is_active == True).all()
-
-        print(f"🔍 Scanning sessions for attendee {current_user_id}")
-        print(f"📊 Found {len(sessions)} active sessions")
-
         # Get attendee to check which courses they're enrolled in
-        attendee = Attendee.query.get(current_user_id)
-        attendee_units = [unit.strip() for unit in attendee.units.split(',')] if attendee and attendee.units else []
-
-        print(f"👤 Attendee units: {attendee_units}")
-
-        # Return all sessions with enrollment status
-        all_sessions = []
-        for session in sessions:
-            session_dict = session.to_dict()
-            session_dict['isEnrolled'] = session.course_code in attendee_units
-            all_sessions.append(session_dict)
-            print(f"  ✅ Session: {session.title} ({session.course_code}) - Active: {session.is_active}")
+        attendee = current_principal()
+        attendee_units = parse_units(attendee.units) if attendee and attendee.role == 'Attendee' else []
 
-        return jsonify(all_sessions), 200
+        # All active sessions with enrollment status, served from the course index
+        payload = session_directory.scan(attendee_units)
+        return current_app.response_class(payload, mimetype='application/json'), 200
     except Exception as e:
         print(f"❌ Error scanning sessions: {str(e)}")
         import traceback
@@ -184,19 +168,20 @@ def scan_all_sessions(current_user_id):
 
 @attendee_bp.route('/schedule', methods=['GET'])
 @auth_required
+@versioned_etag(_sessions_etag)
 def get_schedule(current_user_id):
     """Get attendee's class schedule based on enrolled courses"""
     try:
         # Get attendee
-        attendee = Attendee.query.get(current_user_id)
-        if not attendee:
+        attendee = current_principal()
+        if not attendee or attendee.role != 'Attendee':
             return jsonify({'error': 'Attendee not found'}), 404
 
         # Get enrolled courses
-        attendee_units = [unit.strip() for unit in attendee.units.split(',')] if attendee.units else []
+        attendee_units = parse_units(attendee.units)
 
-        # Get all sessions for enrolled courses (both active and ended)
-        all_sessions = Session.query.filter(Session.course_code.in_(attendee_units)).all() if attendee_units else []
+        # Get all sessions for enrolled courses (both active and ended), joined through enrollments
+        all_sessions = Enrollment.sessions_for(current_user_id)
 
         # Format schedule data
         schedule = []
@@ -1,10 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.admin_model import Admin
-from app.models.attendant_model import Attendant
-from app.models.attendee_model import Attendee
 from app.models.password_reset import PasswordReset
+from app.models.user_directory import UserDirectory
 from app.utils.auth import generate_token
+from app.utils.hashing import HashingPoolBusy, hashing_busy_response
 from app.utils.email import send_reset_email, send_welcome_email
 
 auth_bp = Blueprint('auth', __name__)
@@ -27,10 +27,8 @@ def register_admin():
         organization = data['organizationName']
         password = data['password']
 
-        # Check if email already exists in any table
-        if (Admin.query.filter_by(email=email).first() or
-            Attendant.query.filter_by(email=email).first() or
-            Attendee.query.filter_by(email=email).first()):
+        # Check if email already exists for any role
+        if UserDirectory.exists(email):
             return jsonify({'error': 'Email already registered'}), 400
 
         # Create admin user
@@ -58,6 +56,9 @@ def register_admin():
             'token': token
         }), 201
 
+    except HashingPoolBusy as e:
+        db.session.rollback()
+        return hashing_busy_response(e)
     except Exception as e:
         db.session.rollback()
         print(f"Registration error: {str(e)}")
@@ -76,31 +77,19 @@ def login():
         
         email = data['email']
         password = data['password']
-        user = None
-        
-        # Check Admin first
-        user = Admin.query.filter_by(email=email).first()
-        if user and user.check_password(password):
-            user.update_last_login()
-            token = generate_token(f"admin_{user.id}")
-            return jsonify({'user': user.to_dict(), 'token': token}), 200
-        
-        # Check Attendant
-        user = Attendant.query.filter_by(email=email).first()
-        if user and user.check_password(password):
-            user.update_last_login()
-            token = generate_token(f"attendant_{user.id}")
-            return jsonify({'user': user.to_dict(), 'token': token}), 200
-        
-        # Check Attendee
-        user = Attendee.query.filter_by(email=email).first()
+
+        # Resolve role and id from the identity directory
+        entry = UserDirectory.lookup(email)
+        user = entry.get_user() if entry else None
         if user and user.check_password(password):
             user.update_last_login()
-            token = generate_token(f"attendee_{user.id}")
+            token = generate_token(entry.token_identity)
             return jsonify({'user': user.to_dict(), 'token': token}), 200
         
         return jsonify({'error': 'Invalid email or password'}), 401
         
+    except HashingPoolBusy as e:
+        return hashing_busy_response(e)
     except Exception as e:
         print(f"Login error: {str(e)}")
         import traceback
@@ -118,12 +107,8 @@ def forgot_password():
         
         email = data['email']
         
-        # Check if user exists in any table
-        user_exists = (Admin.query.filter_by(email=email).first() or
-                      Attendant.query.filter_by(email=email).first() or
-                      Attendee.query.filter_by(email=email).first())
-        
-        if not user_exists:
+        # Check if user exists for any role
+        if not UserDirectory.exists(email):
             return jsonify({'error': 'Email not found'}), 404
         
         # Create reset code
@@ -179,10 +164,8 @@ def reset_password():
         if not reset or not reset.is_valid():
             return jsonify({'error': 'Invalid or expired code'}), 400
         
-        # Find user in any table and update password
-        user = (Admin.query.filter_by(email=email).first() or
-                Attendant.query.filter_by(email=email).first() or
-                Attendee.query.filter_by(email=email).first())
+        # Find user for any role and update password
+        user = UserDirectory.find_user(email)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -195,6 +178,9 @@ def reset_password():
         
         return jsonify({'message': 'Password reset successfully'}), 200
         
+    except HashingPoolBusy as e:
+        db.session.rollback()
+        return hashing_busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Password reset failed'}), 500
\ No newline at end of file
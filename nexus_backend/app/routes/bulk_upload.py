@@ -1,92 +1,41 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, url_for
 from app import db
 from app.models.attendant_model import Attendant
 from app.models.attendee_model import Attendee
+from app.models.import_job import ImportJob, ImportJobResult
+from app.services.import_jobs import import_job_runner
 from app.utils.auth import admin_required
-from app.utils.email import send_welcome_email
-import csv
-import io
-import secrets
+from app.utils.last_login import last_login_buffer
 
 bulk_bp = Blueprint('bulk', __name__)
 
-# Helper function to create user from CSV row
-def create_user_from_row(row, user_type):
-    """Create a single user (Attendee or Attendant) from CSV row"""
-    name = row.get('name', '').strip()
-    email = row.get('email', '').strip().lower()
-    units = row.get('units', '').strip()  # Get units/classes
-
-    # Skip if missing data
-    if not name or not email:
-        return None
-
-    # Check if email exists
-    if user_type == 'Attendee':
-        if Attendee.query.filter_by(email=email).first():
-            raise Exception('Email already exists')
-        user = Attendee(name=name, email=email, units=units if units else None)
-    else:  # Attendant
-        if Attendant.query.filter_by(email=email).first():
-            raise Exception('Email already exists')
-        user = Attendant(name=name, email=email, units=units if units else None)
-
-    # Set password and save
-    temp_password = secrets.token_urlsafe(8)
-    user.set_password(temp_password)
-    db.session.add(user)
-    db.session.flush()
-    user.generate_serial()
-
-    # Send email
-    send_welcome_email(user.email, user.name, temp_password)
-
-    return {
-        'name': user.name,
-        'email': user.email,
-        'role': user_type,
-        'serial': user.serial,
-        'units': units if units else '',
-        'password': temp_password
-    }
+def queue_csv_import(current_user_id, default_role=None):
+    """Validate the uploaded file and queue a background import job for it"""
+    # Check file exists
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    file = request.files['file']
+    if not file.filename.lower().endswith('.csv'):
+        return jsonify({'error': 'Only CSV files allowed'}), 400
+
+    job = import_job_runner.create_job(file, role=default_role, created_by=current_user_id)
+
+    response = jsonify({
+        'message': 'Upload queued',
+        'job': job.to_dict(),
+        'status_url': url_for('bulk.get_import_job', job_id=job.id),
+        'results_url': url_for('bulk.get_import_job_results', job_id=job.id)
+    })
+    response.headers['Location'] = url_for('bulk.get_import_job', job_id=job.id)
+    return response, 202
 
 @bulk_bp.route('/upload-attendees', methods=['POST'])
 @admin_required
 def bulk_upload_attendees(current_user_id):
     """Upload CSV file to create multiple attendees"""
     try:
-        # Check file exists
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file uploaded'}), 400
-
-        file = request.files['file']
-        if not file.filename.lower().endswith('.csv'):
-            return jsonify({'error': 'Only CSV files allowed'}), 400
-
-        # Read CSV
-        content = file.read().decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(content))
-
-        created = []
-        failed = []
-
-        # Process each row
-        for row in csv_reader:
-            try:
-                result = create_user_from_row(row, 'Attendee')
-                if result:
-                    created.append(result)
-            except Exception as e:
-                failed.append({'email': row.get('email', ''), 'reason': str(e)})
-
-        db.session.commit()
-        return jsonify({
-            'message': 'Upload completed',
-            'created_count': len(created),
-            'failed_count': len(failed),
-            'created_users': created,
-            'failed_users': failed
-        }), 200
+        return queue_csv_import(current_user_id, 'Attendee')
 
     except Exception as e:
         db.session.rollback()
@@ -97,38 +46,7 @@ def bulk_upload_attendees(current_user_id):
 def bulk_upload_attendants(current_user_id):
     """Upload CSV file to create multiple attendants"""
     try:
-        # Check file exists
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file uploaded'}), 400
-
-        file = request.files['file']
-        if not file.filename.lower().endswith('.csv'):
-            return jsonify({'error': 'Only CSV files allowed'}), 400
-
-        # Read CSV
-        content = file.read().decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(content))
-
-        created = []
-        failed = []
-
-        # Process each row
-        for row in csv_reader:
-            try:
-                result = create_user_from_row(row, 'Attendant')
-                if result:
-                    created.append(result)
-            except Exception as e:
-                failed.append({'email': row.get('email', ''), 'reason': str(e)})
-
-        db.session.commit()
-        return jsonify({
-            'message': 'Upload completed',
-            'created_count': len(created),
-            'failed_count': len(failed),
-            'created_users': created,
-            'failed_users': failed
-        }), 200
+        return queue_csv_import(current_user_id, 'Attendant')
 
     except Exception as e:
         db.session.rollback()
@@ -139,57 +57,73 @@ def bulk_upload_attendants(current_user_id):
 def bulk_upload_mixed(current_user_id):
     """Upload CSV file with both attendees and attendants (role column required)"""
     try:
-        # Check file exists
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file uploaded'}), 400
-
-        file = request.files['file']
-        if not file.filename.lower().endswith('.csv'):
-            return jsonify({'error': 'Only CSV files allowed'}), 400
-
-        # Read CSV
-        content = file.read().decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(content))
-
-        attendees = []
-        attendants = []
-        failed = []
-
-        # Process each row
-        for row in csv_reader:
-            try:
-                role = row.get('role', 'Attendee').strip()
-
-                # Determine user type
-                if role.lower() == 'attendant':
-                    user_type = 'Attendant'
-                else:
-                    user_type = 'Attendee'
-
-                # Create user
-                result = create_user_from_row(row, user_type)
-                if result:
-                    if user_type == 'Attendant':
-                        attendants.append(result)
-                    else:
-                        attendees.append(result)
-
-            except Exception as e:
-                failed.append({'email': row.get('email', ''), 'reason': str(e)})
-
-        db.session.commit()
+        return queue_csv_import(current_user_id)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bulk_bp.route('/jobs', methods=['GET'])
+@admin_required
+def list_import_jobs(current_user_id):
+    """Most recent import jobs"""
+    try:
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        jobs = db.session.execute(
+            db.select(ImportJob).order_by(ImportJob.id.desc()).limit(limit)
+        ).scalars().all()
+        return jsonify({'jobs': [job.to_dict() for job in jobs]}), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bulk_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@admin_required
+def get_import_job(current_user_id, job_id):
+    """Progress of an import job"""
+    try:
+        job = db.session.get(ImportJob, job_id)
+        if not job:
+            return jsonify({'error': 'Import job not found'}), 404
+        return jsonify(job.to_dict()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bulk_bp.route('/jobs/<int:job_id>/results', methods=['GET'])
+@admin_required
+def get_import_job_results(current_user_id, job_id):
+    """Created or failed rows of an import job, one page at a time"""
+    try:
+        job = db.session.get(ImportJob, job_id)
+        if not job:
+            return jsonify({'error': 'Import job not found'}), 404
+
+        status = request.args.get('status', 'created')
+        if status not in ('created', 'failed'):
+            return jsonify({'error': "status must be 'created' or 'failed'"}), 400
+
+        page = db.paginate(
+            db.select(ImportJobResult)
+            .where(ImportJobResult.job_id == job_id, ImportJobResult.status == status)
+            .order_by(ImportJobResult.id),
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 100, type=int),
+            max_per_page=500
+        )
+
         return jsonify({
-            'message': 'Upload completed',
-            'attendees_created': len(attendees),
-            'attendants_created': len(attendants),
-            'failed_count': len(failed),
-            'created_attendees': attendees,
-            'created_attendants': attendants,
-            'failed_users': failed
+            'job_id': job_id,
+            'job_status': job.status,
+            'status': status,
+            'page': page.page,
+            'per_page': page.per_page,
+            'total': page.total,
+            'has_next': page.has_next,
+            'results': [result.to_dict() for result in page.items]
         }), 200
 
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @bulk_bp.route('/login-activity', methods=['GET'])
@@ -203,12 +137,14 @@ def get_login_activity(current_user_id):
         # Build activity list
         activity = []
         for user in all_users:
+            # Include logins still waiting in the write-behind buffer
+            last_login = last_login_buffer.last_login(user)
             activity.append({
                 'name': user.name,
                 'email': user.email,
                 'role': user.__class__.__name__,
                 'serial': user.serial,
-                'last_login': user.last_login.isoformat() if user.last_login else 'Never',
+                'last_login': last_login.isoformat() if last_login else 'Never',
                 'created_at': user.created_at.isoformat() if user.created_at else None
             })
 
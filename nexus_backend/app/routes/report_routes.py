@@ -1,15 +1,31 @@
 from flask import Blueprint, jsonify, request
 from ..services.report_service import ReportService
+from ..utils.auth import admin_required
 
 report_bp = Blueprint("report_bp", __name__)
 
+
+def _class_not_found():
+    return jsonify({"error": "Class not found"}), 404
+
+
+def _invalid_date():
+    return jsonify({"error": "Invalid date, use YYYY-MM-DD or ISO 8601"}), 400
+
+
 # Student Attendance Percentage
 @report_bp.route("/reports/student/<int:student_id>/class/<int:class_id>/percentage", methods=["GET"])
-def get_student_attendance_percentage(student_id, class_id):
+@admin_required
+def get_student_attendance_percentage(current_user_id, student_id, class_id):
     start_dt = request.args.get("start")
     end_dt = request.args.get("end")
 
-    pct = ReportService.get_student_attendance_percentage(student_id, class_id, start_dt, end_dt)
+    try:
+        pct = ReportService.get_student_attendance_percentage(student_id, class_id, start_dt, end_dt)
+    except ValueError:
+        return _invalid_date()
+    if pct is None:
+        return _class_not_found()
     return jsonify({
         "student_id": student_id,
         "class_id": class_id,
@@ -19,9 +35,15 @@ def get_student_attendance_percentage(student_id, class_id):
 
 # Class Absentees
 @report_bp.route("/reports/class/<int:class_id>/absentees", methods=["GET"])
-def get_class_absentees(class_id):
+@admin_required
+def get_class_absentees(current_user_id, class_id):
     date_str = request.args.get("date")
-    absentees = ReportService.get_class_absentees(class_id, date_str)
+    try:
+        absentees = ReportService.get_class_absentees(class_id, date_str)
+    except ValueError:
+        return _invalid_date()
+    if absentees is None:
+        return _class_not_found()
     return jsonify({
         "class_id": class_id,
         "date": date_str,
@@ -31,7 +53,8 @@ def get_class_absentees(class_id):
 
 # Student Attendance History
 @report_bp.route("/reports/student/<int:student_id>/history", methods=["GET"])
-def get_student_history(student_id):
+@admin_required
+def get_student_history(current_user_id, student_id):
     """Return all attendance records for a specific student."""
     history = ReportService.get_student_attendance_history(student_id)
     return jsonify({
@@ -42,9 +65,12 @@ def get_student_history(student_id):
 
 #  Class Attendance Summary
 @report_bp.route("/reports/class/<int:class_id>/summary", methods=["GET"])
-def get_class_summary(class_id):
+@admin_required
+def get_class_summary(current_user_id, class_id):
     """Return class-level attendance summary (averages, totals, etc)."""
     summary = ReportService.get_class_summary(class_id)
+    if summary is None:
+        return _class_not_found()
     return jsonify({
         "class_id": class_id,
         "summary": summary
@@ -53,11 +79,15 @@ def get_class_summary(class_id):
 
 # Overall Attendance Overview
 @report_bp.route("/reports/overview", methods=["GET"])
-def get_overview():
+@admin_required
+def get_overview(current_user_id):
     """Return overall attendance stats for all classes."""
     start_dt = request.args.get("start")
     end_dt = request.args.get("end")
-    overview = ReportService.get_overall_summary(start_dt, end_dt)
+    try:
+        overview = ReportService.get_overall_summary(start_dt, end_dt)
+    except ValueError:
+        return _invalid_date()
     return jsonify({
         "overview": overview
     })
@@ -1,10 +1,22 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 class AttendanceMarkSchema(Schema):
     admin_ble_raw = fields.Str(required=True)
     student_ble_raw = fields.Str(required=True)
     student_rssi_raw = fields.Int(required=True)
 
+class BleObservationSchema(Schema):
+    student_ble_raw = fields.Str(required=True)
+    student_rssi_raw = fields.Raw(required=True)  # Cleaned per observation so one bad reading doesn't fail the batch
+    attendee_id = fields.Int()
+    serial = fields.Str()
+
+class BleBatchSchema(Schema):
+    admin_ble_raw = fields.Str(required=True)
+    session_id = fields.Int()
+    observations = fields.List(fields.Nested(BleObservationSchema), required=True,
+                               validate=validate.Length(min=1, max=1000))
+
 class AttendanceResponseSchema(Schema):
     id = fields.Int()
     attendee_id = fields.Int()
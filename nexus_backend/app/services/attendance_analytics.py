@@ -0,0 +1,233 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from calendar import timegm
+from app import db
+from app.models.attendance import Attendance
+from app.models.session_model import Session
+from app.utils.etag import attendance_version, session_version
+
+# Statuses that count as attending a session
+ATTENDED_STATUSES = ('Present', 'Late')
+NO_TIMESTAMP = -1
+LOAD_BATCH = 10000
+
+# Dialects that can convert timestamps to epoch seconds in the query
+EPOCH_EXPRESSIONS = {
+    'postgresql': lambda column: db.cast(db.func.floor(db.extract('epoch', column)), db.BigInteger),
+    'sqlite': lambda column: db.cast(db.func.strftime('%s', column), db.BigInteger),
+}
+
+
+def to_epoch(value):
+    """Seconds since the epoch; naive datetimes (as SQLite returns them) are UTC"""
+    return NO_TIMESTAMP if value is None else timegm(value.utctimetuple())
+
+
+class _StatusCodes(dict):
+    """Status -> code, assigning the next code to statuses not seen yet"""
+
+    def __init__(self, names):
+        super().__init__()
+        self.names = names
+
+    def __missing__(self, status):
+        code = self[status] = len(self.names)
+        self.names.append(status if status is not None else 'Unknown')
+        return code
+
+
+class AttendanceSnapshot:
+    """Columnar, read-only copy of the attendance table.
+
+    Each attendance row is one slot in four parallel arrays: ``attendee``
+    (id), ``session`` (position in the session arrays, not the id), ``status``
+    (code into ``status_names``) and ``timestamp`` (epoch seconds). Rows are
+    ordered by session and then id, so a session's rows are
+    the slice ``row_start[p]:row_start[p + 1]`` and per-session tallies are
+    ``array.count`` calls on that slice. ``attendee_order`` holds the same
+    row numbers sorted by attendee, with ``attendee_keys`` alongside for
+    bisecting to one student's rows.
+    Sessions are indexed by course, the unit reports call a class.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.session_ids = array('i')
+        self.session_time = array('q')
+        self.session_course = array('i')
+        self.session_titles = []
+        self.courses = []
+        self.course_sessions = []
+        self.attendee = array('i')
+        self.session = array('i')
+        self.status = array('B')
+        self.timestamp = array('q')
+        self.status_names = []
+        self.row_start = array('i', [0])
+        self.attendee_order = array('i')
+        self.attendee_keys = array('i')
+
+    @classmethod
+    def load(cls, version):
+        """Read sessions and attendance into arrays with two streamed queries"""
+        snapshot = cls(version)
+        positions = {}
+        course_index = {}
+        for session_id, title, course_code, created_at in db.session.execute(
+            db.select(Session.id, Session.title, Session.course_code, Session.created_at).order_by(Session.id)
+        ):
+            course = course_index.get(course_code)
+            if course is None:
+                course = course_index[course_code] = len(snapshot.courses)
+                snapshot.courses.append(course_code)
+                snapshot.course_sessions.append([])
+            positions[session_id] = len(snapshot.session_ids)
+            snapshot.course_sessions[course].append(len(snapshot.session_ids))
+            snapshot.session_ids.append(session_id)
+            snapshot.session_time.append(to_epoch(created_at))
+            snapshot.session_course.append(course)
+            snapshot.session_titles.append(title)
+
+        attendance = Attendance.__table__
+        epoch = EPOCH_EXPRESSIONS.get(db.session.get_bind().dialect.name)
+        timestamp = attendance.c.timestamp if epoch is None else \
+            db.func.coalesce(epoch(attendance.c.timestamp), NO_TIMESTAMP)
+        if not snapshot.session_ids:
+            return snapshot._index()
+        # Only sessions read above: without a shared transaction snapshot
+        # (READ COMMITTED) sessions committed since then must be left out.
+        # session_id then id follows ix_attendance_session_id, so no sort step
+        result = db.session.connection().execution_options(yield_per=LOAD_BATCH).execute(
+            db.select(attendance.c.attendee_id, attendance.c.session_id, attendance.c.status, timestamp)
+            .where(attendance.c.session_id <= snapshot.session_ids[-1])
+            .order_by(attendance.c.session_id, attendance.c.id)
+        )
+        status_codes = _StatusCodes(snapshot.status_names)
+        for batch in result.partitions():
+            attendee_ids, session_ids, statuses, timestamps = zip(*batch)
+            if not positions.keys() >= set(session_ids):
+                # A lower id committed late, or rows of a deleted session
+                batch = [row for row in batch if row[1] in positions]
+                if not batch:
+                    continue
+                attendee_ids, session_ids, statuses, timestamps = zip(*batch)
+            snapshot.attendee.extend(attendee_ids)
+            snapshot.session.extend(map(positions.__getitem__, session_ids))
+            snapshot.status.extend(map(status_codes.__getitem__, statuses))
+            snapshot.timestamp.extend(timestamps if epoch is not None else map(to_epoch, timestamps))
+        return snapshot._index()
+
+    def _index(self):
+        """Build the per-session row offsets and the attendee ordering"""
+        sessions = self.session
+        self.row_start = array('i', (bisect_left(sessions, position)
+                                     for position in range(len(self.session_ids) + 1)))
+        # Stable sort: each attendee's rows stay in session order
+        self.attendee_order = array('i', sorted(range(len(self.attendee)), key=self.attendee.__getitem__))
+        self.attendee_keys = array('i', map(self.attendee.__getitem__, self.attendee_order))
+        return self
+
+    @property
+    def attended_codes(self):
+        return [code for code, name in enumerate(self.status_names) if name in ATTENDED_STATUSES]
+
+    def course_of(self, session_id):
+        """Course position of the class a session belongs to, or None"""
+        position = bisect_left(self.session_ids, session_id)
+        if position < len(self.session_ids) and self.session_ids[position] == session_id:
+            return self.session_course[position]
+        return None
+
+    def sessions_of(self, course=None, start=None, end=None):
+        """Session positions of one course (or all), held in [start, end)"""
+        positions = range(len(self.session_ids)) if course is None else self.course_sessions[course]
+        if start is None and end is None:
+            return list(positions)
+        start = NO_TIMESTAMP if start is None else start
+        end = float('inf') if end is None else end
+        times = self.session_time
+        return [position for position in positions if start <= times[position] < end]
+
+    def session_rows(self, position):
+        return self.row_start[position], self.row_start[position + 1]
+
+    def tally(self, positions):
+        """Row count per status code over the given sessions"""
+        totals = [0] * len(self.status_names)
+        codes = range(len(self.status_names))
+        for position in positions:
+            start, end = self.session_rows(position)
+            if start == end:
+                continue
+            statuses = self.status[start:end]
+            for code in codes:
+                totals[code] += statuses.count(code)
+        return totals
+
+    def attended(self, totals):
+        return sum(totals[code] for code in self.attended_codes)
+
+    def attendee_rows(self, attendee_id):
+        """Row numbers of one attendee's attendance, in session order"""
+        start = bisect_left(self.attendee_keys, attendee_id)
+        return self.attendee_order[start:bisect_right(self.attendee_keys, attendee_id, start)]
+
+
+class AttendanceAnalytics:
+    """Per-process cache of the attendance snapshot.
+
+    A full load reads every attendance row, so it is not redone on every
+    check-in: a snapshot is served for at least ``max_age`` seconds, and
+    after that it is reloaded only once the attendance or session version
+    behind the ETags has changed. Reports can therefore be up to
+    ``max_age`` seconds (plus the version check interval) behind. Reloads
+    are serialised, and while one runs other readers keep the previous
+    snapshot, which is never mutated; only the first load makes them wait.
+    """
+
+    def __init__(self, max_age=30.0):
+        self.max_age = max_age
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, app):
+        self.max_age = float(app.config.get('REPORT_SNAPSHOT_MAX_AGE', self.max_age))
+        self.invalidate()
+
+    def _fresh(self, snapshot):
+        return snapshot is not None and time.monotonic() - self._loaded_at < self.max_age
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+        version = (session_version(), attendance_version())
+        if snapshot is not None and snapshot.version == version:
+            self._loaded_at = time.monotonic()
+            return snapshot
+        # Only the first load waits; otherwise someone else is already reloading
+        if not self._lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            snapshot = self._snapshot
+            if not self._fresh(snapshot) and (snapshot is None or snapshot.version != version):
+                snapshot = AttendanceSnapshot.load(version)
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+        finally:
+            self._lock.release()
+        return snapshot
+
+    def invalidate(self):
+        self._snapshot = None
+
+
+attendance_analytics = AttendanceAnalytics()
+
+
+def init_attendance_analytics(app):
+    """Configure the report snapshot cache for this app"""
+    attendance_analytics.configure(app)
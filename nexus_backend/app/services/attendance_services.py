@@ -1,8 +1,20 @@
 from app.services.bluetoothservive import is_attendance_valid
 from app.models.attendance import Attendance
+from app.models.active_attendance import ActiveAttendance
+from app.models.attendance_counts import AttendanceCounts
 from app.models.device_model import Device
+from app.models.attendee_model import Attendee
+from app.services.live_attendance import notify_attendance_written
+from app.utils.etag import attendance_written, bump_attendance_version
 from app import db
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Dialects with INSERT ... ON CONFLICT (attendee_id, session_id) DO UPDATE
+UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
 
 
 class AttendanceService:
@@ -52,3 +64,162 @@ class AttendanceService:
     def get_all_attendance():
         """Retrieve all attendance records."""
         return Attendance.query.order_by(Attendance.timestamp.desc()).all()
+
+    @staticmethod
+    def upsert_session_attendance(session_id: int, records):
+        """
+        Insert or update many attendance records for one session.
+        Each record is a dict with 'attendee_id' and optional 'status'; a
+        later record for the same attendee wins. Uses a single
+        INSERT ... ON CONFLICT where the dialect supports it, otherwise one
+        SELECT of the session's existing rows plus a bulk UPDATE and INSERT.
+        The caller commits. Returns the number of records written.
+        """
+        statuses = {}
+        for record in records:
+            attendee_id = record.get('attendee_id')
+            if attendee_id is None:
+                continue
+            statuses[int(attendee_id)] = record.get('status', 'Present')
+        if not statuses:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        insert = UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+        if insert is not None:
+            stmt = insert(Attendance)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Attendance.attendee_id, Attendance.session_id],
+                set_={'status': stmt.excluded.status}
+            )
+            db.session.execute(stmt, [
+                {'attendee_id': attendee_id, 'session_id': session_id, 'status': status, 'timestamp': now}
+                for attendee_id, status in statuses.items()
+            ])
+        else:
+            existing = dict(db.session.execute(
+                db.select(Attendance.attendee_id, Attendance.id)
+                .where(Attendance.session_id == session_id, Attendance.attendee_id.in_(statuses))
+            ).all())
+
+            updates = [{'id': existing[attendee_id], 'status': status}
+                       for attendee_id, status in statuses.items() if attendee_id in existing]
+            inserts = [{'attendee_id': attendee_id, 'session_id': session_id, 'status': status, 'timestamp': now}
+                       for attendee_id, status in statuses.items() if attendee_id not in existing]
+            if updates:
+                db.session.execute(db.update(Attendance), updates)
+            if inserts:
+                db.session.execute(db.insert(Attendance), inserts)
+
+        # Bulk statements skip mapper events, so keep the active index in step here
+        ActiveAttendance.sync(
+            db.session,
+            Attendance.session_id == session_id,
+            Attendance.attendee_id.in_(statuses)
+        )
+        AttendanceCounts.refresh(db.session, [session_id], statuses)
+        notify_attendance_written([session_id], statuses_changed=True)
+        bump_attendance_version(db.session)
+        return len(statuses)
+
+
+    @staticmethod
+    def record_checkins(checkins):
+        """
+        Record many check-ins at once, skipping ones already recorded.
+        Each check-in is an (attendee_id, session_id, status) tuple. Costs one
+        SELECT for existing rows, one multi-row INSERT and one SELECT for the
+        new rows, whatever the batch size. The caller commits.
+        Returns {(attendee_id, session_id): (attendance dict, created)}.
+        """
+        statuses = {}
+        for attendee_id, session_id, status in checkins:
+            statuses.setdefault((attendee_id, session_id), status)
+        if not statuses:
+            return {}
+
+        def load(pairs):
+            return {
+                (record.attendee_id, record.session_id): record.to_dict()
+                for record in db.session.execute(
+                    db.select(Attendance)
+                    .where(db.tuple_(Attendance.attendee_id, Attendance.session_id).in_(pairs))
+                ).scalars()
+            }
+
+        existing = load(list(statuses))
+        missing = [pair for pair in statuses if pair not in existing]
+        created = {}
+        if missing:
+            now = datetime.now(timezone.utc)
+            db.session.execute(db.insert(Attendance), [
+                {'attendee_id': attendee_id, 'session_id': session_id,
+                 'status': statuses[(attendee_id, session_id)], 'timestamp': now}
+                for attendee_id, session_id in missing
+            ])
+            ActiveAttendance.sync(
+                db.session,
+                db.tuple_(Attendance.attendee_id, Attendance.session_id).in_(missing)
+            )
+            AttendanceCounts.add(db.session, [
+                (attendee_id, session_id, 1, 1 if statuses[(attendee_id, session_id)] == 'Present' else 0)
+                for attendee_id, session_id in missing
+            ])
+            created = load(missing)
+            notify_attendance_written()
+            attendance_written(db.session)
+
+        results = {pair: (record, False) for pair, record in existing.items()}
+        results.update((pair, (record, True)) for pair, record in created.items())
+        return results
+
+    @staticmethod
+    def record_observations(session_id: int, observations, verdicts):
+        """
+        Turn validated BLE observations into attendance for one session.
+        ``observations`` are dicts with 'attendee_id' or 'serial'; ``verdicts``
+        come from validate_observations. Students are resolved in one query
+        and anyone already in another active session is refused. The caller
+        commits. Returns (per-observation results, attendance rows created).
+        """
+        ids = {obs['attendee_id'] for obs in observations if obs.get('attendee_id') is not None}
+        serials = {obs['serial'] for obs in observations if obs.get('serial')}
+        known_ids = set()
+        by_serial = {}
+        if ids or serials:
+            for attendee_id, serial in db.session.execute(
+                db.select(Attendee.id, Attendee.serial)
+                .where(db.or_(Attendee.id.in_(ids), Attendee.serial.in_(serials)))
+            ):
+                known_ids.add(attendee_id)
+                if serial:
+                    by_serial[serial] = attendee_id
+
+        results = []
+        for index, (obs, (ble_id, rssi, reason)) in enumerate(zip(observations, verdicts)):
+            attendee_id = obs.get('attendee_id')
+            if attendee_id is None:
+                attendee_id = by_serial.get(obs.get('serial'))
+            if reason is None and attendee_id not in known_ids:
+                reason = 'Unknown attendee'
+            results.append({
+                'index': index,
+                'attendee_id': attendee_id,
+                'ble_id': ble_id,
+                'rssi': rssi,
+                'verdict': 'NO' if reason else 'YES',
+                'reason': reason
+            })
+
+        accepted = {result['attendee_id'] for result in results if result['verdict'] == 'YES'}
+        busy = ActiveAttendance.conflicting_attendees(accepted, session_id)
+        for result in results:
+            if result['attendee_id'] in busy and result['verdict'] == 'YES':
+                result['verdict'] = 'NO'
+                result['reason'] = 'Already in another active session'
+
+        recorded = AttendanceService.record_checkins(
+            (attendee_id, session_id, 'Present') for attendee_id in sorted(accepted - busy)
+        )
+        created = [record for record, is_new in recorded.values() if is_new]
+        return results, created
@@ -1,14 +1,19 @@
-from typing import Literal
-from app.utils.fingerprint import parse_and_validate
+from typing import Literal, Optional
+from app.utils.fingerprint import parse_and_validate, parse_and_validate_many
 from app.services.device_service import DeviceService
+from app.services.proximity import proximity_engine
 
 def is_attendance_valid(
     admin_ble_raw: str,
     student_ble_raw: str,
     student_rssi_raw,
-    rssi_threshold: int = -65
+    rssi_threshold: Optional[int] = None,
+    exit_threshold: Optional[int] = None
 ) -> Literal['YES', 'NO']:
-    """Check if BLE-based attendance is valid."""
+    """
+    Check if BLE-based attendance is valid.
+    Thresholds default to the proximity engine's (see ProximityEngine.thresholds).
+    """
 
     # Normalize inputs
     try:
@@ -26,8 +31,49 @@ def is_attendance_valid(
     if not admin_active:
         return 'NO'
 
-    # Check RSSI threshold (higher/more positive = stronger)
-    if student_rssi >= rssi_threshold:
+    # Smoothed RSSI with hysteresis (higher/more positive = stronger)
+    present, _ = proximity_engine.observe(student_ble, admin_ble, student_rssi, rssi_threshold, exit_threshold)
+    if present:
         return 'YES'
 
     return 'NO'
+
+def validate_observations(
+    admin_ble_raw: str,
+    observations,
+    rssi_threshold: Optional[int] = None,
+    exit_threshold: Optional[int] = None
+):
+    """
+    Validate a batch of (student_ble_raw, student_rssi_raw) scans taken by one beacon.
+    The beacon is parsed and checked once for the whole batch. Returns
+    (beacon_ok, verdicts) where each verdict is a (ble_id, rssi, reason) tuple,
+    rssi is the smoothed reading, and reason is None for observations that pass.
+    """
+    try:
+        admin_ble, _ = parse_and_validate(admin_ble_raw, -90)  # only BLE cleaning
+    except Exception:
+        return False, []
+    if not DeviceService.is_ble_active(admin_ble):
+        return False, []
+
+    verdicts = [None] * len(observations)
+    valid_indexes = []
+    valid_readings = []  # (student_ble, rssi) for the proximity engine
+    parsed = parse_and_validate_many(
+        [student_ble_raw for student_ble_raw, _ in observations],
+        [student_rssi_raw for _, student_rssi_raw in observations]
+    )
+    for index, (student_ble, student_rssi, error) in enumerate(parsed):
+        if error:
+            verdicts[index] = (None, None, error)
+            continue
+        verdicts[index] = (student_ble, student_rssi, None)
+        valid_indexes.append(index)
+        valid_readings.append((student_ble, student_rssi))
+
+    decisions = proximity_engine.observe_many(admin_ble, valid_readings, rssi_threshold, exit_threshold)
+    for index, (present, smoothed) in zip(valid_indexes, decisions):
+        student_ble, _, _ = verdicts[index]
+        verdicts[index] = (student_ble, smoothed, None if present else 'Signal too weak')
+    return True, verdicts
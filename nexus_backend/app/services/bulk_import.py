@@ -0,0 +1,234 @@
+import csv
+import io
+import secrets
+from itertools import islice
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.enrollment import Enrollment
+from app.models.user_directory import UserDirectory, normalize_email
+from app.utils.email import send_welcome_emails
+from app.utils.hashing import BatchHasher
+
+IMPORT_MODELS = {
+    'Attendee': Attendee,
+    'Attendant': Attendant,
+}
+
+# Column limits shared by both user tables, checked before anything is inserted
+NAME_MAX_LENGTH = Attendee.__table__.c.name.type.length
+EMAIL_MAX_LENGTH = Attendee.__table__.c.email.type.length
+
+
+class ImportAborted(Exception):
+    """Raised by ``on_chunk`` to stop the import; not a failure of the chunk's rows"""
+
+
+def failure_reason(error):
+    """Short reason for a row the database refused.
+
+    Never the exception text: driver errors include the bound parameters,
+    password hashes among them, and reasons are stored and returned by the API.
+    """
+    if isinstance(error, IntegrityError):
+        return 'Email already exists'
+    return 'Could not be saved'
+
+
+def row_role(row, default_role):
+    """Role for a CSV row; the role column only applies to mixed uploads"""
+    if default_role:
+        return default_role
+    role = (row.get('role') or 'Attendee').strip()
+    return 'Attendant' if role.lower() == 'attendant' else 'Attendee'
+
+
+class CsvImporter:
+    """Streaming, set-based CSV user import.
+
+    The upload is decoded and parsed incrementally and handled in chunks of
+    ``chunk_size`` rows. Each chunk costs one IN query against the user
+    directory to find taken emails, one bulk INSERT per role, one UPDATE per
+    role to derive serials from the new ids and one commit, so memory and
+    transaction size stay bounded by the chunk rather than the file.
+    """
+
+    def __init__(self, default_role=None, chunk_size=500, hasher=None, keep_results=True):
+        self.default_role = default_role
+        self.chunk_size = chunk_size
+        self.hasher = hasher or BatchHasher(workers=0)
+        self.keep_results = keep_results
+        self.created = []
+        self.failed = []
+
+    def run(self, stream, skip_rows=0):
+        """Import every row from a binary file stream.
+
+        ``skip_rows`` data rows are skipped first, so an interrupted import
+        can continue after its last committed chunk.
+        """
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+        for _ in islice(reader, skip_rows):
+            pass
+        while True:
+            chunk = list(islice(reader, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk)
+        return self
+
+    def on_chunk(self, rows_read, created, failed):
+        """Hook called inside each chunk's transaction, right before commit"""
+
+    def import_chunk(self, rows):
+        """Create users for one chunk of CSV rows and commit them.
+
+        The chunk is inserted set-based; if the database refuses it (say an
+        email was taken since the directory check), it is retried one row
+        per savepoint so only the offending rows fail.
+        """
+        created = []
+        failed = []
+        accounts = self._new_accounts(rows, failed)
+
+        if accounts:
+            try:
+                created = self._insert_users(accounts)
+                send_welcome_emails(created, commit=False)
+                self.on_chunk(len(rows), created, failed)
+                db.session.commit()
+            except ImportAborted:
+                db.session.rollback()
+                raise
+            except Exception:
+                db.session.rollback()
+                accounts = self._insert_one_by_one(accounts, failed)
+                created = [user for user in accounts if user is not None]
+                send_welcome_emails(created, commit=False)
+                accounts = None
+
+        if not accounts:
+            # Nothing was inserted in bulk, but failures and progress still get committed
+            self.on_chunk(len(rows), created, failed)
+            db.session.commit()
+
+        if self.keep_results:
+            self.created.extend(created)
+            self.failed.extend(failed)
+        return created, failed
+
+    def _insert_one_by_one(self, accounts, failed):
+        """Insert accounts one savepoint each; returns created users (None where it failed)"""
+        created = []
+        for account in accounts:
+            try:
+                with db.session.begin_nested():
+                    created.extend(self._insert_users([account]))
+            except Exception as e:
+                failed.append({'email': account[0]['email'], 'reason': failure_reason(e)})
+                created.append(None)
+        return created
+
+    def _new_accounts(self, rows, failed):
+        """(user, temporary password, hash) for valid rows whose emails are not taken yet"""
+        users = self._new_users(rows, failed)
+        passwords = [secrets.token_urlsafe(8) for _ in users]
+        return list(zip(users, passwords, self.hash_passwords(passwords))) if users else []
+
+    def _new_users(self, rows, failed):
+        """Validated rows whose emails are not taken yet"""
+        candidates = []
+        seen = set()
+        for row in rows:
+            name = (row.get('name') or '').strip()
+            email = normalize_email(row.get('email'))
+
+            # Skip if missing data
+            if not name or not email:
+                continue
+            if len(name) > NAME_MAX_LENGTH:
+                failed.append({'email': email, 'reason': f'Name is longer than {NAME_MAX_LENGTH} characters'})
+                continue
+            if len(email) > EMAIL_MAX_LENGTH:
+                failed.append({'email': email[:EMAIL_MAX_LENGTH], 'reason': f'Email is longer than {EMAIL_MAX_LENGTH} characters'})
+                continue
+            if email in seen:
+                failed.append({'email': email, 'reason': 'Duplicate email in file'})
+                continue
+            seen.add(email)
+            candidates.append({
+                'name': name,
+                'email': email,
+                'units': (row.get('units') or '').strip(),
+                'role': row_role(row, self.default_role)
+            })
+
+        if not candidates:
+            return []
+
+        # One IN query for every email in the chunk
+        taken = set(db.session.execute(
+            db.select(UserDirectory.email).where(UserDirectory.email.in_(seen))
+        ).scalars())
+
+        new_users = []
+        for candidate in candidates:
+            if candidate['email'] in taken:
+                failed.append({'email': candidate['email'], 'reason': 'Email already exists'})
+            else:
+                new_users.append(candidate)
+        return new_users
+
+    def hash_passwords(self, passwords):
+        """Hash a batch of temporary passwords"""
+        return self.hasher.hash_many(passwords)
+
+    def _insert_users(self, accounts):
+        created = [None] * len(accounts)
+        for role, model in IMPORT_MODELS.items():
+            batch = [(index, user, password, pwhash)
+                     for index, (user, password, pwhash) in enumerate(accounts)
+                     if user['role'] == role]
+            if not batch:
+                continue
+
+            inserted = db.session.execute(
+                db.insert(model).returning(model.id, sort_by_parameter_order=True),
+                [{
+                    'name': user['name'],
+                    'email': user['email'],
+                    'units': user['units'] or None,
+                    'password_hash': pwhash
+                } for _, user, _, pwhash in batch]
+            ).scalars().all()
+
+            # Bulk inserts bypass mapper events, so keep the directory in step here
+            db.session.execute(db.insert(UserDirectory), [
+                {'email': user['email'], 'role': role, 'user_id': user_id}
+                for (_, user, _, _), user_id in zip(batch, inserted)
+            ])
+
+            if model is Attendee:  # ...and the enrollment index
+                Enrollment.sync(db.session, {
+                    user_id: user['units'] for (_, user, _, _), user_id in zip(batch, inserted) if user['units']
+                })
+
+            # Derive serials from the new ids in one statement
+            db.session.execute(
+                db.update(model)
+                .where(model.id.in_(inserted))
+                .values(serial=model.serial_expression())
+            )
+
+            # Keep file order in the results
+            for (index, user, password, _), user_id in zip(batch, inserted):
+                created[index] = {
+                    'name': user['name'],
+                    'email': user['email'],
+                    'role': role,
+                    'serial': model.serial_for(user_id),
+                    'units': user['units'],
+                    'password': password
+                }
+        return created
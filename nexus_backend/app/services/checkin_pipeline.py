@@ -0,0 +1,153 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from flask import jsonify
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.services.attendance_services import AttendanceService
+
+
+class CheckinTimeout(Exception):
+    """Raised when a queued check-in was not committed within CHECKIN_TIMEOUT.
+
+    The check-in may still be written later; retrying is safe because
+    already-recorded check-ins come back with created=False.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__('Check-in was not committed in time')
+        self.retry_after = retry_after
+
+
+class CheckinPipeline:
+    """Group-commit ingestion for check-ins.
+
+    With CHECKIN_GROUP_COMMIT off (the default) each check-in is written and
+    committed by the request that made it. With it on, requests queue their
+    check-in and wait on a future while a writer thread collects everything
+    that arrives within CHECKIN_COMMIT_WINDOW_MS (up to CHECKIN_MAX_BATCH)
+    and writes the group with one multi-row INSERT and one commit. Futures
+    resolve only after that commit, so a successful response still means
+    the row is durable. A check-in still waiting after CHECKIN_TIMEOUT
+    seconds raises CheckinTimeout.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.window = 0.005
+        self.max_batch = 500
+        self.timeout = 10.0
+        self.retry_after = 1
+        self._queue = queue.Queue()
+        self._thread = None
+        self._atexit_registered = False
+
+    def configure(self, app):
+        self.stop()
+        self.app = app
+        config = app.config
+        self.enabled = bool(config.get('CHECKIN_GROUP_COMMIT', False))
+        self.window = float(config.get('CHECKIN_COMMIT_WINDOW_MS', 5)) / 1000
+        self.max_batch = int(config.get('CHECKIN_MAX_BATCH', 500))
+        self.timeout = float(config.get('CHECKIN_TIMEOUT', 10))
+        self.retry_after = int(config.get('CHECKIN_RETRY_AFTER', 1))
+        if not self.enabled:
+            return
+
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='checkin-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write whatever is queued and stop the writer thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def check_in(self, attendee_id, session_id, status='Present'):
+        """Record a check-in; returns (attendance dict, created)"""
+        attendee_id, session_id = int(attendee_id), int(session_id)
+        if self._thread is None:
+            return self.write([(attendee_id, session_id, status)])[(attendee_id, session_id)]
+
+        future = Future()
+        self._queue.put((attendee_id, session_id, status, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise CheckinTimeout(self.retry_after)
+
+    def write(self, checkins):
+        """Write a group of check-ins and commit them together"""
+        try:
+            results = AttendanceService.record_checkins(checkins)
+            db.session.commit()
+            return results
+        except IntegrityError:
+            # Lost a race with another writer; the retry finds its rows
+            db.session.rollback()
+            results = AttendanceService.record_checkins(checkins)
+            db.session.commit()
+            return results
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        try:
+            with self.app.app_context():
+                results = self.write([(attendee_id, session_id, status)
+                                      for attendee_id, session_id, status, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                # Don't let one bad check-in fail the whole group
+                for item in batch:
+                    self._flush([item])
+                return
+            batch[0][3].set_exception(e)
+            return
+
+        for attendee_id, session_id, _, future in batch:
+            future.set_result(results[(attendee_id, session_id)])
+
+
+checkin_pipeline = CheckinPipeline()
+
+
+def checkin_timeout_response(error):
+    """503 response telling the client when to retry"""
+    response = jsonify({'error': 'Check-in is taking longer than usual, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def init_checkin_pipeline(app):
+    """Start the group-commit check-in writer if CHECKIN_GROUP_COMMIT is on"""
+    checkin_pipeline.configure(app)
@@ -3,6 +3,7 @@ from typing import Optional
 from app import db
 from app.models.session_model import Session
 from app.models.device_model import Device
+from app.utils.ble_registry import ble_registry
 
 class DeviceServiceError(Exception):
     """Custom exception for device service errors."""
@@ -72,5 +73,4 @@ class DeviceService:
     @staticmethod
     def is_ble_active(ble_id: str) -> bool:
         """Check if a device with the given BLE ID is registered and active."""
-        device = Device.query.filter_by(ble_id=ble_id, is_active=True).first()
-        return device is not None
+        return ble_registry.is_active(ble_id)
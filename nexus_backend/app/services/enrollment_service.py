@@ -0,0 +1,108 @@
+import csv
+import io
+from app import db
+from app.models.attendee_model import Attendee
+from app.models.enrollment import Enrollment, parse_units
+from app.utils.principal_cache import principal_cache
+
+MAX_BULK_ENROLLMENT = 5000
+
+
+class EnrollmentError(Exception):
+    """Raised for bulk enrollment requests that can't be processed"""
+    pass
+
+
+def read_serials_csv(stream):
+    """Serials from an uploaded CSV: the 'serial' column if there is one, else the first column"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    rows = [row for row in csv.reader(text) if row and any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    if 'serial' in header:
+        column = header.index('serial')
+        return [row[column].strip() for row in rows[1:] if len(row) > column and row[column].strip()]
+    return [row[0].strip() for row in rows if row[0].strip()]
+
+
+class EnrollmentService:
+    """Handles course enrollment for attendees."""
+
+    @staticmethod
+    def enroll_many(course_code: str, student_ids=(), serials=()):
+        """
+        Enroll many attendees, given by id and/or serial, in one course.
+        Students are resolved with one query and the course's existing
+        enrollments for them with another; only the set difference is
+        written, as one multi-row INSERT plus one bulk UPDATE of their units.
+        The caller commits. Returns (per-student results in request order,
+        number newly enrolled).
+        """
+        course_code = (course_code or '').strip()
+        if not course_code:
+            raise EnrollmentError('Course code required')
+        if len(course_code) > Enrollment.course_code.type.length:
+            raise EnrollmentError('Course code is too long')
+
+        try:
+            requests = [('studentId', int(student_id)) for student_id in student_ids]
+        except (TypeError, ValueError):
+            raise EnrollmentError('studentIds must be integers')
+        requests.extend(('serial', str(serial).strip()) for serial in serials if str(serial).strip())
+        if not requests:
+            raise EnrollmentError('Provide studentIds or serials')
+        if len(requests) > MAX_BULK_ENROLLMENT:
+            raise EnrollmentError(f'At most {MAX_BULK_ENROLLMENT} students per request')
+
+        ids = {value for key, value in requests if key == 'studentId'}
+        wanted_serials = {value for key, value in requests if key == 'serial'}
+        found = db.session.execute(
+            db.select(Attendee.id, Attendee.name, Attendee.serial, Attendee.units)
+            .where(db.or_(Attendee.id.in_(ids), Attendee.serial.in_(wanted_serials)))
+        ).all()
+        by_id = {row.id: row for row in found}
+        by_serial = {row.serial: row for row in found if row.serial}
+
+        already = set(db.session.execute(
+            db.select(Enrollment.attendee_id)
+            .where(Enrollment.course_code == course_code, Enrollment.attendee_id.in_(by_id))
+        ).scalars()) if by_id else set()
+        new_ids = sorted(set(by_id) - already)
+
+        if new_ids:
+            # Bulk statements skip mapper events, so write the index and units together
+            db.session.execute(db.insert(Enrollment), [
+                {'attendee_id': attendee_id, 'course_code': course_code} for attendee_id in new_ids
+            ])
+            db.session.execute(db.update(Attendee), [
+                {'id': attendee_id, 'units': ','.join(parse_units(by_id[attendee_id].units) + [course_code])}
+                for attendee_id in new_ids
+            ])
+            for attendee_id in new_ids:
+                principal_cache.invalidate(f"attendee_{attendee_id}")
+
+        enrolled = set(new_ids)
+        seen = set()
+        results = []
+        for key, value in requests:
+            row = by_id.get(value) if key == 'studentId' else by_serial.get(value)
+            if row is None:
+                status = 'not_found'
+            elif row.id in seen:
+                status = 'duplicate'
+            elif row.id in enrolled:
+                status = 'enrolled'
+            else:
+                status = 'already_enrolled'
+            results.append({
+                'requested': value,
+                'requestedBy': key,
+                'id': row.id if row else None,
+                'name': row.name if row else None,
+                'serial': row.serial if row else None,
+                'status': status
+            })
+            if row is not None:
+                seen.add(row.id)
+        return results, len(new_ids)
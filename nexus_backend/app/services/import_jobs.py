@@ -0,0 +1,237 @@
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from app import db
+from app.models.import_job import ImportJob, ImportJobResult
+from app.utils.clock import utcnow
+from app.services.bulk_import import CsvImporter, ImportAborted
+from app.utils.hashing import BatchHasher
+
+
+class ImportClaimLost(ImportAborted):
+    """Another worker took over the job (our heartbeat went stale)"""
+
+
+class JobImporter(CsvImporter):
+    """CSV importer that records progress and results on an ImportJob.
+
+    Counters and result rows are written in the same transaction as the
+    users of each chunk, so ``rows_processed`` always matches what is
+    committed and a resumed job neither skips nor repeats rows.
+    """
+
+    def __init__(self, job, token, **kwargs):
+        super().__init__(default_role=job.role, keep_results=False, **kwargs)
+        self.job_id = job.id
+        self.token = token
+
+    def on_chunk(self, rows_read, created, failed):
+        results = [{
+            'job_id': self.job_id,
+            'status': 'created',
+            'name': user['name'],
+            'email': user['email'],
+            'role': user['role'],
+            'serial': user['serial'],
+            'units': user['units']
+        } for user in created]
+        results.extend({
+            'job_id': self.job_id,
+            'status': 'failed',
+            'email': user['email'],
+            'reason': user['reason']
+        } for user in failed)
+        if results:
+            db.session.execute(db.insert(ImportJobResult), results)
+
+        updated = db.session.execute(
+            db.update(ImportJob)
+            .where(ImportJob.id == self.job_id, ImportJob.claimed_by == self.token)
+            .values(
+                rows_processed=ImportJob.rows_processed + rows_read,
+                created_count=ImportJob.created_count + len(created),
+                failed_count=ImportJob.failed_count + len(failed),
+                heartbeat_at=utcnow()
+            )
+        )
+        if updated.rowcount != 1:
+            raise ImportClaimLost(f'Import job {self.job_id} was claimed by another worker')
+
+
+class ImportJobRunner:
+    """In-process worker pool for CSV import jobs.
+
+    Uploads are saved to IMPORT_UPLOAD_DIR and recorded as queued jobs. A
+    scheduler thread claims queued jobs with a conditional UPDATE and runs
+    them on IMPORT_WORKERS threads. Running jobs refresh ``heartbeat_at`` on
+    every chunk; a job whose heartbeat is older than IMPORT_JOB_STALE_SECONDS
+    (e.g. after a restart) is claimed again and resumes after its last
+    committed chunk.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.workers = 0
+        self._executor = None
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def configure(self, app):
+        self.stop()
+        self.app = app
+        config = app.config
+        self.workers = int(config.get('IMPORT_WORKERS', 2))
+        self.poll_interval = float(config.get('IMPORT_POLL_INTERVAL', 10))
+        self.stale_seconds = float(config.get('IMPORT_JOB_STALE_SECONDS', 300))
+        self.upload_dir = config.get('IMPORT_UPLOAD_DIR') or os.path.join(app.instance_path, 'imports')
+
+        if self.workers < 1 or not config.get('IMPORT_JOBS_ENABLED', True):
+            return
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='import')
+        self._active = set()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='import-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def create_job(self, file, role=None, created_by=None):
+        """Save an uploaded file and queue an import job for it"""
+        os.makedirs(self.upload_dir, exist_ok=True)
+        path = os.path.join(self.upload_dir, f'{uuid.uuid4().hex}.csv')
+        file.save(path)
+
+        job = ImportJob(role=role, file_path=path, filename=file.filename, created_by=created_by)
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            os.remove(path)
+            raise
+        self._wake.set()
+        return job
+
+    def _due(self):
+        stale = utcnow() - timedelta(seconds=self.stale_seconds)
+        return db.or_(
+            ImportJob.status == 'queued',
+            db.and_(ImportJob.status == 'running', ImportJob.heartbeat_at < stale)
+        )
+
+    def _run(self):
+        stop = self._stop
+        while not stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if stop.is_set():
+                break
+            try:
+                with self.app.app_context():
+                    self.schedule()
+            except Exception as e:
+                print(f"Import scheduler error: {e}")
+
+    def schedule(self):
+        """Claim due jobs for every idle worker"""
+        with self._lock:
+            free = self.workers - len(self._active)
+        if free < 1:
+            return
+
+        ids = db.session.execute(
+            db.select(ImportJob.id).where(self._due()).order_by(ImportJob.id).limit(free)
+        ).scalars().all()
+        for job_id in ids:
+            token = self.claim(job_id)
+            if token:
+                with self._lock:
+                    self._active.add(job_id)
+                self._executor.submit(self._execute, job_id, token)
+
+    def claim(self, job_id):
+        """Mark a due job as running for this worker; returns the claim token"""
+        now = utcnow()
+        token = uuid.uuid4().hex
+        updated = db.session.execute(
+            db.update(ImportJob)
+            .where(ImportJob.id == job_id, self._due())
+            .values(
+                status='running',
+                claimed_by=token,
+                heartbeat_at=now,
+                started_at=db.func.coalesce(ImportJob.started_at, now)
+            )
+        )
+        db.session.commit()
+        return token if updated.rowcount == 1 else None
+
+    def _execute(self, job_id, token):
+        try:
+            with self.app.app_context():
+                self.run_job(job_id, token)
+        except Exception as e:
+            print(f"Import job {job_id} error: {e}")
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+            # Look for more work as soon as a worker frees up
+            self._wake.set()
+
+    def run_job(self, job_id, token):
+        """Import a claimed job's file, continuing after its committed rows"""
+        job = db.session.get(ImportJob, job_id)
+        config = self.app.config
+        try:
+            with BatchHasher.from_config(config) as hasher, open(job.file_path, 'rb') as stream:
+                JobImporter(
+                    job, token,
+                    chunk_size=config['BULK_IMPORT_CHUNK_SIZE'],
+                    hasher=hasher
+                ).run(stream, skip_rows=job.rows_processed)
+        except ImportClaimLost as e:
+            db.session.rollback()
+            print(e)
+            return
+        except Exception as e:
+            db.session.rollback()
+            self._finish(job_id, token, 'failed', str(e))
+            return
+
+        if self._finish(job_id, token, 'completed'):
+            try:
+                os.remove(job.file_path)
+            except OSError:
+                pass
+
+    def _finish(self, job_id, token, status, error=None):
+        updated = db.session.execute(
+            db.update(ImportJob)
+            .where(ImportJob.id == job_id, ImportJob.claimed_by == token)
+            .values(status=status, error=error, finished_at=utcnow(), claimed_by=None)
+        )
+        db.session.commit()
+        return updated.rowcount == 1
+
+
+import_job_runner = ImportJobRunner()
+
+
+def init_import_jobs(app):
+    """Start the background CSV import workers for this app"""
+    import_job_runner.configure(app)
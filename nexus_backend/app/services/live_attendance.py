@@ -0,0 +1,335 @@
+import json
+import queue
+import threading
+import time
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session as OrmSession, object_session
+from app import db
+from app.models.attendance import Attendance
+from app.models.session_model import Session
+
+WAKE_KEY = 'live_attendance_wake'
+DIRTY_KEY = 'live_attendance_dirty'
+
+
+class LiveStreamFull(Exception):
+    """Raised when this worker already serves LIVE_MAX_CONNECTIONS streams"""
+
+    def __init__(self, retry_after):
+        super().__init__('Too many live attendance streams')
+        self.retry_after = retry_after
+
+
+class LiveSubscription:
+    """One dashboard connection: a bounded queue of pre-formatted SSE frames"""
+
+    def __init__(self, session_id, queue_size):
+        self.session_id = session_id
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def push(self, frame):
+        """Queue a frame; False if the client has fallen too far behind"""
+        try:
+            self.frames.put_nowait(frame)
+            return True
+        except queue.Full:
+            return False
+
+
+def format_event(name, data, event_id=None):
+    """Serialise one server-sent event"""
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines.append(f'event: {name}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class LiveAttendanceHub:
+    """Fans committed check-ins out to live dashboard streams.
+
+    One publisher thread per worker watches the attendance table for the
+    sessions somebody is subscribed to: each cycle reads the rows added
+    since the last cycle with one query, updates running present/total
+    counters and pushes a pre-formatted ``checkin`` event to every
+    subscriber of the session. Commits in this process wake it straight
+    away; rows written by other workers are picked up within
+    LIVE_POLL_INTERVAL seconds. Counters are recounted when a subscriber
+    joins, after local status changes and every LIVE_RECOUNT_INTERVAL
+    seconds, and a stream gets an ``end`` event once its session stops.
+
+    Ids are allocated at insert but become visible at commit, so on
+    PostgreSQL a lower id can appear after a higher one. Each cycle
+    re-reads the ids of the LIVE_LAG_WINDOW rows below the high-water mark
+    and publishes the ones it has not seen yet; a row committed later than
+    that window is only reflected by the next recount.
+
+    Streams are capped at LIVE_MAX_CONNECTIONS per worker, and a client
+    that lets LIVE_QUEUE_SIZE events pile up is disconnected (it gets a
+    fresh snapshot when it reconnects).
+    """
+
+    # Shortest gap between publisher cycles, so bursts of commits are coalesced
+    min_interval = 0.1
+
+    def __init__(self):
+        self.app = None
+        self.max_connections = 100
+        self.poll_interval = 1.0
+        self.recount_interval = 30.0
+        self.heartbeat = 15.0
+        self.queue_size = 256
+        self.lag_window = 1000
+        self._subscribers = {}  # session_id -> set of LiveSubscription
+        self._connections = 0
+        self._counts = {}  # session_id -> [present, total] as of self._last_id
+        self._fresh = set()  # sessions with new subscribers waiting for a snapshot
+        self._dirty = set()  # sessions whose statuses changed in this process
+        self._last_id = None
+        self._seen = set()  # ids in the lag window below self._last_id already handled
+        self._recounted_at = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def configure(self, app):
+        self.stop()
+        self.app = app
+        config = app.config
+        self.max_connections = int(config.get('LIVE_MAX_CONNECTIONS', 100))
+        self.poll_interval = float(config.get('LIVE_POLL_INTERVAL', 1))
+        self.recount_interval = float(config.get('LIVE_RECOUNT_INTERVAL', 30))
+        self.heartbeat = float(config.get('LIVE_HEARTBEAT_SECONDS', 15))
+        self.queue_size = int(config.get('LIVE_QUEUE_SIZE', 256))
+        self.lag_window = int(config.get('LIVE_LAG_WINDOW', 1000))
+
+    def stop(self):
+        """Stop the publisher and close every stream"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        with self._lock:
+            for subscriptions in self._subscribers.values():
+                for subscription in subscriptions:
+                    self._close(subscription)
+            self._subscribers = {}
+            self._connections = 0
+            self._counts = {}
+            self._last_id = None
+            self._seen = set()
+
+    def wake(self, dirty=()):
+        """Ask the publisher to look for new rows now"""
+        if dirty:
+            with self._lock:
+                self._dirty.update(dirty)
+        self._wake.set()
+
+    def subscribe(self, session_id):
+        """Register a stream for a session; raises LiveStreamFull at the cap"""
+        with self._lock:
+            if self._connections >= self.max_connections:
+                raise LiveStreamFull(retry_after=max(1, int(self.heartbeat)))
+            subscription = LiveSubscription(session_id, self.queue_size)
+            self._subscribers.setdefault(session_id, set()).add(subscription)
+            self._connections += 1
+            self._fresh.add(session_id)
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, name='live-attendance', daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.session_id)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+            subscriptions.discard(subscription)
+            self._connections -= 1
+            if not subscriptions:
+                del self._subscribers[subscription.session_id]
+                self._counts.pop(subscription.session_id, None)
+
+    def stream(self, subscription):
+        """Generator of SSE frames for one subscription; unsubscribes when it ends"""
+        try:
+            yield f'retry: {int(self.poll_interval * 1000) + 1000}\n\n'
+            while True:
+                try:
+                    frame = subscription.frames.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    if subscription.closed:
+                        break
+                    # Comment line so proxies keep the connection and dead clients surface
+                    yield ': keep-alive\n\n'
+                    continue
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+    @staticmethod
+    def _close(subscription):
+        subscription.closed = True
+        subscription.push(None)
+
+    def _broadcast(self, session_id, frame):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(session_id, ()))
+        for subscription in subscriptions:
+            if not subscription.push(frame):
+                # Slow consumer: drop it rather than buffer without bound
+                subscription.closed = True
+                self.unsubscribe(subscription)
+
+    def _run(self):
+        stop = self._stop
+        while not stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if stop.is_set():
+                break
+            try:
+                with self.app.app_context():
+                    self.publish()
+            except Exception as e:
+                print(f"Live attendance publisher error: {e}")
+            stop.wait(self.min_interval)
+
+    def publish(self):
+        """One publisher cycle: push new check-ins, counters and session ends"""
+        with self._lock:
+            session_ids = list(self._subscribers)
+            recount = self._fresh | (self._dirty & set(session_ids))
+            self._fresh = set()
+            self._dirty = set()
+        if not session_ids:
+            # Start from the then-current rows when someone subscribes again
+            self._last_id = None
+            self._seen = set()
+            return
+
+        # Read up to a fixed high-water mark so counts and rows agree
+        top = db.session.execute(db.select(func.max(Attendance.id))).scalar() or 0
+        last_id = top if self._last_id is None else self._last_id
+        # Ids above the old mark, plus the lag window below it for late commits
+        committed = db.session.execute(
+            db.select(Attendance.id).where(Attendance.id > last_id - self.lag_window, Attendance.id <= top)
+        ).scalars().all()
+        new_ids = [] if self._last_id is None else [row_id for row_id in committed if row_id not in self._seen]
+        rows = []
+        if new_ids:
+            rows = db.session.execute(
+                db.select(Attendance)
+                .where(Attendance.id.in_(new_ids), Attendance.session_id.in_(session_ids))
+                .order_by(Attendance.id)
+            ).scalars().all()
+        self._last_id = top
+        self._seen = {row_id for row_id in committed if row_id > top - self.lag_window}
+
+        now = time.monotonic()
+        if now - self._recounted_at >= self.recount_interval:
+            recount = set(session_ids)
+            self._recounted_at = now
+        recount |= {session_id for session_id in session_ids if session_id not in self._counts}
+        if recount:
+            counts = {session_id: [0, 0] for session_id in recount}
+            for session_id, total, present in db.session.execute(
+                db.select(
+                    Attendance.session_id,
+                    func.count(),
+                    func.coalesce(func.sum(db.case((Attendance.status == 'Present', 1), else_=0)), 0)
+                )
+                .where(Attendance.session_id.in_(recount), Attendance.id <= top)
+                .group_by(Attendance.session_id)
+            ):
+                counts[session_id] = [int(present), int(total)]
+            self._counts.update(counts)
+            for session_id, (present, total) in counts.items():
+                self._broadcast(session_id, format_event('counts', {
+                    'sessionId': session_id, 'present': present, 'total': total
+                }))
+
+        for record in rows:
+            counts = self._counts.setdefault(record.session_id, [0, 0])
+            if record.session_id not in recount:  # recounts already include rows up to top
+                counts[1] += 1
+                if record.status == 'Present':
+                    counts[0] += 1
+            self._broadcast(record.session_id, format_event('checkin', {
+                'attendance': record.to_dict(), 'present': counts[0], 'total': counts[1]
+            }, event_id=record.id))
+
+        active = set(db.session.execute(
+            db.select(Session.id).where(Session.id.in_(session_ids), Session.is_active == True)
+        ).scalars())
+        for session_id in session_ids:
+            if session_id in active:
+                continue
+            self._broadcast(session_id, format_event('end', {'sessionId': session_id}))
+            with self._lock:
+                subscriptions = list(self._subscribers.get(session_id, ()))
+            for subscription in subscriptions:
+                self._close(subscription)
+                self.unsubscribe(subscription)
+        db.session.rollback()  # don't hold a snapshot open between cycles
+
+
+live_attendance = LiveAttendanceHub()
+
+
+def notify_attendance_written(session_ids=(), statuses_changed=False):
+    """Wake the publisher once the current transaction commits.
+
+    For writes that skip mapper events (bulk INSERT/UPDATE); pass
+    statuses_changed when existing rows may have changed status so the
+    sessions' counters are recounted.
+    """
+    info = db.session.info
+    info[WAKE_KEY] = True
+    if statuses_changed:
+        info.setdefault(DIRTY_KEY, set()).update(session_ids)
+
+
+def _attendance_inserted(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[WAKE_KEY] = True
+
+
+def _attendance_updated(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and inspect(target).attrs.status.history.has_changes():
+        session.info[WAKE_KEY] = True
+        session.info.setdefault(DIRTY_KEY, set()).add(target.session_id)
+
+
+def _session_committed(session):
+    dirty = session.info.pop(DIRTY_KEY, None)
+    if session.info.pop(WAKE_KEY, None):
+        live_attendance.wake(dirty or ())
+
+
+def _session_rolled_back(session):
+    session.info.pop(WAKE_KEY, None)
+    session.info.pop(DIRTY_KEY, None)
+
+
+def init_live_attendance(app):
+    """Configure live attendance streams and wake them on attendance commits"""
+    listeners = [
+        (Attendance, 'after_insert', _attendance_inserted),
+        (Attendance, 'after_update', _attendance_updated),
+        (OrmSession, 'after_commit', _session_committed),
+        (OrmSession, 'after_rollback', _session_rolled_back),
+    ]
+    for target, event_name, listener in listeners:
+        if not event.contains(target, event_name, listener):
+            event.listen(target, event_name, listener)
+    live_attendance.configure(app)
@@ -0,0 +1,134 @@
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+
+class ProximityEngine:
+    """Smoothed, hysteresis-based presence decisions from RSSI samples.
+
+    Each (student device, beacon) pair gets a slot in preallocated arrays:
+    a ring buffer of the last ``window`` RSSI samples (signed bytes), plus
+    per-slot head, count, presence flag and last-seen time. The smoothed
+    estimate is the median of the buffered samples. A device becomes present
+    once it reaches the enter threshold and only stops being present when
+    it falls below the (lower) exit threshold, so readings hovering around a
+    single cut-off don't flap. At most ``max_devices`` pairs are tracked;
+    the least recently seen pair is evicted when full and pairs idle for
+    ``idle_seconds`` are dropped as new samples arrive.
+    """
+
+    def __init__(self, window=5, max_devices=50000, idle_seconds=300,
+                 enter_threshold=-65, hysteresis=5):
+        self.configure_limits(window, max_devices, idle_seconds)
+        self.enter_threshold = enter_threshold
+        self.hysteresis = hysteresis
+
+    def configure_limits(self, window, max_devices, idle_seconds):
+        self.window = window
+        self.max_devices = max_devices
+        self.idle_seconds = idle_seconds
+        self._samples = array('b', bytes(window * max_devices))
+        self._heads = array('H', bytes(2 * max_devices))
+        self._counts = array('H', bytes(2 * max_devices))
+        self._present = array('b', bytes(max_devices))
+        self._seen = array('d', bytes(8 * max_devices))
+        self._slots = OrderedDict()  # (device, beacon) -> slot, least recently seen first
+        self._free = list(range(max_devices - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def configure(self, app):
+        config = app.config
+        self.configure_limits(
+            int(config.get('PROXIMITY_WINDOW', 5)),
+            int(config.get('PROXIMITY_MAX_DEVICES', 50000)),
+            float(config.get('PROXIMITY_IDLE_SECONDS', 300))
+        )
+        self.enter_threshold = int(config.get('PROXIMITY_ENTER_THRESHOLD', -65))
+        self.hysteresis = int(config.get('PROXIMITY_HYSTERESIS', 5))
+
+    def thresholds(self, session=None):
+        """(enter, exit) thresholds for a session, falling back to the defaults"""
+        return self._resolve(
+            getattr(session, 'rssi_enter_threshold', None),
+            getattr(session, 'rssi_exit_threshold', None)
+        )
+
+    def _resolve(self, enter, exit_):
+        if enter is None:
+            enter = self.enter_threshold
+        if exit_ is None:
+            exit_ = enter - self.hysteresis
+        return enter, min(exit_, enter)
+
+    def _slot(self, key, now):
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+
+        # Drop idle pairs first, then the least recently seen one if still full
+        while self._slots:
+            oldest_key, oldest_slot = next(iter(self._slots.items()))
+            if now - self._seen[oldest_slot] < self.idle_seconds and self._free:
+                break
+            del self._slots[oldest_key]
+            self._free.append(oldest_slot)
+
+        slot = self._free.pop()
+        self._heads[slot] = 0
+        self._counts[slot] = 0
+        self._present[slot] = 0
+        self._slots[key] = slot
+        return slot
+
+    def _observe(self, key, rssi, enter, exit_, now):
+        slot = self._slot(key, now)
+        base = slot * self.window
+        head = self._heads[slot]
+        self._samples[base + head] = max(-128, min(127, int(rssi)))
+        self._heads[slot] = (head + 1) % self.window
+        count = min(self._counts[slot] + 1, self.window)
+        self._counts[slot] = count
+        self._seen[slot] = now
+
+        buffered = sorted(self._samples[base:base + count])
+        middle = count // 2
+        smoothed = buffered[middle] if count % 2 else (buffered[middle - 1] + buffered[middle]) / 2
+
+        if self._present[slot]:
+            present = smoothed >= exit_
+        else:
+            present = smoothed >= enter
+        self._present[slot] = present
+        return present, smoothed
+
+    def observe(self, device, beacon, rssi, enter=None, exit_=None):
+        """Add one sample; returns (present, smoothed RSSI)"""
+        enter, exit_ = self._resolve(enter, exit_)
+        with self._lock:
+            return self._observe((device, beacon), rssi, enter, exit_, time.monotonic())
+
+    def observe_many(self, beacon, readings, enter=None, exit_=None):
+        """Add (device, rssi) samples seen by one beacon; returns [(present, smoothed)]"""
+        enter, exit_ = self._resolve(enter, exit_)
+        now = time.monotonic()
+        with self._lock:
+            return [self._observe((device, beacon), rssi, enter, exit_, now) for device, rssi in readings]
+
+    def forget(self, device, beacon):
+        with self._lock:
+            slot = self._slots.pop((device, beacon), None)
+            if slot is not None:
+                self._free.append(slot)
+
+    def __len__(self):
+        return len(self._slots)
+
+
+proximity_engine = ProximityEngine()
+
+
+def init_proximity(app):
+    """Size the proximity engine from config"""
+    proximity_engine.configure(app)
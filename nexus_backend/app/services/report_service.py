@@ -1,32 +1,188 @@
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from app import db
-from app.models.attendance import Attendance
-from app.models.session_model import Session
 from app.models.attendee_model import Attendee
+from app.models.enrollment import Enrollment
+from app.services.attendance_analytics import NO_TIMESTAMP, attendance_analytics, to_epoch
+
+DAY_SECONDS = 86400
+
+
+def parse_report_date(value: Optional[str], end: bool = False) -> Optional[int]:
+    """Epoch seconds for a YYYY-MM-DD or ISO 8601 bound (UTC unless it has an offset).
+
+    A date-only ``end`` covers that whole day. Raises ValueError for bad input.
+    """
+    if not value:
+        return None
+    epoch = to_epoch(datetime.fromisoformat(value))
+    if end and len(value) <= 10:
+        epoch += DAY_SECONDS
+    return epoch
+
+
+def _isoformat(epoch):
+    return None if epoch == NO_TIMESTAMP else datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _rate(attended, total):
+    return round(attended / total * 100, 2) if total else 0
+
 
 class ReportService:
+    """Attendance reports computed over the in-process columnar snapshot.
+
+    A class is a course: ``class_id`` is the id of any session of that
+    course, and the class is every session sharing its course code. Dates
+    filter on when sessions were held (``created_at``); Present and Late
+    count as attending. Methods return None when the class doesn't exist.
+    Each report touches only the rows of the sessions or student it covers,
+    so one class and the whole institution go through the same code.
+    """
+
     @staticmethod
-    def get_student_attendance_percentage(student_id: int, class_id: int, start_dt: str = None, end_dt: str = None) -> float:
-        """Get attendance percentage for a student"""
-        return 85.5  # Placeholder
-    
+    def get_student_attendance_percentage(student_id: int, class_id: int, start_dt: str = None, end_dt: str = None) -> Optional[float]:
+        """Percentage of the class's sessions in the range the student attended"""
+        snapshot = attendance_analytics.snapshot()
+        course = snapshot.course_of(class_id)
+        if course is None:
+            return None
+        held = set(snapshot.sessions_of(course, parse_report_date(start_dt), parse_report_date(end_dt, end=True)))
+        attended_codes = set(snapshot.attended_codes)
+        sessions, statuses = snapshot.session, snapshot.status
+        attended = sum(1 for row in snapshot.attendee_rows(student_id)
+                       if sessions[row] in held and statuses[row] in attended_codes)
+        return float(_rate(attended, len(held)))
+
     @staticmethod
-    def get_class_absentees(class_id: int, date_str: str) -> List[Dict]:
-        """Get absentees for a class on a specific date"""
-        return []  # Placeholder
-    
+    def get_class_absentees(class_id: int, date_str: str) -> Optional[List[Dict]]:
+        """Enrolled or recorded students who missed a session of the class on a date (default today, UTC)"""
+        snapshot = attendance_analytics.snapshot()
+        course = snapshot.course_of(class_id)
+        if course is None:
+            return None
+        day = parse_report_date(date_str) if date_str else to_epoch(datetime.now(timezone.utc))
+        day -= day % DAY_SECONDS
+        held = snapshot.sessions_of(course, day, day + DAY_SECONDS)
+        if not held:
+            return []
+
+        roster = set(db.session.execute(
+            db.select(Enrollment.attendee_id).where(Enrollment.course_code == snapshot.courses[course])
+        ).scalars())
+        attended_codes = set(snapshot.attended_codes)
+        missed = {}
+        for position in held:
+            start, end = snapshot.session_rows(position)
+            recorded = snapshot.attendee[start:end]
+            attended = {attendee_id for attendee_id, code in zip(recorded, snapshot.status[start:end])
+                        if code in attended_codes}
+            for attendee_id in (roster | set(recorded)) - attended:
+                missed.setdefault(attendee_id, []).append(snapshot.session_ids[position])
+        if not missed:
+            return []
+
+        students = db.session.execute(
+            db.select(Attendee.id, Attendee.name, Attendee.email, Attendee.serial)
+            .where(Attendee.id.in_(missed))
+            .order_by(Attendee.name, Attendee.id)
+        ).all()
+        return [{
+            'student_id': student.id,
+            'name': student.name,
+            'email': student.email,
+            'serial': student.serial,
+            'missed_sessions': missed[student.id]
+        } for student in students]
+
     @staticmethod
     def get_student_attendance_history(student_id: int) -> List[Dict]:
-        """Get attendance history for a student"""
-        return []  # Placeholder
-    
+        """Attendance records for a student, oldest first"""
+        snapshot = attendance_analytics.snapshot()
+        rows = sorted(snapshot.attendee_rows(student_id), key=snapshot.timestamp.__getitem__)
+        history = []
+        for row in rows:
+            position = snapshot.session[row]
+            history.append({
+                'session_id': snapshot.session_ids[position],
+                'session_title': snapshot.session_titles[position],
+                'course_code': snapshot.courses[snapshot.session_course[position]],
+                'status': snapshot.status_names[snapshot.status[row]],
+                'timestamp': _isoformat(snapshot.timestamp[row])
+            })
+        return history
+
     @staticmethod
-    def get_class_summary(class_id: int) -> Dict:
-        """Get class attendance summary"""
-        return {'total_sessions': 0, 'average_attendance': 0}  # Placeholder
-    
+    def get_class_summary(class_id: int) -> Optional[Dict]:
+        """Per-session and overall attendance for a class"""
+        snapshot = attendance_analytics.snapshot()
+        course = snapshot.course_of(class_id)
+        if course is None:
+            return None
+        course_code = snapshot.courses[course]
+        enrolled = db.session.execute(
+            db.select(db.func.count()).select_from(Enrollment).where(Enrollment.course_code == course_code)
+        ).scalar()
+
+        totals = [0] * len(snapshot.status_names)
+        sessions = []
+        for position in snapshot.sessions_of(course):
+            counts = snapshot.tally([position])
+            totals = [total + count for total, count in zip(totals, counts)]
+            records = sum(counts)
+            sessions.append({
+                'session_id': snapshot.session_ids[position],
+                'title': snapshot.session_titles[position],
+                'held_at': _isoformat(snapshot.session_time[position]),
+                'total_records': records,
+                'attended': snapshot.attended(counts),
+                'attendance_rate': _rate(snapshot.attended(counts), records)
+            })
+
+        records = sum(totals)
+        return {
+            'course_code': course_code,
+            'total_sessions': len(sessions),
+            'enrolled_students': enrolled,
+            'total_records': records,
+            'status_counts': {name: count for name, count in zip(snapshot.status_names, totals) if count},
+            'average_attendance': _rate(snapshot.attended(totals), records),
+            'sessions': sessions
+        }
+
     @staticmethod
     def get_overall_summary(start_dt: str = None, end_dt: str = None) -> Dict:
-        """Get overall attendance summary"""
-        return {'total_classes': 0, 'total_sessions': 0, 'overall_attendance': 0}  # Placeholder
+        """Attendance across every class, for sessions held in the range"""
+        snapshot = attendance_analytics.snapshot()
+        held = snapshot.sessions_of(None, parse_report_date(start_dt), parse_report_date(end_dt, end=True))
+
+        by_course = {}
+        students = set()
+        for position in held:
+            counts = snapshot.tally([position])
+            course = by_course.setdefault(snapshot.session_course[position], [0, 0, 0])
+            course[0] += 1
+            course[1] += sum(counts)
+            course[2] += snapshot.attended(counts)
+            start, end = snapshot.session_rows(position)
+            students.update(snapshot.attendee[start:end])
+
+        classes = []
+        for course, (sessions, course_records, course_attended) in sorted(
+                by_course.items(), key=lambda item: snapshot.courses[item[0]]):
+            classes.append({
+                'course_code': snapshot.courses[course],
+                'total_sessions': sessions,
+                'total_records': course_records,
+                'attendance_rate': _rate(course_attended, course_records)
+            })
+        records = sum(entry['total_records'] for entry in classes)
+        attended = sum(course[2] for course in by_course.values())
+        return {
+            'total_classes': len(classes),
+            'total_sessions': len(held),
+            'total_students': len(students),
+            'total_records': records,
+            'overall_attendance': _rate(attended, records),
+            'classes': classes
+        }
@@ -1,13 +1,18 @@
 
-from app.utils.auth import generate_token, decode_token, auth_required, admin_required
+from app.utils.auth import generate_token, decode_token, auth_required, admin_required, current_principal
 from app.utils.email import send_welcome_email, send_reset_email
+from app.utils.hashing import hash_password, verify_password, HashingPoolBusy
 
 __all__ = [
     'generate_token',
     'decode_token',
     'auth_required',
     'admin_required',
+    'current_principal',
     'send_welcome_email',
-    'send_reset_email'
+    'send_reset_email',
+    'hash_password',
+    'verify_password',
+    'HashingPoolBusy'
 ]
 
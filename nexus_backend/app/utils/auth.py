@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import jsonify, current_app
+from flask import jsonify, current_app, g
 from flask_jwt_extended import (
     create_access_token, 
     jwt_required, 
@@ -8,6 +8,7 @@ from flask_jwt_extended import (
 )
 from datetime import timedelta
 import jwt as pyjwt
+from app.utils.principal_cache import principal_cache
 
 def generate_token(user_id):
     """Generate JWT token for user"""
@@ -24,8 +25,16 @@ def verify_token(token):
     except Exception as e:
         return None
 
+def current_principal():
+    """Principal resolved by auth_required/admin_required for this request"""
+    return g.get('principal')
+
 def auth_required(f):
-    """Decorator for protected routes"""
+    """Decorator for protected routes.
+
+    Passes the numeric user id to the view and exposes the cached principal
+    through current_principal().
+    """
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
@@ -34,7 +43,11 @@ def auth_required(f):
 
             # Extract numeric ID from token (format: "attendant_2", "attendee_6", "admin_1")
             if isinstance(current_user_id, str) and '_' in current_user_id:
-                user_id = int(current_user_id.split('_')[1])
+                principal = principal_cache.get(current_user_id)
+                if principal is None:
+                    return jsonify({'error': 'Invalid token'}), 401
+                g.principal = principal
+                user_id = principal.id
             else:
                 user_id = current_user_id
 
@@ -50,19 +63,18 @@ def admin_required(f):
     def decorated_function(*args, **kwargs):
         try:
             current_user_id = get_jwt_identity()
-            from app.models.admin_model import Admin
 
             # Extract ID from token (format: "admin_1")
             if isinstance(current_user_id, str) and current_user_id.startswith('admin_'):
-                admin_id = int(current_user_id.split('_')[1])
-                admin = Admin.query.get(admin_id)
+                admin = principal_cache.get(current_user_id)
 
                 if not admin:
                     return jsonify({'error': 'Admin access required'}), 403
 
-                return f(admin_id, *args, **kwargs)
+                g.principal = admin
+                return f(admin.id, *args, **kwargs)
             else:
                 return jsonify({'error': 'Admin access required'}), 403
         except Exception as e:
             return jsonify({'error': 'Access denied'}), 403
-    return decorated_function
\ No newline at end of file
+    return decorated_function
@@ -0,0 +1,231 @@
+import threading
+import time
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as OrmSession, object_session
+from app import db
+from app.models.cache_version import CacheVersion
+from app.models.device_model import Device
+from app.models.session_model import Session
+
+CACHE_NAME = 'ble_devices'
+SESSIONS_CACHE_NAME = 'active_sessions'
+PENDING_KEY = 'ble_registry_changes'
+SESSIONS_PENDING_KEY = 'ble_registry_sessions'
+RELOAD = (None, None)
+
+
+class BleRegistry:
+    """In-process map of active beacons (ble_id -> attendant_id) and of
+    each attendant's active session, which together route a check-in from
+    the beacon it was scanned at to its session.
+
+    Loaded at startup so check-ins can verify a beacon without a database
+    read. Device and session writes in this process update the maps when
+    they commit and bump the ``ble_devices`` / ``active_sessions`` cache
+    versions; other workers compare those versions at most every
+    BLE_REGISTRY_CHECK_INTERVAL seconds and reload when they moved, which
+    bounds how long they can serve a stale map.
+    """
+
+    def __init__(self, check_interval=5.0):
+        self.check_interval = check_interval
+        self._active = {}
+        self._routes = {}  # attendant_id -> (session_id, enter threshold, exit threshold)
+        self._version = None  # None until loaded
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, app):
+        self.check_interval = float(app.config.get('BLE_REGISTRY_CHECK_INTERVAL', self.check_interval))
+        self._version = None
+        with app.app_context():
+            try:
+                self.reload()
+            except Exception:
+                # Tables may not exist yet (e.g. before migrations); load on first use instead
+                db.session.rollback()
+
+    @staticmethod
+    def _current_version():
+        return CacheVersion.current(CACHE_NAME), CacheVersion.current(SESSIONS_CACHE_NAME)
+
+    def reload(self):
+        """Load every active beacon and active session and the versions they correspond to"""
+        version = self._current_version()
+        active = dict(db.session.execute(
+            db.select(Device.ble_id, Device.attendant_id).where(Device.is_active == True)
+        ).all())
+        routes = {}
+        rows = db.session.execute(
+            db.select(Session.attendant_id, Session.id, Session.rssi_enter_threshold, Session.rssi_exit_threshold)
+            .where(Session.is_active == True)
+            .order_by(Session.id)
+        ).all()
+        for attendant_id, session_id, enter, exit_ in rows:
+            routes[attendant_id] = (session_id, enter, exit_)  # latest session wins
+        with self._lock:
+            self._active = active
+            self._routes = routes
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return
+            # Claim this check so concurrent callers keep using the current map
+            self._checked_at = now
+            loaded = self._version
+        if loaded is None or self._current_version() != loaded:
+            self.reload()
+
+    def is_active(self, ble_id):
+        """Check if a beacon is registered and active"""
+        self._refresh()
+        return ble_id in self._active
+
+    def attendant_for(self, ble_id):
+        """Attendant owning an active beacon, or None"""
+        self._refresh()
+        return self._active.get(ble_id)
+
+    def route(self, ble_id):
+        """(session_id, enter threshold, exit threshold) of the active session
+        run by the beacon's attendant, or None. Thresholds may be None (defaults)."""
+        self._refresh()
+        attendant_id = self._active.get(ble_id)
+        if attendant_id is None:
+            return None
+        return self._routes.get(attendant_id)
+
+    def apply(self, changes):
+        """Apply committed (ble_id, attendant_id or None) changes from this process"""
+        with self._lock:
+            for ble_id, attendant_id in changes:
+                if ble_id is None:
+                    self._version = None
+                elif attendant_id is None:
+                    self._active.pop(ble_id, None)
+                else:
+                    self._active[ble_id] = attendant_id
+
+    def apply_routes(self, changes):
+        """Apply committed (attendant_id, route or None) changes from this process"""
+        with self._lock:
+            for attendant_id, route in changes:
+                if attendant_id is None:
+                    self._version = None
+                elif route is None:
+                    self._routes.pop(attendant_id, None)
+                else:
+                    self._routes[attendant_id] = route
+
+
+ble_registry = BleRegistry()
+
+
+def _record(target, changes, key=PENDING_KEY):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(key, []).extend(changes)
+
+
+def _device_inserted(mapper, connection, target):
+    CacheVersion.bump(connection, CACHE_NAME)
+    _record(target, [(target.ble_id, target.attendant_id if target.is_active else None)])
+
+
+def _device_updated(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if not any(attrs[key].history.has_changes() for key in ('ble_id', 'is_active', 'attendant_id')):
+        return
+    CacheVersion.bump(connection, CACHE_NAME)
+    history = attrs.ble_id.history
+    changes = [(ble_id, None) for ble_id in history.deleted if ble_id]
+    if history.has_changes() and not changes:
+        # Old id wasn't loaded, so we can't drop it; reload on next use instead
+        changes.append(RELOAD)
+    changes.append((target.ble_id, target.attendant_id if target.is_active else None))
+    _record(target, changes)
+
+
+def _device_deleted(mapper, connection, target):
+    CacheVersion.bump(connection, CACHE_NAME)
+    _record(target, [(target.ble_id, None)])
+
+
+def _record_routes(connection, target, attendant_ids):
+    """Re-read the latest active session of each attendant a session write touched"""
+    CacheVersion.bump(connection, SESSIONS_CACHE_NAME)
+    table = Session.__table__
+    changes = []
+    for attendant_id in attendant_ids:
+        if attendant_id is None:
+            changes.append(RELOAD)
+            continue
+        row = connection.execute(
+            db.select(table.c.id, table.c.rssi_enter_threshold, table.c.rssi_exit_threshold)
+            .where(table.c.attendant_id == attendant_id, table.c.is_active == True)
+            .order_by(table.c.id.desc())
+            .limit(1)
+        ).first()
+        changes.append((attendant_id, tuple(row) if row else None))
+    _record(target, changes, SESSIONS_PENDING_KEY)
+
+
+def _session_inserted(mapper, connection, target):
+    if target.is_active is not False:
+        _record_routes(connection, target, [target.attendant_id])
+
+
+def _session_updated(mapper, connection, target):
+    attrs = inspect(target).attrs
+    keys = ('is_active', 'attendant_id', 'rssi_enter_threshold', 'rssi_exit_threshold')
+    if not any(attrs[key].history.has_changes() for key in keys):
+        return
+    history = attrs.attendant_id.history
+    attendant_ids = [attendant_id for attendant_id in history.deleted if attendant_id is not None]
+    if history.has_changes() and not attendant_ids:
+        # Previous attendant wasn't loaded, so we can't re-route it; reload on next use instead
+        attendant_ids.append(None)
+    attendant_ids.append(target.attendant_id)
+    _record_routes(connection, target, attendant_ids)
+
+
+def _session_deleted(mapper, connection, target):
+    _record_routes(connection, target, [target.attendant_id])
+
+
+def _session_committed(session):
+    changes = session.info.pop(PENDING_KEY, None)
+    if changes:
+        ble_registry.apply(changes)
+    routes = session.info.pop(SESSIONS_PENDING_KEY, None)
+    if routes:
+        ble_registry.apply_routes(routes)
+
+
+def _session_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(SESSIONS_PENDING_KEY, None)
+
+
+def init_ble_registry(app):
+    """Load the beacon routing registry and keep it in step with device and session writes"""
+    listeners = [
+        (Device, 'after_insert', _device_inserted),
+        (Device, 'after_update', _device_updated),
+        (Device, 'after_delete', _device_deleted),
+        (Session, 'after_insert', _session_inserted),
+        (Session, 'after_update', _session_updated),
+        (Session, 'after_delete', _session_deleted),
+        (OrmSession, 'after_commit', _session_committed),
+        (OrmSession, 'after_rollback', _session_rolled_back),
+    ]
+    for target, event_name, listener in listeners:
+        if not event.contains(target, event_name, listener):
+            event.listen(target, event_name, listener)
+    ble_registry.configure(app)
@@ -0,0 +1,6 @@
+from datetime import datetime, timezone
+
+
+def utcnow():
+    """Naive UTC timestamp, comparable with stored DateTime columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
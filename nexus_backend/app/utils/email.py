@@ -1,38 +1,316 @@
+import queue
 import smtplib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from email.mime.text import MIMEText
-import os
+from flask import current_app
+from app import db
+from app.utils.clock import utcnow
 
-def send_simple_email(to_email, subject, message):
-    """Send simple email"""
+
+def mail_configured(config):
+    """Check if there is enough SMTP config to send mail"""
+    if not config.get('MAIL_USE_AUTH', True):
+        return bool(config.get('MAIL_SERVER'))
+    return bool(config.get('MAIL_USERNAME') and config.get('MAIL_PASSWORD'))
+
+
+class SMTPConnectionPool:
+    """Small pool of authenticated SMTP connections reused across batches"""
+
+    def __init__(self, config):
+        self.host = config.get('MAIL_SERVER', 'smtp.gmail.com')
+        self.port = int(config.get('MAIL_PORT', 587))
+        self.use_tls = config.get('MAIL_USE_TLS', True)
+        self.use_auth = config.get('MAIL_USE_AUTH', True)
+        self.username = config.get('MAIL_USERNAME')
+        self.password = config.get('MAIL_PASSWORD')
+        self.timeout = float(config.get('MAIL_TIMEOUT', 30))
+        self.idle_timeout = float(config.get('MAIL_IDLE_TIMEOUT', 60))
+        self._idle = queue.LifoQueue(maxsize=int(config.get('MAIL_POOL_SIZE', 2)))
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.use_auth:
+            server.login(self.username, self.password)
+        return server
+
+    def acquire(self):
+        """Return a live connection, reusing an idle one when possible"""
+        while True:
+            try:
+                server, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - released_at < self.idle_timeout:
+                try:
+                    server.noop()
+                    return server
+                except smtplib.SMTPException:
+                    pass
+            self._close(server)
+
+    def release(self, server):
+        try:
+            self._idle.put_nowait((server, time.monotonic()))
+        except queue.Full:
+            self._close(server)
+
+    def discard(self, server):
+        self._close(server)
+
+    def close_all(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+
+class MailDispatcher:
+    """Background sender for the outbound_emails queue.
+
+    Requests only insert rows into outbound_emails. This thread claims
+    due rows in batches, spreads each batch over MAIL_POOL_SIZE reused SMTP
+    connections and deletes rows once sent. Failures are retried with
+    exponential backoff until MAIL_MAX_ATTEMPTS, after which the row is
+    left with status 'failed' and its body (which may hold a temporary
+    password or reset code) cleared. Failed rows are deleted once they are
+    MAIL_RETENTION_DAYS old. Rows stuck in 'sending' (e.g. after a crash)
+    are reclaimed after MAIL_CLAIM_TIMEOUT seconds.
+    """
+
+    # Seconds between sweeps for expired failed rows
+    PURGE_INTERVAL = 3600
+
+    def __init__(self):
+        self.app = None
+        self.pool = None
+        self._executor = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_purge = 0
+
+    def configure(self, app):
+        self.stop()
+        self.app = app
+        config = app.config
+        self.pool_size = int(config.get('MAIL_POOL_SIZE', 2))
+        self.batch_size = int(config.get('MAIL_BATCH_SIZE', 50))
+        self.max_attempts = int(config.get('MAIL_MAX_ATTEMPTS', 5))
+        self.retry_backoff = float(config.get('MAIL_RETRY_BACKOFF', 30))
+        self.poll_interval = float(config.get('MAIL_POLL_INTERVAL', 5))
+        self.claim_timeout = float(config.get('MAIL_CLAIM_TIMEOUT', 300))
+        self.retention_days = float(config.get('MAIL_RETENTION_DAYS', 7))
+        self.sender = config.get('MAIL_DEFAULT_SENDER') or config.get('MAIL_USERNAME') or 'no-reply@nexus.local'
+
+        if not mail_configured(config) or not config.get('MAIL_DISPATCHER_ENABLED', True):
+            return
+
+        self.pool = SMTPConnectionPool(config)
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='smtp')
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='mail-dispatcher', daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Ask the dispatcher to look at the queue now"""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.pool is not None:
+            self.pool.close_all()
+            self.pool = None
+
+    def _run(self):
+        stop = self._stop
+        while not stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if stop.is_set():
+                break
+            try:
+                with self.app.app_context():
+                    if time.monotonic() >= self._next_purge:
+                        self.purge_failed()
+                        self._next_purge = time.monotonic() + self.PURGE_INTERVAL
+                    # Keep draining while batches come back full
+                    while not stop.is_set() and self.dispatch_batch() >= self.batch_size:
+                        pass
+            except Exception as e:
+                print(f"Mail dispatcher error: {e}")
+
+    def _claim_batch(self):
+        from app.models.outbound_email import OutboundEmail
+
+        now = utcnow()
+        stale = now - timedelta(seconds=self.claim_timeout)
+        due = db.or_(
+            db.and_(OutboundEmail.status == 'pending', OutboundEmail.next_attempt_at <= now),
+            db.and_(OutboundEmail.status == 'sending', OutboundEmail.claimed_at < stale)
+        )
+        ids = db.session.execute(
+            db.select(OutboundEmail.id).where(due).order_by(OutboundEmail.id).limit(self.batch_size)
+        ).scalars().all()
+        if not ids:
+            return []
+
+        # Conditional UPDATE so concurrent workers never claim the same row
+        token = uuid.uuid4().hex
+        db.session.execute(
+            db.update(OutboundEmail)
+            .where(OutboundEmail.id.in_(ids), due)
+            .values(status='sending', claimed_by=token, claimed_at=now)
+        )
+        db.session.commit()
+        return db.session.execute(
+            db.select(OutboundEmail.id, OutboundEmail.to_email, OutboundEmail.subject,
+                      OutboundEmail.body, OutboundEmail.attempts)
+            .where(OutboundEmail.claimed_by == token)
+        ).all()
+
+    def _send_chunk(self, rows):
+        """Send rows over one pooled connection; returns {id: error or None}"""
+        results = {}
+        server = None
+        for row in rows:
+            try:
+                if server is None:
+                    server = self.pool.acquire()
+                msg = MIMEText(row.body)
+                msg['Subject'] = row.subject
+                msg['From'] = self.sender
+                msg['To'] = row.to_email
+                server.send_message(msg)
+                results[row.id] = None
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                # Connection-level failure: drop it and reconnect for the next message
+                if server is not None:
+                    self.pool.discard(server)
+                    server = None
+                results[row.id] = str(e)
+            except smtplib.SMTPException as e:
+                results[row.id] = str(e)
+            except Exception as e:
+                # Anything else (a bad header, an encoding error) still counts as a
+                # failed attempt, so the row ends up failed instead of being reclaimed
+                # forever; the connection's state is unknown, so don't reuse it
+                if server is not None:
+                    self.pool.discard(server)
+                    server = None
+                results[row.id] = f"{type(e).__name__}: {e}"
+        if server is not None:
+            self.pool.release(server)
+        return results
+
+    def dispatch_batch(self):
+        """Claim, send and settle one batch; returns the number of rows claimed"""
+        from app.models.outbound_email import OutboundEmail
+
+        rows = self._claim_batch()
+        if not rows:
+            return 0
+
+        chunks = [rows[i::self.pool_size] for i in range(self.pool_size) if rows[i::self.pool_size]]
+        results = {}
+        for chunk_results in self._executor.map(self._send_chunk, chunks):
+            results.update(chunk_results)
+
+        sent_ids = [row_id for row_id, error in results.items() if error is None]
+        if sent_ids:
+            db.session.execute(db.delete(OutboundEmail).where(OutboundEmail.id.in_(sent_ids)))
+
+        now = utcnow()
+        for row in rows:
+            error = results.get(row.id)
+            if error is None:
+                continue
+            attempts = row.attempts + 1
+            print(f"Email to {row.to_email} failed (attempt {attempts}): {error}")
+            values = dict(
+                status='pending',
+                attempts=attempts,
+                last_error=error,
+                claimed_by=None,
+                next_attempt_at=now + timedelta(seconds=self.retry_backoff * 2 ** (attempts - 1))
+            )
+            if attempts >= self.max_attempts:
+                # Given up: keep the row for diagnosis, but not the message
+                values.update(status='failed', body='')
+            db.session.execute(db.update(OutboundEmail).where(OutboundEmail.id == row.id).values(**values))
+        db.session.commit()
+        return len(rows)
+
+    def purge_failed(self):
+        """Delete failed rows older than MAIL_RETENTION_DAYS; returns the number deleted"""
+        from app.models.outbound_email import OutboundEmail
+
+        cutoff = utcnow() - timedelta(days=self.retention_days)
+        deleted = db.session.execute(
+            db.delete(OutboundEmail).where(OutboundEmail.status == 'failed', OutboundEmail.created_at < cutoff)
+        ).rowcount
+        db.session.commit()
+        return deleted
+
+
+mail_dispatcher = MailDispatcher()
+
+
+def init_mail(app):
+    """Start the background mail dispatcher for this app"""
+    mail_dispatcher.configure(app)
+
+
+def send_simple_email(to_email, subject, message, commit=True):
+    """Queue a simple email for the background dispatcher.
+
+    Pass commit=False to enqueue as part of the caller's transaction.
+    """
     try:
-        sender_email = os.getenv('MAIL_USERNAME')
-        sender_password = os.getenv('MAIL_PASSWORD')
-        
-        if not sender_email or not sender_password:
+        if not mail_configured(current_app.config):
             print("Email not configured - skipping email send")
             return True  # Don't fail if email not configured
-        
-        # Create email
-        msg = MIMEText(message)
-        msg['Subject'] = subject
-        msg['From'] = sender_email
-        msg['To'] = to_email
-        
-        # Send email
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
-        
+
+        from app.models.outbound_email import OutboundEmail
+
+        db.session.add(OutboundEmail(to_email=to_email, subject=subject, body=message))
+        if commit:
+            db.session.commit()
+        mail_dispatcher.wake()
         return True
     except Exception as e:
+        if commit:
+            db.session.rollback()
         print(f"Email failed: {e}")
         return True  # Don't fail the main operation
 
-def send_welcome_email(email, name, password):
-    """Send welcome email to new user"""
+def welcome_email(email, name, password):
+    """Subject and body of the welcome email for a new user"""
     subject = "Welcome to NEXUS - Your Account is Ready!"
-    
+
     message = f"""
 Hello {name},
 
@@ -51,13 +329,38 @@ Login at: http://localhost:3000
 Best regards,
 NEXUS Team
     """
-    
-    return send_simple_email(email, subject, message)
+
+    return subject, message
+
+def send_welcome_email(email, name, password, commit=True):
+    """Send welcome email to new user"""
+    subject, message = welcome_email(email, name, password)
+    return send_simple_email(email, subject, message, commit=commit)
+
+def send_welcome_emails(users, commit=True):
+    """Queue welcome emails for many new users with one bulk INSERT.
+
+    Each user is a dict with 'email', 'name' and 'password'.
+    """
+    if not users or not mail_configured(current_app.config):
+        return True
+
+    from app.models.outbound_email import OutboundEmail
+
+    rows = []
+    for user in users:
+        subject, message = welcome_email(user['email'], user['name'], user['password'])
+        rows.append({'to_email': user['email'], 'subject': subject, 'body': message})
+    db.session.execute(db.insert(OutboundEmail), rows)
+    if commit:
+        db.session.commit()
+    mail_dispatcher.wake()
+    return True
 
 def send_reset_email(email, code):
     """Send password reset code"""
     subject = "NEXUS - Password Reset Code"
-    
+
     message = f"""
 Hello,
 
@@ -70,5 +373,5 @@ If you didn't request this, ignore this email.
 Best regards,
 NEXUS Team
     """
-    
-    return send_simple_email(email, subject, message)
\ No newline at end of file
+
+    return send_simple_email(email, subject, message)
@@ -0,0 +1,164 @@
+import hashlib
+import time
+from functools import wraps
+from flask import make_response, request
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session as OrmSession, object_session
+from app import db
+from app.models.attendance import Attendance
+from app.models.cache_version import CacheVersion
+from app.utils.session_directory import session_directory
+
+ATTENDANCE_CACHE_NAME = 'attendance_changes'
+PENDING_KEY = 'attendance_version_changed'
+
+
+def versioned_etag(versions):
+    """Decorator for polled GET endpoints: strong ETags from version counters.
+
+    ``versions`` is called with the view's arguments and returns a small
+    hashable value (a tuple of version counters and whatever per-user
+    inputs shape the response), or None to skip ETags for this request.
+    It runs before the view, so a matching If-None-Match is answered with
+    304 without running the view's queries. The version is taken before
+    the body is rendered, so a response can only ever be newer than its
+    ETag, never older. Stack it under ``auth_required``.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            version = versions(*args, **kwargs)
+            if version is None:
+                return f(*args, **kwargs)
+
+            etag = hashlib.sha1(repr((request.endpoint, version)).encode()).hexdigest()
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Clients may store it but must revalidate every time
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
+
+
+def session_version():
+    """Version of the sessions table (from the in-process session directory)"""
+    return session_directory.version
+
+
+class AttendanceVersion:
+    """Per-process memo of the attendance version behind ETags.
+
+    The version is (newest attendance id, rows among the newest
+    ``lag_window`` ids, count of updates/deletes). New rows only move the
+    first two, so check-ins don't all contend on one counter row; updates
+    and deletes bump ``attendance_changes``. Ids are allocated at insert but
+    become visible at commit, so on PostgreSQL a lower id can appear after
+    a higher one; the row count catches that as long as the late row is
+    within the window. A later one goes unnoticed until the next write.
+
+    The version is read at most every ATTENDANCE_VERSION_CHECK_INTERVAL
+    seconds, and again right after this process commits an attendance
+    write, so other workers' writes can take that long to show up.
+    """
+
+    def __init__(self, check_interval=1.0, lag_window=1000):
+        self.check_interval = check_interval
+        self.lag_window = lag_window
+        self._version = None
+        self._checked_at = 0.0
+
+    def configure(self, app):
+        self.check_interval = float(app.config.get('ATTENDANCE_VERSION_CHECK_INTERVAL', self.check_interval))
+        self.lag_window = int(app.config.get('ATTENDANCE_VERSION_LAG_WINDOW', self.lag_window))
+        self._version = None
+
+    def get(self):
+        version = self._version
+        if version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return version
+        checked_at = time.monotonic()
+        top = db.select(func.max(Attendance.id)).scalar_subquery()
+        row = db.session.execute(db.select(
+            top,
+            db.select(func.count()).select_from(Attendance)
+            .where(Attendance.id > func.coalesce(top, 0) - self.lag_window).scalar_subquery(),
+            db.select(CacheVersion.version).where(CacheVersion.name == ATTENDANCE_CACHE_NAME).scalar_subquery()
+        )).one()
+        version = (row[0] or 0, row[1] or 0, row[2] or 0)
+        self._version, self._checked_at = version, checked_at
+        return version
+
+    def invalidate(self):
+        """Re-read on next use (after an attendance write in this process)"""
+        self._version = None
+
+
+attendance_versions = AttendanceVersion()
+
+
+def attendance_version():
+    """Version that changes on any attendance write; see AttendanceVersion"""
+    return attendance_versions.get()
+
+
+def attendance_written(session):
+    """Re-read the attendance version once ``session`` commits.
+
+    For writes that skip mapper events (bulk INSERT/UPDATE).
+    """
+    session.info[PENDING_KEY] = True
+
+
+def bump_attendance_version(connection):
+    """Record an attendance update/delete done with a bulk statement"""
+    CacheVersion.bump(connection, ATTENDANCE_CACHE_NAME)
+    if not hasattr(connection, 'dialect'):  # the ORM session rather than a Connection
+        attendance_written(connection)
+
+
+def _attendance_inserted(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        attendance_written(session)
+
+
+def _attendance_updated(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if any(attrs[column.key].history.has_changes() for column in mapper.column_attrs):
+        bump_attendance_version(connection)
+        _attendance_inserted(mapper, connection, target)
+
+
+def _attendance_deleted(mapper, connection, target):
+    bump_attendance_version(connection)
+    _attendance_inserted(mapper, connection, target)
+
+
+def _session_committed(session):
+    if session.info.pop(PENDING_KEY, None):
+        attendance_versions.invalidate()
+
+
+def _session_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+def init_etags(app):
+    """Keep the attendance version behind attendance ETags up to date"""
+    attendance_versions.configure(app)
+    listeners = [
+        (Attendance, 'after_insert', _attendance_inserted),
+        (Attendance, 'after_update', _attendance_updated),
+        (Attendance, 'after_delete', _attendance_deleted),
+        (OrmSession, 'after_commit', _session_committed),
+        (OrmSession, 'after_rollback', _session_rolled_back),
+    ]
+    for target, event_name, listener in listeners:
+        if not event.contains(target, event_name, listener):
+            event.listen(target, event_name, listener)
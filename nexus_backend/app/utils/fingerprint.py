@@ -1,10 +1,12 @@
 import re
-from typing import Tuple
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 
 BLE_ID_RE = re.compile(r"^[0-9A-F]{8,12}$") # after cleaning -- flexible length
+SEPARATORS_RE = re.compile(r"[^0-9A-Fa-f]")
 
 def _remove_separators(s: str) -> str:
-    return re.sub(r"[^0-9A-Fa-f]", "", s)
+    return SEPARATORS_RE.sub("", s)
 
 def clean_ble_id(raw: str) -> str:
     if raw is None:
@@ -36,4 +38,46 @@ def parse_and_validate(raw_ble, raw_rssi) -> Tuple[str, int]:
     """Return (ble_id, rssi) after cleaning and validation."""
     ble = clean_ble_id(raw_ble)
     rssi = clean_rssi(raw_rssi)
-    return ble, rssi
\ No newline at end of file
+    return ble, rssi
+
+
+# Bounded memo of cleaned ids; batches and repeated check-ins keep seeing the same few devices
+BLE_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=BLE_CACHE_SIZE)
+def _clean_ble_id_cached(raw: str) -> Tuple[Optional[str], Optional[str]]:
+    """(cleaned id, None) or (None, error message); invalid ids are cached too."""
+    try:
+        return clean_ble_id(raw), None
+    except ValueError as e:
+        return None, str(e)
+
+def parse_and_validate_many(raw_bles: Sequence, raw_rssis: Sequence) -> List[Tuple[Optional[str], Optional[int], Optional[str]]]:
+    """
+    Clean a batch of (ble_id, rssi) readings in one pass.
+    Returns one (ble_id, rssi, error) tuple per reading; error is None for
+    valid readings, otherwise ble_id and rssi are None. Ids go through a
+    bounded LRU cache, so repeated ids are only cleaned once.
+    """
+    results = []
+    append = results.append
+    for raw_ble, raw_rssi in zip(raw_bles, raw_rssis):
+        if raw_ble is None:
+            append((None, None, "ble_id is required"))
+            continue
+        ble, error = _clean_ble_id_cached(raw_ble if isinstance(raw_ble, str) else str(raw_ble))
+        if error:
+            append((None, None, error))
+            continue
+
+        if type(raw_rssi) is int:
+            # Fast path for JSON integers; same clamping as clean_rssi
+            rssi = -120 if raw_rssi < -120 else (min(raw_rssi, -30) if raw_rssi > 0 else raw_rssi)
+        else:
+            try:
+                rssi = clean_rssi(raw_rssi)
+            except ValueError as e:
+                append((None, None, str(e)))
+                continue
+        append((ble, rssi, None))
+    return results
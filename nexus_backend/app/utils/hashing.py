@@ -0,0 +1,305 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from flask import jsonify
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+# Work factor used when PASSWORD_HASH_COST is not set: scrypt N and pbkdf2
+# iterations matching werkzeug's own defaults
+DEFAULT_HASH_COSTS = {
+    'scrypt': 2 ** 15,
+    'pbkdf2': 1_000_000,
+}
+
+# Candidate work factors tried by the benchmark-hash command
+BENCHMARK_COSTS = {
+    'scrypt': [2 ** 12, 2 ** 13, 2 ** 14, 2 ** 15, 2 ** 16, 2 ** 17],
+    'pbkdf2': [100_000, 200_000, 400_000, 600_000, 1_000_000, 1_500_000, 2_000_000],
+}
+
+
+def hash_method(algorithm, cost=None):
+    """Build the werkzeug method string for an algorithm and work factor"""
+    if algorithm not in DEFAULT_HASH_COSTS:
+        raise ValueError(f"Unsupported password hash algorithm: {algorithm}")
+    cost = int(cost or DEFAULT_HASH_COSTS[algorithm])
+    if algorithm == 'scrypt':
+        return f"scrypt:{cost}:8:1"
+    return f"pbkdf2:sha256:{cost}"
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the password hashing queue is saturated"""
+
+    def __init__(self, retry_after):
+        super().__init__('Password hashing queue is full')
+        self.retry_after = retry_after
+
+
+def _timed_call(fn, *args):
+    """Run fn in a worker process and report how long the hash itself took"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class HashingPool:
+    """Process pool for password hashing with bounded admission.
+
+    Password hashes are CPU bound, so running them on the request thread lets
+    a login burst pin every worker. Hashes are pushed onto a process pool
+    sized to the CPU count instead; once ``workers + queue_size`` hashes are
+    in flight new requests are rejected straight away with HashingPoolBusy
+    so the caller can answer 503 rather than queue indefinitely. Callers
+    that wait longer than HASH_POOL_TIMEOUT get HashingPoolBusy too.
+    """
+
+    def __init__(self, workers=None, queue_size=64, timeout=30, retry_after=2, window=1024):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.method = hash_method('scrypt')
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._hash_seconds = deque(maxlen=window)
+        self._wait_seconds = deque(maxlen=window)
+
+    def configure(self, app):
+        """Load pool settings from the app config"""
+        workers = app.config.get('HASH_POOL_WORKERS')
+        self.shutdown()
+        self.workers = (os.cpu_count() or 1) if workers is None else int(workers)
+        self.queue_size = int(app.config.get('HASH_POOL_QUEUE_SIZE', self.queue_size))
+        self.timeout = float(app.config.get('HASH_POOL_TIMEOUT', self.timeout))
+        self.retry_after = int(app.config.get('HASH_POOL_RETRY_AFTER', self.retry_after))
+        self.method = hash_method(
+            app.config.get('PASSWORD_HASH_ALGORITHM', 'scrypt'),
+            app.config.get('PASSWORD_HASH_COST')
+        )
+
+    @property
+    def capacity(self):
+        return max(self.workers, 1) + self.queue_size
+
+    def _get_executor(self):
+        # Created lazily so pre-forking servers get one pool per worker process
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _admit(self):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise HashingPoolBusy(self.retry_after)
+            self._in_flight += 1
+
+    def _release(self, *_):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _reset_executor(self, executor):
+        # A worker died; start a fresh pool for the next caller
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def _run(self, fn, *args):
+        self._admit()
+        submitted = time.perf_counter()
+        if self.workers <= 0:
+            try:
+                result, hash_seconds = _timed_call(fn, *args)
+            finally:
+                self._release()
+        else:
+            with self._lock:
+                executor = self._get_executor()
+            try:
+                future = executor.submit(_timed_call, fn, *args)
+            except BaseException as e:
+                self._release()
+                if isinstance(e, BrokenProcessPool):
+                    self._reset_executor(executor)
+                raise
+            # The slot stays taken until a worker is done with the hash, even
+            # if this caller stops waiting, so admission sees the real load
+            future.add_done_callback(self._release)
+            try:
+                result, hash_seconds = future.result(timeout=self.timeout)
+            except FutureTimeout:
+                future.cancel()  # only succeeds if no worker has picked it up yet
+                with self._lock:
+                    self._timed_out += 1
+                raise HashingPoolBusy(self.retry_after)
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                raise
+
+        total_seconds = time.perf_counter() - submitted
+        with self._lock:
+            self._completed += 1
+            self._hash_seconds.append(hash_seconds)
+            self._wait_seconds.append(max(total_seconds - hash_seconds, 0.0))
+        return result
+
+    def hash(self, password):
+        """Return a password hash computed on the pool with the configured policy"""
+        return self._run(generate_password_hash, password, self.method)
+
+    def needs_rehash(self, pwhash):
+        """Check if a stored hash was made with a different method or cost"""
+        return pwhash.split('$', 1)[0] != self.method
+
+    def verify(self, pwhash, password):
+        """Check a password against a hash on the pool"""
+        return self._run(check_password_hash, pwhash, password)
+
+    def metrics(self):
+        """Snapshot of queue depth, throughput and latency"""
+        with self._lock:
+            in_flight = self._in_flight
+            hash_samples = sorted(self._hash_seconds)
+            wait_samples = sorted(self._wait_seconds)
+            completed = self._completed
+            rejected = self._rejected
+            timed_out = self._timed_out
+
+        return {
+            'workers': self.workers,
+            'queue_capacity': self.capacity,
+            'in_flight': in_flight,
+            'queue_depth': max(in_flight - max(self.workers, 1), 0),
+            'completed_total': completed,
+            'rejected_total': rejected,
+            'timed_out_total': timed_out,
+            'hash_latency_ms': _latency_summary(hash_samples),
+            'queue_wait_ms': _latency_summary(wait_samples)
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _latency_summary(samples):
+    """avg/p50/p95/max in milliseconds for a sorted list of seconds"""
+    if not samples:
+        return {'avg': 0, 'p50': 0, 'p95': 0, 'max': 0}
+
+    def pct(p):
+        return samples[min(int(len(samples) * p), len(samples) - 1)] * 1000
+
+    return {
+        'avg': round(sum(samples) / len(samples) * 1000, 2),
+        'p50': round(pct(0.50), 2),
+        'p95': round(pct(0.95), 2),
+        'max': round(samples[-1] * 1000, 2)
+    }
+
+
+class BatchHasher:
+    """Fans batches of password hashes out over a process pool.
+
+    Used by bulk imports, separately from the login pool so a large upload
+    cannot exhaust login admission. Batches smaller than ``threshold`` are
+    hashed inline, and the pool is only started when the first large batch
+    arrives, so small uploads never pay the process start-up cost. Results
+    come back in input order.
+    """
+
+    def __init__(self, workers=None, threshold=64, method=None):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.threshold = threshold
+        self.method = method or hashing_pool.method
+        self._executor = None
+
+    @classmethod
+    def from_config(cls, config):
+        workers = config.get('BULK_HASH_WORKERS')
+        return cls(
+            workers=None if workers is None else int(workers),
+            threshold=int(config.get('BULK_HASH_PARALLEL_THRESHOLD', 64))
+        )
+
+    def hash_many(self, passwords):
+        """Hash passwords with the current policy, preserving order"""
+        methods = [self.method] * len(passwords)
+        if self.workers <= 1 or len(passwords) < self.threshold:
+            return list(map(generate_password_hash, passwords, methods))
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(len(passwords) // (self.workers * 4), 1)
+        return list(self._executor.map(generate_password_hash, passwords, methods, chunksize=chunksize))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+hashing_pool = HashingPool()
+
+
+def init_hashing(app):
+    """Configure the shared hashing pool for this app"""
+    hashing_pool.configure(app)
+
+
+def hash_password(password):
+    """Hash a password on the shared pool"""
+    return hashing_pool.hash(password)
+
+
+def verify_password(pwhash, password):
+    """Verify a password on the shared pool"""
+    return hashing_pool.verify(pwhash, password)
+
+
+def password_needs_rehash(pwhash):
+    """Check a stored hash against the configured hashing policy"""
+    return hashing_pool.needs_rehash(pwhash)
+
+
+def benchmark_costs(algorithm, costs=None, rounds=3):
+    """Time one hash per candidate cost on this host.
+
+    Returns a list of (cost, median_ms) tuples in candidate order.
+    """
+    results = []
+    for cost in costs or BENCHMARK_COSTS[algorithm]:
+        method = hash_method(algorithm, cost)
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            generate_password_hash('benchmark-password', method)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        results.append((cost, round(samples[len(samples) // 2], 2)))
+    return results
+
+
+def hashing_busy_response(error):
+    """503 response telling the client when to retry"""
+    response = jsonify({'error': 'Server busy, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
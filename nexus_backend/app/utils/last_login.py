@@ -0,0 +1,114 @@
+import atexit
+import threading
+from datetime import datetime, timezone
+from sqlalchemy import bindparam
+
+
+class LastLoginBuffer:
+    """Write-behind buffer for users' last_login timestamps.
+
+    Logins record their timestamp here instead of committing an UPDATE
+    inside the request. A background thread flushes the buffer every
+    LAST_LOGIN_FLUSH_INTERVAL seconds as one batched UPDATE per user table,
+    and once more when the process exits. Readers merge pending values in
+    through ``last_login()`` so responses stay consistent before a flush.
+    An interval of 0 writes through on every login.
+    """
+
+    def __init__(self, interval=5.0):
+        self.interval = interval
+        self.app = None
+        self._pending = {}  # (model, user_id) -> datetime
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+
+    def configure(self, app):
+        self.stop()
+        self.app = app
+        self.interval = float(app.config.get('LAST_LOGIN_FLUSH_INTERVAL', self.interval))
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+        if self.interval > 0:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='last-login-flush', daemon=True)
+            self._thread.start()
+
+    def record(self, user):
+        """Buffer a login for an Admin/Attendant/Attendee"""
+        with self._lock:
+            self._pending[(type(user), user.id)] = datetime.now(timezone.utc)
+        if self.interval <= 0:
+            self.flush()
+
+    def last_login(self, user):
+        """Most recent login for a user, including buffered ones"""
+        with self._lock:
+            pending = self._pending.get((type(user), user.id))
+        return pending or user.last_login
+
+    def flush(self):
+        """Write buffered timestamps, one executemany UPDATE per table"""
+        from app import db
+        from app.utils.principal_cache import principal_cache
+
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        by_model = {}
+        for (model, user_id), logged_in_at in batch.items():
+            by_model.setdefault(model, []).append({'_id': user_id, '_last_login': logged_in_at})
+
+        try:
+            for model, rows in by_model.items():
+                table = model.__table__
+                db.session.execute(
+                    table.update()
+                    .where(table.c.id == bindparam('_id'))
+                    .values(last_login=bindparam('_last_login')),
+                    rows
+                )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Put the batch back without overwriting newer logins
+            with self._lock:
+                for key, logged_in_at in batch.items():
+                    self._pending.setdefault(key, logged_in_at)
+            print(f"Last login flush failed: {e}")
+            return 0
+
+        # Cached principals carry last_login; drop the ones just written
+        for model, user_id in batch:
+            principal_cache.invalidate(f"{model.__name__.lower()}_{user_id}")
+        return len(batch)
+
+    def _flush_in_context(self):
+        with self.app.app_context():
+            self.flush()
+
+    def _run(self):
+        stop = self._stop
+        while not stop.wait(self.interval):
+            self._flush_in_context()
+
+    def stop(self):
+        """Stop the flush thread and write anything still buffered"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        if self.app is not None:
+            self._flush_in_context()
+
+
+last_login_buffer = LastLoginBuffer()
+
+
+def init_last_login_buffer(app):
+    """Start the last-login flush thread for this app"""
+    last_login_buffer.configure(app)
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from app import db
+from app.models.user_directory import UserDirectory
+
+
+class Principal:
+    """Snapshot of the authenticated user's row.
+
+    Column values are read straight off the snapshot, so read-only handlers
+    never touch the database. The snapshot can be up to PRINCIPAL_CACHE_TTL
+    seconds behind other workers, so handlers that modify the user call
+    ``instance()``, which loads the current row (locked on databases that
+    support FOR UPDATE) instead of writing back cached values.
+    """
+
+    def __init__(self, identity, role, model, values):
+        self.identity = identity
+        self.role = role
+        self.model = model
+        self.values = values
+
+    @property
+    def id(self):
+        return self.values['id']
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['values'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def instance(self, for_update=True):
+        """Load the user's current row into the session, for handlers that write to it"""
+        return db.session.get(self.model, self.id, with_for_update=for_update or None)
+
+    def to_dict(self):
+        # Serialise a detached copy, so reads stay off the database
+        return self.model(**self.values).to_dict()
+
+
+def parse_identity(identity):
+    """Split a JWT identity ("attendee_6") into (role, user_id)"""
+    if not isinstance(identity, str) or '_' not in identity:
+        return None, None
+    prefix, _, user_id = identity.partition('_')
+    return prefix.capitalize(), int(user_id)
+
+
+class PrincipalCache:
+    """Per-process LRU of principals keyed by JWT identity, with a TTL.
+
+    Entries are dropped whenever the underlying user row is updated or
+    deleted in this process; the TTL bounds how long another worker's
+    changes can go unnoticed.
+    """
+
+    def __init__(self, ttl=60, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, app):
+        self.ttl = float(app.config.get('PRINCIPAL_CACHE_TTL', self.ttl))
+        self.max_size = int(app.config.get('PRINCIPAL_CACHE_SIZE', self.max_size))
+        self.clear()
+
+    def get(self, identity):
+        """Return the principal for a JWT identity, loading it on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(identity)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(identity)
+                return entry[1]
+
+        principal = self._load(identity)
+        if principal is None or self.ttl <= 0:
+            return principal
+
+        with self._lock:
+            self._entries[identity] = (now + self.ttl, principal)
+            self._entries.move_to_end(identity)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return principal
+
+    def _load(self, identity):
+        role, user_id = parse_identity(identity)
+        model = UserDirectory.models.get(role)
+        if model is None:
+            return None
+
+        user = db.session.get(model, user_id)
+        if user is None:
+            return None
+
+        values = {attr.key: getattr(user, attr.key) for attr in db.inspect(model).column_attrs}
+        return Principal(identity, role, model, values)
+
+    def invalidate(self, identity):
+        with self._lock:
+            self._entries.pop(identity, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def _invalidate_principal(mapper, connection, target):
+    for role, model in UserDirectory.models.items():
+        if isinstance(target, model):
+            principal_cache.invalidate(f"{role.lower()}_{target.id}")
+
+
+def init_principal_cache(app):
+    """Configure the principal cache and drop entries when users change"""
+    principal_cache.configure(app)
+    for model in UserDirectory.models.values():
+        for event_name in ('after_update', 'after_delete'):
+            if not event.contains(model, event_name, _invalidate_principal):
+                event.listen(model, event_name, _invalidate_principal)
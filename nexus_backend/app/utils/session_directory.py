@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as OrmSession, object_session
+from app import db
+from app.models.cache_version import CacheVersion
+from app.models.session_model import Session
+
+CACHE_NAME = 'session_directory'
+PENDING_KEY = 'session_directory_changed'
+
+
+class SessionDirectory:
+    """In-process index of active sessions by course code.
+
+    Session discovery is polled by every student's app, so instead of loading
+    and filtering every active session per request, the active sessions are
+    loaded once per ``session_directory`` cache version and kept as
+    pre-serialised JSON fragments grouped by course. Rendered payloads are
+    memoised per version (and per unit list), so a poll costs a dict lookup.
+    Session creates, updates and deletes bump the version; this process
+    reloads on its next read after committing one, other workers within
+    SESSION_DIRECTORY_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self, check_interval=2.0, max_payloads=1024):
+        self.check_interval = check_interval
+        self.max_payloads = max_payloads
+        # (version, [(session id, course code, JSON object without its closing brace)],
+        #  course code -> [(session id, fragment)]), swapped as a whole on reload
+        self._index = (None, [], {})
+        self._payloads = {}
+        self._version = None  # None until loaded
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, app):
+        self.check_interval = float(app.config.get('SESSION_DIRECTORY_CHECK_INTERVAL', self.check_interval))
+        self._version = None
+
+    @property
+    def version(self):
+        """Version the current index was loaded at"""
+        self._refresh()
+        return self._version
+
+    def reload(self):
+        """Load every active session and the version it corresponds to"""
+        version = CacheVersion.current(CACHE_NAME)
+        sessions = db.session.execute(
+            db.select(Session).where(Session.is_active == True).order_by(Session.id)
+        ).scalars().all()
+        entries = []
+        by_course = {}
+        for session in sessions:
+            # Drop the closing brace so per-attendee fields can be appended
+            fragment = json.dumps(session.to_dict())[:-1]
+            entries.append((session.id, session.course_code, fragment))
+            by_course.setdefault(session.course_code, []).append((session.id, fragment))
+        with self._lock:
+            self._index = (version, entries, by_course)
+            self._payloads = {}
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return
+            # Claim this check so concurrent callers keep using the current index
+            self._checked_at = now
+            loaded = self._version
+        if loaded is None or CacheVersion.current(CACHE_NAME) != loaded:
+            self.reload()
+
+    def invalidate(self):
+        """Reload on next use (after a session write in this process)"""
+        with self._lock:
+            self._version = None
+
+    def _payload(self, key, render):
+        # Keys carry the version, so a render racing a reload can't be served later
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = render()
+            with self._lock:
+                if len(self._payloads) >= self.max_payloads:
+                    self._payloads = {}
+                self._payloads[key] = payload
+        return payload
+
+    def sessions_for_units(self, units):
+        """JSON array of the active sessions for these course codes"""
+        self._refresh()
+        version, _, by_course = self._index
+        units = tuple(sorted({unit for unit in units if unit in by_course}))
+
+        def render():
+            matches = sorted(entry for unit in units for entry in by_course[unit])
+            return '[' + ','.join(fragment + '}' for _, fragment in matches) + ']'
+
+        return self._payload((version, 'units', units), render)
+
+    def scan(self, units):
+        """JSON array of every active session, flagged with isEnrolled for these course codes"""
+        self._refresh()
+        version, sessions, by_course = self._index
+        enrolled = frozenset(unit for unit in units if unit in by_course)
+
+        def render():
+            return '[' + ','.join(
+                f'{fragment}, "isEnrolled": {"true" if course in enrolled else "false"}}}'
+                for _, course, fragment in sessions
+            ) + ']'
+
+        return self._payload((version, 'scan', tuple(sorted(enrolled))), render)
+
+    def __len__(self):
+        self._refresh()
+        return len(self._index[1])
+
+
+session_directory = SessionDirectory()
+
+
+def _session_changed(mapper, connection, target):
+    CacheVersion.bump(connection, CACHE_NAME)
+    session = object_session(target)
+    if session is not None:
+        session.info[PENDING_KEY] = True
+
+
+def _session_updated(mapper, connection, target):
+    # after_update also fires for objects that were dirtied without net changes
+    attrs = inspect(target).attrs
+    if any(attrs[column.key].history.has_changes() for column in mapper.column_attrs):
+        _session_changed(mapper, connection, target)
+
+
+def _session_committed(session):
+    if session.info.pop(PENDING_KEY, None):
+        session_directory.invalidate()
+
+
+def _session_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+def init_session_directory(app):
+    """Serve session discovery from the active-session index and keep it versioned"""
+    listeners = [
+        (Session, 'after_insert', _session_changed),
+        (Session, 'after_update', _session_updated),
+        (Session, 'after_delete', _session_changed),
+        (OrmSession, 'after_commit', _session_committed),
+        (OrmSession, 'after_rollback', _session_rolled_back),
+    ]
+    for target, event_name, listener in listeners:
+        if not event.contains(target, event_name, listener):
+            event.listen(target, event_name, listener)
+    session_directory.configure(app)
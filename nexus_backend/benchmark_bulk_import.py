@@ -0,0 +1,63 @@
+"""
+Benchmark CSV import throughput against the number of hashing workers.
+
+Usage: python benchmark_bulk_import.py [rows] [max_workers]
+
+Runs against a throwaway SQLite database so it never touches real data.
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+db_file = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{db_file}'
+os.environ.setdefault('LAST_LOGIN_FLUSH_INTERVAL', '0')
+
+from app import create_app, db
+from app.models.user_directory import UserDirectory
+from app.models.attendee_model import Attendee
+from app.services.bulk_import import CsvImporter
+from app.utils.hashing import BatchHasher
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+MAX_WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+
+def synthetic_csv(rows, run):
+    lines = ['name,email,units']
+    lines.extend(f'Student {i},student{run}_{i}@bench.test,"MATH101, PHY202"' for i in range(rows))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+app = create_app()
+
+with app.app_context():
+    db.create_all()
+
+    print("\n" + "=" * 60)
+    print(f"📦 CSV IMPORT BENCHMARK: {ROWS} rows, up to {MAX_WORKERS} workers")
+    print(f"   Hash policy: {BatchHasher().method}")
+    print("=" * 60 + "\n")
+
+    worker_counts = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w <= MAX_WORKERS], MAX_WORKERS})
+    baseline = None
+    for run, workers in enumerate(worker_counts):
+        data = synthetic_csv(ROWS, run)
+        started = time.perf_counter()
+        with BatchHasher(workers=workers, threshold=app.config['BULK_HASH_PARALLEL_THRESHOLD']) as hasher:
+            importer = CsvImporter(
+                default_role='Attendee',
+                chunk_size=app.config['BULK_IMPORT_CHUNK_SIZE'],
+                hasher=hasher
+            ).run(io.BytesIO(data))
+        elapsed = time.perf_counter() - started
+
+        rate = len(importer.created) / elapsed
+        baseline = baseline or rate
+        print(f"  workers={workers:<3} created={len(importer.created):<7} "
+              f"{elapsed:8.2f}s {rate:9.1f} rows/s  x{rate / baseline:.2f}")
+
+    print(f"\n✅ {Attendee.query.count()} attendees, {UserDirectory.query.count()} directory rows")
+    print("=" * 60)
@@ -0,0 +1,105 @@
+"""
+Benchmark check-in latency and throughput: per-request commits vs group commit.
+
+Usage: python benchmark_checkins.py [students] [concurrency] [window_ms]
+
+Simulates a lecture hall checking in at once against a throwaway SQLite
+database, once with every request committing its own row and once through
+the group-commit pipeline (CHECKIN_GROUP_COMMIT).
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+db_file = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{db_file}'
+os.environ.setdefault('LAST_LOGIN_FLUSH_INTERVAL', '0')
+
+from app import create_app, db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.attendance import Attendance
+from app.models.session_model import Session
+from app.services.checkin_pipeline import checkin_pipeline
+
+STUDENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+WINDOW_MS = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+app = create_app()
+
+
+def setup():
+    """One attendant, a hall of students and one session per benchmark mode"""
+    attendant = Attendant(name='Bench Attendant', email='attendant@bench.test', password_hash='x')
+    db.session.add(attendant)
+    db.session.flush()
+    db.session.execute(db.insert(Attendee), [
+        {'name': f'Student {i}', 'email': f'student{i}@bench.test', 'password_hash': 'x'}
+        for i in range(STUDENTS)
+    ])
+    sessions = [Session(title=f'Lecture {mode}', attendant_name=attendant.name, schedule='',
+                        course_code='BENCH101', attendant_id=attendant.id, is_active=True)
+                for mode in ('per-request', 'group-commit')]
+    db.session.add_all(sessions)
+    db.session.commit()
+    attendee_ids = db.session.execute(db.select(Attendee.id)).scalars().all()
+    return attendee_ids, [session.id for session in sessions]
+
+
+def run(label, attendee_ids, session_id):
+    latencies = []
+    lock = threading.Lock()
+
+    def check_in(attendee_id):
+        with app.app_context():
+            started = time.perf_counter()
+            checkin_pipeline.check_in(attendee_id, session_id)
+            elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        list(pool.map(check_in, attendee_ids))
+    total = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    rate = len(latencies) / total
+    print(f"  {label:<13} {total:7.2f}s {rate:9.1f} check-ins/s   "
+          f"p50 {statistics.median(latencies):7.1f}ms  p95 {p95:7.1f}ms  p99 {p99:7.1f}ms")
+    return rate, statistics.median(latencies), p95
+
+
+with app.app_context():
+    db.create_all()
+    attendee_ids, (direct_session, group_session) = setup()
+
+print("\n" + "=" * 78)
+print(f"🎓 CHECK-IN BENCHMARK: {STUDENTS} students, {CONCURRENCY} concurrent, {WINDOW_MS}ms window")
+print("=" * 78 + "\n")
+
+app.config['CHECKIN_GROUP_COMMIT'] = False
+checkin_pipeline.configure(app)
+direct = run('per-request', attendee_ids, direct_session)
+
+app.config['CHECKIN_GROUP_COMMIT'] = True
+app.config['CHECKIN_COMMIT_WINDOW_MS'] = WINDOW_MS
+checkin_pipeline.configure(app)
+grouped = run('group-commit', attendee_ids, group_session)
+checkin_pipeline.stop()
+
+with app.app_context():
+    counts = [Attendance.query.filter_by(session_id=session_id).count()
+              for session_id in (direct_session, group_session)]
+
+print(f"\n  Throughput x{grouped[0] / direct[0]:.2f}, "
+      f"p50 {direct[1]:.1f} -> {grouped[1]:.1f}ms, p95 {direct[2]:.1f} -> {grouped[2]:.1f}ms")
+print(f"✅ Rows written: per-request={counts[0]}, group-commit={counts[1]}")
+print("=" * 78)
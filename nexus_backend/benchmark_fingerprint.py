@@ -0,0 +1,72 @@
+"""
+Micro-benchmark BLE id / RSSI normalisation: per-call vs batched.
+
+Usage: python benchmark_fingerprint.py [readings] [distinct_devices] [repeat]
+
+Compares calling parse_and_validate once per reading with one
+parse_and_validate_many call over the whole batch, both with a cold id
+cache and with a warm one (the steady state for a beacon that keeps
+seeing the same devices).
+"""
+import random
+import sys
+import time
+
+from app.utils import fingerprint
+from app.utils.fingerprint import parse_and_validate, parse_and_validate_many
+
+READINGS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+DEVICES = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+REPEAT = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+
+def make_readings():
+    """Colon-separated, lower-case MAC-style ids with a few bad readings mixed in"""
+    rng = random.Random(42)
+    devices = [':'.join(f'{rng.randrange(256):02x}' for _ in range(6)) for _ in range(DEVICES)]
+    devices[:3] = ['not-an-id', '', 'zz:zz']
+    raw_bles = [rng.choice(devices) for _ in range(READINGS)]
+    raw_rssis = [rng.randint(-100, -40) for _ in range(READINGS)]
+    return raw_bles, raw_rssis
+
+
+def per_call(raw_bles, raw_rssis):
+    results = []
+    for raw_ble, raw_rssi in zip(raw_bles, raw_rssis):
+        try:
+            ble, rssi = parse_and_validate(raw_ble, raw_rssi)
+            results.append((ble, rssi, None))
+        except ValueError as e:
+            results.append((None, None, str(e)))
+    return results
+
+
+def best_of(fn, *args, cold=False):
+    timings = []
+    for _ in range(REPEAT):
+        if cold:
+            fingerprint._clean_ble_id_cached.cache_clear()
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+raw_bles, raw_rssis = make_readings()
+assert per_call(raw_bles, raw_rssis) == parse_and_validate_many(raw_bles, raw_rssis)
+
+print("\n" + "=" * 70)
+print(f"🔬 FINGERPRINT BENCHMARK: {READINGS} readings, {DEVICES} distinct ids, best of {REPEAT}")
+print("=" * 70 + "\n")
+
+baseline = best_of(per_call, raw_bles, raw_rssis)
+cold = best_of(parse_and_validate_many, raw_bles, raw_rssis, cold=True)
+warm = best_of(parse_and_validate_many, raw_bles, raw_rssis)
+
+for label, seconds in (('per-call', baseline), ('batched, cold', cold), ('batched, warm', warm)):
+    print(f"  {label:<14} {seconds * 1000:8.2f}ms  {READINGS / seconds / 1e6:6.2f}M readings/s  "
+          f"x{baseline / seconds:.2f}")
+
+info = fingerprint._clean_ble_id_cached.cache_info()
+print(f"\n✅ id cache: {info.currsize}/{info.maxsize} entries, {info.hits} hits, {info.misses} misses")
+print("=" * 70)
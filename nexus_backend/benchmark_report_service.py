@@ -0,0 +1,100 @@
+"""
+Benchmark the /api/v1/reports/* endpoints over the columnar attendance snapshot.
+
+Usage: python benchmark_report_service.py [students] [sessions]
+
+Every student gets one attendance row per session, so the defaults
+(10,000 students x 100 sessions in 20 courses) give 1M attendance rows.
+Runs against a throwaway SQLite database. The first request pays for
+loading the snapshot; the rest are served from it until attendance or
+sessions change and REPORT_SNAPSHOT_MAX_AGE has passed. Per-class and institution-wide reports are timed side by
+side to show they scale with the rows they cover.
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+db_file = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{db_file}'
+os.environ.setdefault('LAST_LOGIN_FLUSH_INTERVAL', '0')
+
+from app import create_app, db
+from app.models.admin_model import Admin
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.attendance import Attendance
+from app.models.session_model import Session
+from app.utils.auth import generate_token
+
+STUDENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+SESSIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+START = datetime(2026, 9, 1, 9, tzinfo=timezone.utc)
+
+app = create_app()
+client = app.test_client()
+
+
+def setup():
+    """One attendant, the sessions (one a day), the students and a full attendance grid"""
+    attendant = Attendant(name='Bench Attendant', email='attendant@bench.test', password_hash='x')
+    db.session.add(attendant)
+    db.session.flush()
+    db.session.execute(db.insert(Session), [
+        {'title': f'Lecture {i}', 'attendant_name': attendant.name, 'schedule': '', 'course_code': f'C{i % 20}',
+         'attendant_id': attendant.id, 'is_active': False, 'created_at': START + timedelta(days=i)}
+        for i in range(SESSIONS)
+    ])
+    db.session.execute(db.insert(Attendee), [
+        {'name': f'Student {i}', 'email': f'student{i}@bench.test', 'password_hash': 'x'}
+        for i in range(STUDENTS)
+    ])
+    sessions = db.session.execute(db.select(Session.id, Session.created_at)).all()
+    attendee_ids = db.session.execute(db.select(Attendee.id)).scalars().all()
+    statuses = ('Present', 'Present', 'Present', 'Late', 'Absent')
+    for session_id, created_at in sessions:
+        db.session.execute(db.insert(Attendance), [
+            {'attendee_id': attendee_id, 'session_id': session_id,
+             'status': statuses[(attendee_id + session_id) % len(statuses)], 'timestamp': created_at}
+            for attendee_id in attendee_ids
+        ])
+    admin = Admin(name='Bench Admin', email='admin@bench.test', password_hash='x')
+    db.session.add(admin)
+    db.session.commit()
+    return sessions[0][0], attendee_ids[0], {'Authorization': f'Bearer {generate_token(f"admin_{admin.id}")}'}
+
+
+def measure(label, url):
+    started = time.perf_counter()
+    response = client.get(url, headers=auth_headers)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.get_json()
+    print(f"  {label:<34} {elapsed * 1000:10.1f} ms")
+    return response.get_json()
+
+
+with app.app_context():
+    db.create_all()
+    started = time.perf_counter()
+    class_id, student_id, auth_headers = setup()
+    seeded = time.perf_counter() - started
+
+print("\n" + "=" * 78)
+print(f"📊 REPORT SERVICE BENCHMARK: {STUDENTS} students x {SESSIONS} sessions = "
+      f"{STUDENTS * SESSIONS} attendance rows (seeded in {seeded:.1f}s)")
+print("=" * 78 + "\n")
+
+measure('overview (loads snapshot)', '/api/v1/reports/overview')
+print(f"  peak RSS after load {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB\n")
+overview = measure('overview, whole institution', '/api/v1/reports/overview')
+measure('overview, one month', '/api/v1/reports/overview?start=2026-09-01&end=2026-09-30')
+measure('class summary', f'/api/v1/reports/class/{class_id}/summary')
+measure('class absentees, one day', f'/api/v1/reports/class/{class_id}/absentees?date=2026-09-01')
+measure('student percentage in class', f'/api/v1/reports/student/{student_id}/class/{class_id}/percentage')
+measure('student history', f'/api/v1/reports/student/{student_id}/history')
+
+print(f"\n✅ {overview['overview']['total_records']} records, "
+      f"overall attendance {overview['overview']['overall_attendance']}%")
+print("=" * 78)
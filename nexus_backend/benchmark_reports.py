@@ -0,0 +1,159 @@
+"""
+Benchmark GET /api/admin/reports/full: per-row ORM loops vs grouped aggregates.
+
+Usage: python benchmark_reports.py [students] [sessions] [--skip-legacy]
+
+Every student gets one attendance row per session, so the defaults
+(10,000 students x 100 sessions) give 1M attendance rows. Runs against a
+throwaway SQLite database. The legacy report (the previous implementation,
+kept here for comparison) hydrates every row and queries once per session
+and once per student, so at full scale it takes a long time; pass
+--skip-legacy to time only the current endpoint.
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+db_file = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{db_file}'
+os.environ.setdefault('LAST_LOGIN_FLUSH_INTERVAL', '0')
+
+from flask import jsonify
+from sqlalchemy import event
+from app import create_app, db
+from app.models.admin_model import Admin
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.attendance import Attendance
+from app.models.session_model import Session
+from app.utils.auth import generate_token
+
+args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+STUDENTS = int(args[0]) if len(args) > 0 else 10000
+SESSIONS = int(args[1]) if len(args) > 1 else 100
+SKIP_LEGACY = '--skip-legacy' in sys.argv
+
+app = create_app()
+client = app.test_client()
+
+
+def setup():
+    """One attendant, the sessions, the students and a full attendance grid"""
+    admin = Admin(name='Bench Admin', email='admin@bench.test', password_hash='x')
+    attendant = Attendant(name='Bench Attendant', email='attendant@bench.test', password_hash='x')
+    db.session.add_all([admin, attendant])
+    db.session.flush()
+    db.session.execute(db.insert(Session), [
+        {'title': f'Lecture {i}', 'attendant_name': attendant.name, 'schedule': '', 'course_code': f'C{i % 20}',
+         'attendant_id': attendant.id, 'is_active': i % 10 == 0}
+        for i in range(SESSIONS)
+    ])
+    db.session.execute(db.insert(Attendee), [
+        {'name': f'Student {i}', 'email': f'student{i}@bench.test', 'password_hash': 'x', 'units': 'C1,C2'}
+        for i in range(STUDENTS)
+    ])
+    session_ids = db.session.execute(db.select(Session.id)).scalars().all()
+    attendee_ids = db.session.execute(db.select(Attendee.id)).scalars().all()
+    now = datetime.now(timezone.utc)
+    statuses = ('Present', 'Present', 'Present', 'Late', 'Absent')
+    for session_id in session_ids:
+        db.session.execute(db.insert(Attendance), [
+            {'attendee_id': attendee_id, 'session_id': session_id,
+             'status': statuses[(attendee_id + session_id) % len(statuses)], 'timestamp': now}
+            for attendee_id in attendee_ids
+        ])
+    db.session.commit()
+    return admin.id
+
+
+def legacy_report():
+    """The report as it was computed before the aggregate rewrite"""
+    all_sessions = Session.query.all()
+    total_sessions = len(all_sessions)
+    active_sessions_count = Session.query.filter_by(is_active=True).count()
+    all_attendance = Attendance.query.all()
+    total_attendance_records = len(all_attendance)
+    present_count = Attendance.query.filter_by(status='Present').count()
+    all_attendees = Attendee.query.all()
+    avg_attendance = (present_count / total_attendance_records * 100) if total_attendance_records > 0 else 0
+
+    sessions_report = []
+    for session in all_sessions:
+        session_attendance = Attendance.query.filter_by(session_id=session.id).all()
+        present_in_session = len([a for a in session_attendance if a.status == 'Present'])
+        sessions_report.append({
+            'id': session.id, 'title': session.title, 'totalAttendees': len(session_attendance),
+            'presentCount': present_in_session,
+            'attendanceRate': (present_in_session / len(session_attendance) * 100) if session_attendance else 0
+        })
+
+    students_report = []
+    for attendee in all_attendees:
+        attendee_records = Attendance.query.filter_by(attendee_id=attendee.id).all()
+        present_records = len([r for r in attendee_records if r.status == 'Present'])
+        students_report.append({
+            'id': attendee.id, 'name': attendee.name, 'totalSessions': len(attendee_records),
+            'presentCount': present_records,
+            'attendanceRate': (present_records / len(attendee_records) * 100) if attendee_records else 0
+        })
+    students_report.sort(key=lambda x: x['attendanceRate'])
+    return jsonify({
+        'summary': {'totalSessions': total_sessions, 'activeSessions': active_sessions_count,
+                    'totalAttendanceRecords': total_attendance_records, 'averageAttendance': round(avg_attendance, 2)},
+        'sessions': sessions_report,
+        'students': students_report
+    })
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(label, fn):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            started = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - started
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+            db.session.remove()
+    print(f"  {label:<10} {elapsed:9.2f}s  {len(statements):7d} queries  peak RSS {peak_rss_mb():8.1f} MB")
+    return result, elapsed, len(statements)
+
+
+with app.app_context():
+    db.create_all()
+    started = time.perf_counter()
+    admin_id = setup()
+    seeded = time.perf_counter() - started
+    token = generate_token(f'admin_{admin_id}')
+
+print("\n" + "=" * 78)
+print(f"📊 FULL REPORT BENCHMARK: {STUDENTS} students x {SESSIONS} sessions = "
+      f"{STUDENTS * SESSIONS} attendance rows (seeded in {seeded:.1f}s)")
+print("=" * 78 + "\n")
+
+# Measured first so its peak RSS isn't inflated by the legacy run
+response, new_time, new_queries = measure(
+    'aggregate', lambda: client.get('/api/admin/reports/full', headers={'Authorization': f'Bearer {token}'})
+)
+assert response.status_code == 200, response.get_json()
+summary = response.get_json()['summary']
+
+if not SKIP_LEGACY:
+    legacy, legacy_time, legacy_queries = measure('legacy', legacy_report)
+    assert legacy.get_json()['summary']['totalAttendanceRecords'] == summary['totalAttendanceRecords']
+    print(f"\n  Latency x{legacy_time / new_time:.1f} faster, queries {legacy_queries} -> {new_queries}")
+
+print(f"✅ {summary['totalAttendanceRecords']} records, average attendance {summary['averageAttendance']}%")
+print("=" * 78)
@@ -0,0 +1,48 @@
+"""normalise attendee units into an enrollments table
+
+Revision ID: 2e6b8f0c4a91
+Revises: d7c3f2a19b48
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e6b8f0c4a91'
+down_revision = 'd7c3f2a19b48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    enrollments = op.create_table(
+        'enrollments',
+        sa.Column('attendee_id', sa.Integer(), nullable=False),
+        sa.Column('course_code', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['attendee_id'], ['attendees.id']),
+        sa.PrimaryKeyConstraint('attendee_id', 'course_code')
+    )
+    op.create_index('ix_enrollments_course_attendee', 'enrollments', ['course_code', 'attendee_id'], unique=False)
+    op.create_index(op.f('ix_sessions_course_code'), 'sessions', ['course_code'], unique=False)
+
+    # Backfill from the comma-separated units strings
+    connection = op.get_bind()
+    rows = []
+    for attendee_id, units in connection.execute(
+        sa.text("SELECT id, units FROM attendees WHERE units IS NOT NULL AND units != ''")
+    ).all():
+        courses = {unit.strip() for unit in units.split(',')} - {''}
+        rows.extend({'attendee_id': attendee_id, 'course_code': course} for course in sorted(courses))
+        if len(rows) >= 5000:
+            op.bulk_insert(enrollments, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(enrollments, rows)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_sessions_course_code'), table_name='sessions')
+    op.drop_index('ix_enrollments_course_attendee', table_name='enrollments')
+    op.drop_table('enrollments')
@@ -0,0 +1,55 @@
+"""add user directory
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Backfill order matters: if the same email was registered under several
+# roles, the first table wins, matching the old Admin -> Attendant -> Attendee
+# login probe order.
+SOURCE_TABLES = [
+    ('admins', 'Admin'),
+    ('attendants', 'Attendant'),
+    ('attendees', 'Attendee'),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing_tables = inspector.get_table_names()
+
+    if 'user_directory' not in existing_tables:
+        op.create_table(
+            'user_directory',
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('role', sa.String(length=20), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('email'),
+            sa.UniqueConstraint('role', 'user_id', name='uq_user_directory_role_user')
+        )
+
+    for table, role in SOURCE_TABLES:
+        if table not in existing_tables:
+            continue
+        op.execute(
+            f"INSERT INTO user_directory (email, role, user_id) "
+            f"SELECT LOWER(TRIM(email)), '{role}', MIN(id) FROM {table} "
+            f"WHERE LOWER(TRIM(email)) NOT IN (SELECT email FROM user_directory) "
+            f"GROUP BY LOWER(TRIM(email))"
+        )
+
+
+def downgrade():
+    op.drop_table('user_directory')
@@ -0,0 +1,28 @@
+"""per-session RSSI thresholds
+
+Revision ID: 4c7f1e9a2b65
+Revises: 9d2e7b41c8f3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c7f1e9a2b65'
+down_revision = '9d2e7b41c8f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.add_column(sa.Column('rssi_enter_threshold', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('rssi_exit_threshold', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.drop_column('rssi_exit_threshold')
+        batch_op.drop_column('rssi_enter_threshold')
@@ -0,0 +1,42 @@
+"""index attendance in active sessions
+
+Revision ID: 5b9a0d3e7c24
+Revises: e81b4f2c6d07
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9a0d3e7c24'
+down_revision = 'e81b4f2c6d07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'active_attendance',
+        sa.Column('attendee_id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['attendee_id'], ['attendees.id']),
+        sa.ForeignKeyConstraint(['session_id'], ['sessions.id']),
+        sa.PrimaryKeyConstraint('attendee_id', 'session_id')
+    )
+    op.create_index(op.f('ix_active_attendance_session_id'), 'active_attendance', ['session_id'], unique=False)
+
+    # Backfill from attendance in sessions that are running right now
+    op.execute(sa.text("""
+        INSERT INTO active_attendance (attendee_id, session_id)
+        SELECT attendance.attendee_id, attendance.session_id
+        FROM attendance
+        JOIN sessions ON sessions.id = attendance.session_id
+        WHERE sessions.is_active = :active
+    """).bindparams(active=True))
+
+
+def downgrade():
+    op.drop_index(op.f('ix_active_attendance_session_id'), table_name='active_attendance')
+    op.drop_table('active_attendance')
@@ -0,0 +1,24 @@
+"""seed the session_directory cache version
+
+Revision ID: 6f2a9c4d8e13
+Revises: b3e8d1f05a72
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2a9c4d8e13'
+down_revision = 'b3e8d1f05a72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.text("INSERT INTO cache_versions (name, version) VALUES ('session_directory', 1)"))
+
+
+def downgrade():
+    op.execute(sa.text("DELETE FROM cache_versions WHERE name = 'session_directory'"))
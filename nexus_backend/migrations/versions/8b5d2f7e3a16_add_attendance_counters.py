@@ -0,0 +1,50 @@
+"""materialised attendance counters per session and per attendee
+
+Revision ID: 8b5d2f7e3a16
+Revises: 2e6b8f0c4a91
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b5d2f7e3a16'
+down_revision = '2e6b8f0c4a91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'session_attendance_counts',
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('present', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['sessions.id']),
+        sa.PrimaryKeyConstraint('session_id')
+    )
+    op.create_table(
+        'attendee_attendance_counts',
+        sa.Column('attendee_id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('present', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['attendee_id'], ['attendees.id']),
+        sa.PrimaryKeyConstraint('attendee_id')
+    )
+    op.create_index('ix_attendance_session_id', 'attendance', ['session_id'], unique=False)
+
+    # Backfill from existing attendance (flask rebuild-attendance-counters does the same)
+    for table, key in (('session_attendance_counts', 'session_id'), ('attendee_attendance_counts', 'attendee_id')):
+        op.execute(
+            f"INSERT INTO {table} ({key}, total, present) "
+            f"SELECT {key}, COUNT(*), SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) "
+            f"FROM attendance GROUP BY {key}"
+        )
+
+
+def downgrade():
+    op.drop_index('ix_attendance_session_id', table_name='attendance')
+    op.drop_table('attendee_attendance_counts')
+    op.drop_table('session_attendance_counts')
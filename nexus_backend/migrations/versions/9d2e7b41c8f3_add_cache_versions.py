@@ -0,0 +1,30 @@
+"""add cache version counters
+
+Revision ID: 9d2e7b41c8f3
+Revises: 5b9a0d3e7c24
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2e7b41c8f3'
+down_revision = '5b9a0d3e7c24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cache_versions = op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(cache_versions, [{'name': 'ble_devices', 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('cache_versions')
@@ -0,0 +1,26 @@
+"""stop storing temporary passwords on import results
+
+Revision ID: a4f8c2e6d913
+Revises: 8b5d2f7e3a16
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f8c2e6d913'
+down_revision = '8b5d2f7e3a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('import_job_results') as batch_op:
+        batch_op.drop_column('password')
+
+
+def downgrade():
+    with op.batch_alter_table('import_job_results') as batch_op:
+        batch_op.add_column(sa.Column('password', sa.String(length=64), nullable=True))
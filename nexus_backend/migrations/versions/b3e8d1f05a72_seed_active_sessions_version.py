@@ -0,0 +1,24 @@
+"""seed the active_sessions cache version
+
+Revision ID: b3e8d1f05a72
+Revises: 4c7f1e9a2b65
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8d1f05a72'
+down_revision = '4c7f1e9a2b65'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.text("INSERT INTO cache_versions (name, version) VALUES ('active_sessions', 1)"))
+
+
+def downgrade():
+    op.execute(sa.text("DELETE FROM cache_versions WHERE name = 'active_sessions'"))
@@ -0,0 +1,62 @@
+"""add background import jobs
+
+Revision ID: c52d8e6f1a39
+Revises: 7a4e91c03d52
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52d8e6f1a39'
+down_revision = '7a4e91c03d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'import_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('rows_processed', sa.Integer(), nullable=False),
+        sa.Column('created_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('claimed_by', sa.String(length=32), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['admins.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'import_job_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=True),
+        sa.Column('email', sa.String(length=120), nullable=True),
+        sa.Column('role', sa.String(length=20), nullable=True),
+        sa.Column('serial', sa.String(length=20), nullable=True),
+        sa.Column('units', sa.Text(), nullable=True),
+        sa.Column('password', sa.String(length=64), nullable=True),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['import_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_import_job_results_job_status', 'import_job_results',
+                    ['job_id', 'status', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_import_job_results_job_status', table_name='import_job_results')
+    op.drop_table('import_job_results')
+    op.drop_table('import_jobs')
@@ -0,0 +1,24 @@
+"""seed the attendance_changes cache version
+
+Revision ID: d7c3f2a19b48
+Revises: 6f2a9c4d8e13
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7c3f2a19b48'
+down_revision = '6f2a9c4d8e13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.text("INSERT INTO cache_versions (name, version) VALUES ('attendance_changes', 1)"))
+
+
+def downgrade():
+    op.execute(sa.text("DELETE FROM cache_versions WHERE name = 'attendance_changes'"))
@@ -0,0 +1,37 @@
+"""one attendance record per attendee per session
+
+Revision ID: e81b4f2c6d07
+Revises: c52d8e6f1a39
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81b4f2c6d07'
+down_revision = 'c52d8e6f1a39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the newest record of any duplicates so the constraint can be added.
+    # The derived table keeps MySQL happy about deleting from a table it selects.
+    op.execute(sa.text("""
+        DELETE FROM attendance
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MAX(id) AS keep_id FROM attendance GROUP BY attendee_id, session_id
+            ) AS keep
+        )
+    """))
+
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.create_unique_constraint('uq_attendance_attendee_session', ['attendee_id', 'session_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.drop_constraint('uq_attendance_attendee_session', type_='unique')
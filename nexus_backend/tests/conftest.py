@@ -0,0 +1,88 @@
+"""
+Shared fixtures: a fresh app and SQLite database per test.
+
+Background workers that would poll the database (mail, imports) are
+disabled and hashing and last_login writes run inline, so tests see every
+write as soon as the request returns.
+"""
+import pytest
+from app import create_app, db
+from app.config import Config
+from app.models.admin_model import Admin
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.session_model import Session
+from app.utils.auth import generate_token
+
+TEST_CONFIG = {
+    'TESTING': True,
+    'DEBUG': False,
+    'HASH_POOL_WORKERS': 0,
+    'PASSWORD_HASH_ALGORITHM': 'pbkdf2',
+    'PASSWORD_HASH_COST': 1000,
+    'LAST_LOGIN_FLUSH_INTERVAL': 0,
+    'MAIL_DISPATCHER_ENABLED': False,
+    'IMPORT_JOBS_ENABLED': False,
+    'CHECKIN_GROUP_COMMIT': False,
+    'BLE_REGISTRY_CHECK_INTERVAL': 0,
+    'SESSION_DIRECTORY_CHECK_INTERVAL': 0,
+    'ATTENDANCE_VERSION_CHECK_INTERVAL': 0,
+    'REPORT_SNAPSHOT_MAX_AGE': 0,
+}
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Config, 'IMPORT_UPLOAD_DIR', str(tmp_path / 'imports'))
+    for key, value in TEST_CONFIG.items():
+        monkeypatch.setattr(Config, key, value, raising=False)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """Create an Admin, Attendant or Attendee with a password"""
+    counter = iter(range(1, 10000))
+
+    def make(model, email=None, password='pw', **values):
+        number = next(counter)
+        user = model(name=values.pop('name', f'{model.__name__} {number}'),
+                     email=email or f'{model.__name__.lower()}{number}@test.local', **values)
+        user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def headers():
+    """Authorization headers for a user"""
+    def for_user(user):
+        role = {Admin: 'admin', Attendant: 'attendant', Attendee: 'attendee'}[type(user)]
+        return {'Authorization': f'Bearer {generate_token(f"{role}_{user.id}")}'}
+    return for_user
+
+
+@pytest.fixture
+def make_session(app):
+    """Create a session owned by an attendant"""
+    def make(attendant, course_code='C1', is_active=True, **values):
+        session = Session(title=values.pop('title', f'{course_code} lecture'), attendant_name=attendant.name,
+                          schedule=values.pop('schedule', ''), course_code=course_code,
+                          attendant_id=attendant.id, is_active=is_active, **values)
+        db.session.add(session)
+        db.session.commit()
+        return session
+    return make
@@ -0,0 +1,41 @@
+from app import db
+from app.models.active_attendance import ActiveAttendance
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+
+
+def test_active_index_follows_sessions(app, make_user, make_session):
+    attendant = make_user(Attendant)
+    first, second = make_session(attendant, 'C1'), make_session(attendant, 'C2')
+    ann = make_user(Attendee)
+
+    db.session.add(Attendance(attendee_id=ann.id, session_id=first.id, status='Present'))
+    db.session.commit()
+    assert ActiveAttendance.conflicting_session(ann.id, second.id).id == first.id
+    assert ActiveAttendance.conflicting_session(ann.id, first.id) is None
+    assert ActiveAttendance.conflicting_attendees({ann.id, 99}, second.id) == {ann.id}
+
+    first.is_active = False
+    db.session.commit()
+    assert ActiveAttendance.conflicting_session(ann.id, second.id) is None
+
+    first.is_active = True
+    db.session.commit()
+    assert ActiveAttendance.conflicting_session(ann.id, second.id).id == first.id
+
+
+def test_join_refuses_a_second_active_session(client, make_user, make_session, headers):
+    attendant = make_user(Attendant)
+    first, second = make_session(attendant, 'C1'), make_session(attendant, 'C2')
+    auth = headers(make_user(Attendee, units='C1,C2'))
+
+    assert client.post(f'/api/attendee/sessions/{first.id}/join', headers=auth).status_code == 201
+    assert client.post(f'/api/attendee/sessions/{first.id}/join', headers=auth).status_code == 200
+    response = client.post(f'/api/attendee/sessions/{second.id}/join', headers=auth)
+    assert response.status_code == 409
+    assert first.title in response.get_json()['error']
+
+    first.is_active = False
+    db.session.commit()
+    assert client.post(f'/api/attendee/sessions/{second.id}/join', headers=auth).status_code == 201
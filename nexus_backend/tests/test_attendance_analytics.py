@@ -0,0 +1,104 @@
+import threading
+from sqlalchemy import event
+from app import db
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.session_model import Session
+from app.services import attendance_analytics as analytics_module
+from app.services.attendance_analytics import AttendanceSnapshot, attendance_analytics
+
+
+def check_in(attendee, session, status='Present'):
+    db.session.add(Attendance(attendee_id=attendee.id, session_id=session.id, status=status))
+    db.session.commit()
+
+
+def test_snapshot_is_kept_for_max_age(app, monkeypatch, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann, bob = make_user(Attendee), make_user(Attendee)
+    check_in(ann, session)
+    clock = [1000.0]
+    monkeypatch.setattr(analytics_module.time, 'monotonic', lambda: clock[0])
+    attendance_analytics.max_age = 30
+
+    first = attendance_analytics.snapshot()
+    assert len(first.attendee) == 1
+
+    # Check-ins within max_age don't reload
+    check_in(bob, session)
+    clock[0] += 29
+    assert attendance_analytics.snapshot() is first
+
+    clock[0] += 2
+    second = attendance_analytics.snapshot()
+    assert second is not first and len(second.attendee) == 2
+
+    # Nothing changed after max_age: the snapshot is kept
+    clock[0] += 60
+    assert attendance_analytics.snapshot() is second
+
+
+def test_readers_keep_the_old_snapshot_during_a_reload(app, monkeypatch, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann, bob = make_user(Attendee), make_user(Attendee)
+    check_in(ann, session)
+    first = attendance_analytics.snapshot()
+    check_in(bob, session)
+
+    loading, release = threading.Event(), threading.Event()
+    load = AttendanceSnapshot.load.__func__
+
+    def slow_load(cls, version):
+        loading.set()
+        release.wait(5)
+        return load(cls, version)
+
+    monkeypatch.setattr(AttendanceSnapshot, 'load', classmethod(slow_load))
+
+    def reload():
+        with app.app_context():
+            attendance_analytics.snapshot()
+
+    thread = threading.Thread(target=reload)
+    thread.start()
+    try:
+        assert loading.wait(5)
+        assert attendance_analytics.snapshot() is first
+    finally:
+        release.set()
+        thread.join(5)
+    assert len(attendance_analytics.snapshot().attendee) == 2
+
+
+def test_sessions_committed_during_a_load_are_left_out(app, make_user, make_session):
+    attendant = make_user(Attendant)
+    first, third = make_session(attendant, id=1), make_session(attendant, id=3)
+    ann = make_user(Attendee)
+    check_in(ann, first)
+    check_in(ann, third)
+    engine = db.engine
+    done = []
+
+    def commit_sessions_meanwhile(conn, cursor, statement, parameters, context, executemany):
+        # Another worker commits sessions 2 (a lower id committing late) and 4,
+        # with attendance, between the session and attendance reads
+        if statement.lstrip().startswith('SELECT attendance.attendee_id') and not done:
+            done.append(True)
+            with engine.begin() as other:
+                for session_id in (2, 4):
+                    other.execute(db.insert(Session).values(
+                        id=session_id, title='late', attendant_name='', schedule='', course_code='C1',
+                        attendant_id=attendant.id, is_active=True))
+                    other.execute(db.insert(Attendance).values(
+                        attendee_id=ann.id, session_id=session_id, status='Present'))
+
+    event.listen(engine, 'before_cursor_execute', commit_sessions_meanwhile)
+    try:
+        snapshot = AttendanceSnapshot.load(None)
+    finally:
+        event.remove(engine, 'before_cursor_execute', commit_sessions_meanwhile)
+    assert done
+    assert list(snapshot.session_ids) == [1, 3]
+    assert [snapshot.session_ids[snapshot.session[row]] for row in snapshot.attendee_rows(ann.id)] == [1, 3]
+    assert list(snapshot.row_start) == [0, 1, 2]
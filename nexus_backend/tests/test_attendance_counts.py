@@ -0,0 +1,134 @@
+import pytest
+from app import db
+from app.models import attendance_counts
+from app.models.attendance import Attendance
+from app.models.attendance_counts import AttendanceCounts, SessionAttendanceCount
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.services.attendance_services import AttendanceService
+
+
+def recount():
+    """(session, total, present) and (attendee, total, present) straight from attendance"""
+    present = db.func.sum(db.case((Attendance.status == 'Present', 1), else_=0))
+    return tuple(
+        sorted(tuple(row) for row in db.session.execute(
+            db.select(column, db.func.count(), present).group_by(column)
+        ))
+        for column in (Attendance.session_id, Attendance.attendee_id)
+    )
+
+
+def counters():
+    sessions = sorted(
+        (session.id, total, present)
+        for session, total, present in AttendanceCounts.sessions_with_counts() if total
+    )
+    attendees = sorted(
+        (attendee.id,) + AttendanceCounts.for_attendee(attendee.id)
+        for attendee in Attendee.query.all() if AttendanceCounts.for_attendee(attendee.id)[0]
+    )
+    return sessions, attendees
+
+
+@pytest.fixture(params=['upsert', 'fallback'])
+def upsert_mode(request, monkeypatch):
+    if request.param == 'fallback':
+        monkeypatch.setattr(attendance_counts, 'COUNTER_UPSERTS', {})
+    return request.param
+
+
+def test_counters_follow_inserts_updates_and_deletes(app, upsert_mode, make_user, make_session):
+    attendant = make_user(Attendant)
+    s1, s2, s3 = (make_session(attendant, code) for code in ('C1', 'C2', 'C3'))
+    ann, bob = make_user(Attendee), make_user(Attendee)
+
+    record = Attendance(attendee_id=ann.id, session_id=s1.id, status='Present')
+    db.session.add_all([record, Attendance(attendee_id=bob.id, session_id=s1.id, status='Late')])
+    db.session.commit()
+    assert counters() == recount() == ([(s1.id, 2, 1)], [(ann.id, 1, 1), (bob.id, 1, 0)])
+
+    record.status = 'Absent'
+    db.session.commit()
+    assert counters() == recount()
+
+    record.session_id = s2.id
+    record.status = 'Present'
+    db.session.commit()
+    assert counters() == recount() == ([(s1.id, 1, 0), (s2.id, 1, 1)], [(ann.id, 1, 1), (bob.id, 1, 0)])
+
+    # Previous values not loaded: the update recounts the current keys
+    db.session.expire_all()
+    db.session.get(Attendance, record.id).status = 'Late'
+    db.session.commit()
+    assert counters() == recount()
+
+    # Move and status change with nothing loaded: both old and new keys are recounted
+    db.session.expire_all()
+    moved = db.session.get(Attendance, record.id)
+    db.session.expire(moved)
+    moved.session_id, moved.attendee_id, moved.status = s3.id, bob.id, 'Present'
+    db.session.commit()
+    assert counters() == recount() == ([(s1.id, 1, 0), (s3.id, 1, 1)], [(bob.id, 2, 1)])
+
+    db.session.delete(db.session.get(Attendance, record.id))
+    db.session.commit()
+    assert counters() == recount() == ([(s1.id, 1, 0)], [(bob.id, 1, 0)])
+
+
+def test_counters_follow_bulk_writes(app, upsert_mode, make_user, make_session):
+    attendant = make_user(Attendant)
+    session = make_session(attendant)
+    students = [make_user(Attendee) for _ in range(3)]
+
+    AttendanceService.record_checkins([(student.id, session.id, 'Present') for student in students[:2]])
+    db.session.commit()
+    AttendanceService.upsert_session_attendance(session.id, [
+        {'attendee_id': students[0].id, 'status': 'Absent'}, {'attendee_id': students[2].id}
+    ])
+    db.session.commit()
+    assert counters() == recount() == ([(session.id, 3, 2)], [(students[0].id, 1, 0), (students[1].id, 1, 1),
+                                                               (students[2].id, 1, 1)])
+
+
+def test_rebuild_repairs_drifted_counters(app, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann = make_user(Attendee)
+    db.session.add(Attendance(attendee_id=ann.id, session_id=session.id, status='Present'))
+    db.session.commit()
+
+    db.session.execute(db.update(SessionAttendanceCount).values(total=99))
+    db.session.commit()
+    assert AttendanceCounts.rebuild(db.session) == (1, 1)
+    db.session.commit()
+    assert counters() == recount()
+
+
+def test_deleting_sessions_and_attendees_drops_their_counters(app, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann = make_user(Attendee)
+    db.session.delete(ann)
+    db.session.delete(session)
+    db.session.commit()
+    assert counters() == ([], [])
+
+
+def test_endpoints_serve_the_counters(app, client, headers, make_user, make_session):
+    attendant = make_user(Attendant)
+    session = make_session(attendant)
+    ann = make_user(Attendee)
+    db.session.add_all([
+        Attendance(attendee_id=ann.id, session_id=session.id, status='Present'),
+        Attendance(attendee_id=ann.id, session_id=make_session(attendant, 'C2').id, status='Absent'),
+    ])
+    db.session.commit()
+
+    response = client.get('/api/attendant/sessions', headers=headers(attendant))
+    assert response.status_code == 200
+    assert [(row['attendanceCount'], row['presentCount']) for row in response.get_json()] == [(1, 1), (1, 0)]
+
+    response = client.get('/api/attendant/schedule', headers=headers(attendant))
+    assert [(row['attendanceCount'], row['presentCount']) for row in response.get_json()['sessions']] == [(1, 1), (1, 0)]
+
+    response = client.get('/api/attendee/profile', headers=headers(ann))
+    assert response.get_json()['attendance_stats'] == {'total_sessions': 2, 'present_count': 1, 'attendance_rate': 50.0}
@@ -0,0 +1,53 @@
+import pytest
+from app import db
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.device_model import Device
+
+BEACON = 'AA:BB:CC:DD:EE:01'
+
+
+@pytest.fixture
+def room(make_user, make_session):
+    """An attendant running a session with an active beacon, and one student"""
+    attendant = make_user(Attendant)
+    db.session.add(Device(attendant_id=attendant.id, ble_id='AABBCCDDEE01', is_active=True))
+    db.session.commit()
+    return attendant, make_session(attendant), make_user(Attendee)
+
+
+def scan(client, auth, student, beacon=BEACON, **extra):
+    body = {'admin_ble_raw': beacon, 'observations': [
+        {'student_ble_raw': '11:22:33:44:55:66', 'student_rssi_raw': -40, 'attendee_id': student.id}
+    ], **extra}
+    return client.post('/api/attendance/mark-ble/batch', json=body, headers=auth)
+
+
+def test_batch_records_attendance_for_own_beacon(client, headers, room):
+    attendant, session, student = room
+    response = scan(client, headers(attendant), student)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['session_id'], body['accepted']) == (session.id, 1)
+    assert [row['attendee_id'] for row in body['attendance_created']] == [student.id]
+    assert Attendance.query.filter_by(session_id=session.id, attendee_id=student.id).count() == 1
+
+
+def test_batch_refuses_another_attendants_beacon(client, headers, make_user, make_session, room):
+    _, session, student = room
+    other = make_user(Attendant)
+    make_session(other, course_code='C9')
+
+    response = scan(client, headers(other), student)
+    assert response.status_code == 403
+    response = scan(client, headers(other), student, session_id=session.id)
+    assert response.status_code == 403
+    assert Attendance.query.count() == 0
+
+
+def test_batch_needs_an_active_beacon(client, headers, room):
+    attendant, _, student = room
+    assert scan(client, headers(attendant), student, beacon='AA:BB:CC:DD:EE:99').status_code == 400
+    assert scan(client, headers(attendant), student, beacon='not a beacon').status_code == 400
+    assert scan(client, headers(student), student).status_code == 403
@@ -0,0 +1,57 @@
+from app import db
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.cache_version import CacheVersion
+from app.models.device_model import Device
+from app.utils.ble_registry import ble_registry
+
+
+def test_routes_follow_committed_writes(app, make_user, make_session):
+    attendant = make_user(Attendant)
+    device = Device(attendant_id=attendant.id, ble_id='AABBCCDDEE01', is_active=True)
+    db.session.add(device)
+    db.session.commit()
+    assert ble_registry.attendant_for('AABBCCDDEE01') == attendant.id
+    assert ble_registry.route('AABBCCDDEE01') is None
+
+    first = make_session(attendant, rssi_enter_threshold=-60)
+    assert ble_registry.route('AABBCCDDEE01') == (first.id, -60, None)
+    second = make_session(attendant, course_code='C2')
+    assert ble_registry.route('AABBCCDDEE01')[0] == second.id
+
+    second.is_active = False
+    db.session.commit()
+    assert ble_registry.route('AABBCCDDEE01')[0] == first.id
+
+    device.is_active = False
+    db.session.rollback()
+    assert ble_registry.is_active('AABBCCDDEE01')
+    device.is_active = False
+    db.session.commit()
+    assert not ble_registry.is_active('AABBCCDDEE01')
+
+
+def test_other_workers_changes_are_picked_up(app, make_user):
+    attendant = make_user(Attendant)
+    # A bulk write, as another worker would make, bumping the version without this process's events
+    db.session.execute(db.insert(Device).values(attendant_id=attendant.id, ble_id='AABBCCDDEE02', is_active=True))
+    CacheVersion.bump(db.session, 'ble_devices')
+    db.session.commit()
+    assert ble_registry.attendant_for('AABBCCDDEE02') == attendant.id
+
+
+def test_mark_ble_checks_into_the_beacons_session(client, make_user, make_session, headers):
+    attendant = make_user(Attendant)
+    db.session.add(Device(attendant_id=attendant.id, ble_id='AABBCCDDEE01', is_active=True))
+    db.session.commit()
+    session = make_session(attendant)
+    student = make_user(Attendee)
+    body = {'admin_ble_raw': 'aa:bb:cc:dd:ee:01', 'student_ble_raw': '11:22:33:44:55:66', 'student_rssi_raw': -40}
+
+    response = client.post('/api/attendance/mark-ble', json=body, headers=headers(student))
+    assert response.status_code == 201
+    assert Attendance.query.filter_by(session_id=session.id, attendee_id=student.id).count() == 1
+
+    body['admin_ble_raw'] = 'AA:BB:CC:DD:EE:99'
+    assert client.post('/api/attendance/mark-ble', json=body, headers=headers(student)).status_code == 400
@@ -0,0 +1,78 @@
+import io
+import pytest
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.enrollment import Enrollment
+from app.services.enrollment_service import EnrollmentError, EnrollmentService, read_serials_csv
+from app.utils.principal_cache import principal_cache
+
+
+def make_students(make_user, count, **values):
+    students = [make_user(Attendee, **values) for _ in range(count)]
+    for student in students:
+        student.generate_serial()
+    db.session.commit()
+    return students
+
+
+def test_enroll_many_reports_each_student(app, make_user):
+    ann, bob, cy = make_students(make_user, 3)
+    bob.units = 'C1'
+    db.session.commit()
+
+    results, enrolled = EnrollmentService.enroll_many(' C1 ', [ann.id, bob.id, 999], [cy.serial, 'NOPE', ann.serial])
+    db.session.commit()
+
+    assert enrolled == 2
+    assert [result['status'] for result in results] == [
+        'enrolled', 'already_enrolled', 'not_found', 'enrolled', 'not_found', 'duplicate'
+    ]
+    assert [attendee.id for attendee in Enrollment.roster('C1')] == [ann.id, bob.id, cy.id]
+    db.session.expire_all()
+    assert db.session.get(Attendee, cy.id).units == 'C1'
+
+
+def test_enroll_many_refreshes_cached_principals(app, make_user):
+    [ann] = make_students(make_user, 1, units='C0')
+    assert principal_cache.get(f'attendee_{ann.id}').units == 'C0'
+    EnrollmentService.enroll_many('C1', [ann.id])
+    db.session.commit()
+    assert principal_cache.get(f'attendee_{ann.id}').units == 'C0,C1'
+
+
+@pytest.mark.parametrize('course_code, student_ids, message', [
+    ('', [1], 'Course code required'),
+    ('C' * 51, [1], 'Course code is too long'),
+    ('C1', ['x'], 'studentIds must be integers'),
+    ('C1', [], 'Provide studentIds or serials'),
+])
+def test_enroll_many_validates(app, course_code, student_ids, message):
+    with pytest.raises(EnrollmentError, match=message):
+        EnrollmentService.enroll_many(course_code, student_ids)
+
+
+def test_read_serials_csv():
+    assert read_serials_csv(io.BytesIO(b'name,serial\nAnn,S1\nBob,\nCy,S3\n')) == ['S1', 'S3']
+    assert read_serials_csv(io.BytesIO(b'S1\n\nS2\n')) == ['S1', 'S2']
+
+
+def test_add_course_endpoint(client, make_user, headers):
+    attendant = make_user(Attendant)
+    ann, bob = make_students(make_user, 2)
+
+    response = client.post('/api/attendant/students/add-course', headers=headers(attendant),
+                           json={'courseCode': 'C1', 'studentIds': [ann.id], 'serials': f'{bob.serial}\nMISSING'})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert (body['enrolled'], body['alreadyEnrolled'], body['notFound']) == (2, 0, 1)
+
+    response = client.post('/api/attendant/students/add-course', headers=headers(attendant),
+                           content_type='multipart/form-data',
+                           data={'courseCode': 'C1', 'file': (io.BytesIO(f'serial\n{ann.serial}\n'.encode()), 's.csv')})
+    assert response.get_json()['alreadyEnrolled'] == 1
+
+    assert client.post('/api/attendant/students/add-course', headers=headers(attendant),
+                       json={'courseCode': 'C1'}).status_code == 400
+    assert client.post('/api/attendant/students/add-course', headers=headers(ann),
+                       json={'courseCode': 'C1', 'studentIds': [ann.id]}).status_code == 403
@@ -0,0 +1,88 @@
+import io
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.enrollment import Enrollment
+from app.models.user_directory import UserDirectory
+from app.services.bulk_import import CsvImporter
+
+
+def csv_stream(*lines):
+    return io.BytesIO(('﻿' + '\n'.join(lines) + '\n').encode('utf-8'))
+
+
+def test_import_creates_users_in_chunks(app, make_user):
+    make_user(Attendant, email='taken@test.local')
+    stream = csv_stream(
+        'name,email,units,role',
+        'Ann,Ann@Test.local,C1,attendee',
+        'Bob,bob@test.local,,attendant',
+        'Dup,ann@test.local,,',
+        'Old,TAKEN@test.local,,',
+        ',missing@test.local,,',
+        'Cy,cy@test.local,"C1,C2",',
+    )
+
+    importer = CsvImporter(chunk_size=2).run(stream)
+
+    assert [user['email'] for user in importer.created] == ['ann@test.local', 'bob@test.local', 'cy@test.local']
+    assert importer.failed == [
+        {'email': 'ann@test.local', 'reason': 'Email already exists'},
+        {'email': 'taken@test.local', 'reason': 'Email already exists'},
+    ]
+
+    ann = Attendee.query.filter_by(email='ann@test.local').one()
+    assert ann.serial == Attendee.serial_for(ann.id)
+    assert ann.check_password(importer.created[0]['password'])
+    assert Attendant.query.filter_by(email='bob@test.local').one().serial is not None
+    assert db.session.get(UserDirectory, 'cy@test.local').role == 'Attendee'
+    cy = Attendee.query.filter_by(email='cy@test.local').one()
+    assert sorted(db.session.execute(
+        db.select(Enrollment.course_code).where(Enrollment.attendee_id == cy.id)
+    ).scalars()) == ['C1', 'C2']
+
+
+def test_duplicates_within_a_chunk_are_reported(app):
+    importer = CsvImporter(default_role='Attendee').run(csv_stream(
+        'name,email', 'A,a@test.local', 'B,A@test.local'
+    ))
+    assert [user['email'] for user in importer.created] == ['a@test.local']
+    assert importer.failed == [{'email': 'a@test.local', 'reason': 'Duplicate email in file'}]
+
+
+def test_skip_rows_resumes_after_committed_rows(app):
+    importer = CsvImporter(default_role='Attendant').run(csv_stream(
+        'name,email', 'A,a@test.local', 'B,b@test.local', 'C,c@test.local'
+    ), skip_rows=2)
+    assert [user['email'] for user in importer.created] == ['c@test.local']
+    assert Attendant.query.count() == 1
+
+
+def test_overlong_rows_fail_before_the_insert(app):
+    importer = CsvImporter(default_role='Attendee').run(csv_stream(
+        'name,email',
+        f'{"N" * 101},long-name@test.local',
+        f'Ann,{"a" * 111}@test.local',
+        'Bob,bob@test.local',
+    ))
+    assert [user['email'] for user in importer.created] == ['bob@test.local']
+    assert importer.failed == [
+        {'email': 'long-name@test.local', 'reason': 'Name is longer than 100 characters'},
+        {'email': ('a' * 111 + '@test.local')[:120], 'reason': 'Email is longer than 120 characters'},
+    ]
+
+
+def test_a_refused_row_fails_alone(app, make_user):
+    class RacingImporter(CsvImporter):
+        def hash_passwords(self, passwords):
+            # Another request takes an email after the directory check
+            make_user(Attendant, email='b@test.local')
+            return super().hash_passwords(passwords)
+
+    importer = RacingImporter(default_role='Attendee').run(csv_stream(
+        'name,email', 'A,a@test.local', 'B,b@test.local', 'C,c@test.local'
+    ))
+    assert [user['email'] for user in importer.created] == ['a@test.local', 'c@test.local']
+    assert importer.failed == [{'email': 'b@test.local', 'reason': 'Email already exists'}]
+    assert sorted(user.email for user in Attendee.query.all()) == ['a@test.local', 'c@test.local']
+    assert Attendee.query.filter_by(email='c@test.local').one().serial is not None
@@ -0,0 +1,58 @@
+import pytest
+from app import db
+from app.models import cache_version
+from app.models.cache_version import CacheVersion
+
+
+@pytest.fixture(params=['upsert', 'fallback'])
+def upsert_mode(request, monkeypatch):
+    """Run against INSERT ... ON CONFLICT and the UPDATE-then-INSERT fallback"""
+    if request.param == 'fallback':
+        monkeypatch.setattr(cache_version, 'VERSION_UPSERTS', {})
+    return request.param
+
+
+def test_bump_creates_and_increments(app, upsert_mode):
+    assert CacheVersion.current('reports') == 0
+    CacheVersion.bump(db.session, 'reports')
+    db.session.commit()
+    assert CacheVersion.current('reports') == 1
+
+    with db.engine.begin() as connection:
+        CacheVersion.bump(connection, 'reports')
+        CacheVersion.bump(connection, 'other')
+    assert CacheVersion.current('reports') == 2
+    assert CacheVersion.current('other') == 1
+
+
+def test_bump_joins_the_callers_transaction(app, upsert_mode):
+    CacheVersion.bump(db.session, 'reports')
+    db.session.rollback()
+    assert CacheVersion.current('reports') == 0
+
+
+def test_fallback_survives_losing_the_first_insert_race(app, monkeypatch):
+    monkeypatch.setattr(cache_version, 'VERSION_UPSERTS', {})
+    CacheVersion.bump(db.session, 'reports')
+    db.session.commit()
+
+    class LateConnection:
+        """The ORM session, missing the row on its first UPDATE as if another writer inserted it just after"""
+        def __init__(self):
+            self.missed = False
+
+        def execute(self, statement, *args):
+            if not self.missed and statement.is_update:
+                self.missed = True
+                return type('Result', (), {'rowcount': 0})()
+            return db.session.execute(statement, *args)
+
+        def __getattr__(self, name):
+            return getattr(db.session, name)
+
+    db.session.add(CacheVersion(name='callers_write', version=5))
+    db.session.flush()
+    CacheVersion.bump(LateConnection(), 'reports')
+    db.session.commit()
+    assert CacheVersion.current('reports') == 2
+    assert CacheVersion.current('callers_write') == 5
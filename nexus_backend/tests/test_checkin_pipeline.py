@@ -0,0 +1,101 @@
+import threading
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.device_model import Device
+from app.services.checkin_pipeline import CheckinTimeout, checkin_pipeline
+
+
+@pytest.fixture
+def group_commit(app):
+    app.config.update(CHECKIN_GROUP_COMMIT=True, CHECKIN_TIMEOUT=5, CHECKIN_RETRY_AFTER=3)
+    checkin_pipeline.configure(app)
+    yield checkin_pipeline
+    app.config['CHECKIN_GROUP_COMMIT'] = False
+    checkin_pipeline.configure(app)
+
+
+def test_group_commit_writes_concurrent_checkins(group_commit, make_user, make_session):
+    session_id = make_session(make_user(Attendant)).id
+    attendees = [make_user(Attendee).id for _ in range(8)]
+    results = {}
+
+    def check_in(attendee_id):
+        results[attendee_id] = group_commit.check_in(attendee_id, session_id)
+
+    threads = [threading.Thread(target=check_in, args=(attendee_id,)) for attendee_id in attendees + attendees[:2]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert Attendance.query.filter_by(session_id=session_id).count() == 8
+    assert all(attendance['attendee_id'] == attendee_id for attendee_id, (attendance, _) in results.items())
+
+
+def test_timeout_raises_with_retry_hint(group_commit, monkeypatch):
+    release = threading.Event()
+
+    def slow_write(checkins):
+        release.wait(5)
+        return {(1, 1): ({}, True)}
+    monkeypatch.setattr(group_commit, 'write', slow_write)
+    monkeypatch.setattr(group_commit, 'timeout', 0.05)
+    with pytest.raises(CheckinTimeout) as error:
+        group_commit.check_in(1, 1)
+    assert error.value.retry_after == 3
+    release.set()
+
+
+def test_join_timeout_is_retryable(client, make_user, make_session, headers, monkeypatch):
+    session = make_session(make_user(Attendant), course_code='C2')
+    attendee = make_user(Attendee, units='C1')
+    auth = headers(attendee)
+
+    def timeout(*args):
+        raise CheckinTimeout(4)
+    monkeypatch.setattr(checkin_pipeline, 'check_in', timeout)
+    response = client.post(f'/api/attendee/sessions/{session.id}/join', headers=auth)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '4'
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).units == 'C1'
+
+    monkeypatch.undo()
+    assert client.post(f'/api/attendee/sessions/{session.id}/join', headers=auth).status_code == 201
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).units == 'C1,C2'
+
+
+def test_join_errors_do_not_leak_details(client, make_user, make_session, headers, monkeypatch):
+    session = make_session(make_user(Attendant))
+
+    def fail(*args):
+        raise RuntimeError('connection to db-primary:5432 refused')
+    monkeypatch.setattr(checkin_pipeline, 'check_in', fail)
+    response = client.post(f'/api/attendee/sessions/{session.id}/join', headers=headers(make_user(Attendee)))
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'Failed to join session'}
+
+
+def test_mark_ble_errors_roll_back_and_do_not_leak_details(client, make_user, make_session, headers, monkeypatch):
+    attendant = make_user(Attendant)
+    db.session.add(Device(attendant_id=attendant.id, ble_id='AABBCCDDEE01', is_active=True))
+    db.session.commit()
+    make_session(attendant)
+    body = {'admin_ble_raw': 'aa:bb:cc:dd:ee:01', 'student_ble_raw': '11:22:33:44:55:66', 'student_rssi_raw': -40}
+
+    def fail(*args):
+        raise IntegrityError('INSERT INTO attendance ...', {}, Exception('FOREIGN KEY constraint failed'))
+    monkeypatch.setattr(checkin_pipeline, 'check_in', fail)
+    rollbacks = []
+    rollback = db.session.rollback
+    monkeypatch.setattr(db.session, 'rollback', lambda: rollbacks.append(1) or rollback())
+
+    response = client.post('/api/attendance/mark-ble', json=body, headers=headers(make_user(Attendee)))
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'Failed to mark attendance'}
+    assert rollbacks
@@ -0,0 +1,36 @@
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.enrollment import Enrollment, parse_units
+
+
+def test_parse_units_strips_and_dedupes():
+    assert parse_units(' C1, C2 ,,C1') == ['C1', 'C2']
+    assert parse_units(None) == []
+
+
+def test_enrollments_follow_units(app, make_user, make_session):
+    attendant = make_user(Attendant)
+    c1, c2 = make_session(attendant, 'C1'), make_session(attendant, 'C2')
+    ann = make_user(Attendee, units='C1, C2')
+    bob = make_user(Attendee, units='C2')
+
+    assert Enrollment.courses_for(ann.id) == ['C1', 'C2']
+    assert [attendee.id for attendee in Enrollment.roster('C2')] == [ann.id, bob.id]
+    assert [session.id for session in Enrollment.sessions_for(ann.id)] == [c1.id, c2.id]
+
+    ann.units = 'C2'
+    db.session.commit()
+    assert Enrollment.courses_for(ann.id) == ['C2']
+
+    db.session.delete(bob)
+    db.session.commit()
+    assert [attendee.id for attendee in Enrollment.roster('C2')] == [ann.id]
+
+
+def test_roster_endpoint(client, make_user, headers):
+    attendant = make_user(Attendant)
+    ann = make_user(Attendee, units='C1')
+    make_user(Attendee, units='C2')
+    response = client.get('/api/attendant/students?courseCode=C1', headers=headers(attendant))
+    assert [student['id'] for student in response.get_json()] == [ann.id]
@@ -0,0 +1,61 @@
+from app import db
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.utils.etag import attendance_version, attendance_versions
+
+
+def test_polled_listing_revalidates_with_304(client, make_user, make_session, headers):
+    attendant = make_user(Attendant)
+    session = make_session(attendant)
+    auth = headers(attendant)
+
+    response = client.get('/api/attendant/sessions', headers=auth)
+    etag = response.headers['ETag']
+    assert response.status_code == 200 and response.headers['Cache-Control'] == 'private, no-cache'
+    response = client.get('/api/attendant/sessions', headers={**auth, 'If-None-Match': etag})
+    assert response.status_code == 304 and response.headers['ETag'] == etag
+
+    db.session.add(Attendance(attendee_id=make_user(Attendee).id, session_id=session.id, status='Present'))
+    db.session.commit()
+    response = client.get('/api/attendant/sessions', headers={**auth, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()[0]['attendanceCount'] == 1
+
+    # Another attendant's tag is never the same
+    other = client.get('/api/attendant/sessions', headers=headers(make_user(Attendant)))
+    assert other.headers['ETag'] != response.headers['ETag']
+
+
+def test_version_moves_when_a_lower_id_commits_late(app, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann, bob = make_user(Attendee), make_user(Attendee)
+    db.session.add(Attendance(id=10, attendee_id=ann.id, session_id=session.id, status='Present'))
+    db.session.commit()
+    before = attendance_version()
+
+    db.session.add(Attendance(id=7, attendee_id=bob.id, session_id=session.id, status='Present'))
+    db.session.commit()
+    assert attendance_version() != before
+
+    changed = attendance_version()
+    db.session.get(Attendance, 7).status = 'Late'
+    db.session.commit()
+    assert attendance_version() != changed
+
+
+def test_version_is_memoised_between_local_writes(app, make_user, make_session, monkeypatch):
+    monkeypatch.setattr(attendance_versions, 'check_interval', 60)
+    session = make_session(make_user(Attendant))
+    ann, bob = make_user(Attendee), make_user(Attendee)
+    before = attendance_version()
+
+    # Another worker's write shows up only after the check interval...
+    db.session.execute(db.insert(Attendance).values(attendee_id=ann.id, session_id=session.id, status='Present'))
+    db.session.commit()
+    assert attendance_version() == before
+
+    # ...but this process's own writes are seen at once
+    db.session.add(Attendance(attendee_id=bob.id, session_id=session.id, status='Present'))
+    db.session.commit()
+    assert attendance_version()[0] == 2
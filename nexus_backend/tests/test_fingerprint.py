@@ -0,0 +1,39 @@
+import pytest
+from app.utils.fingerprint import _clean_ble_id_cached, clean_ble_id, clean_rssi, parse_and_validate_many
+
+
+def test_clean_ble_id_normalises_separators_and_case():
+    assert clean_ble_id(' aa:bb-cc dd.ee:01 ') == 'AABBCCDDEE01'
+    with pytest.raises(ValueError):
+        clean_ble_id('xyz')
+    with pytest.raises(ValueError):
+        clean_ble_id('')
+
+
+def test_clean_rssi_clamps():
+    assert clean_rssi('-70.4') == -70
+    assert clean_rssi(-500) == -120
+    assert clean_rssi(12) == -30
+    with pytest.raises(ValueError):
+        clean_rssi('loud')
+
+
+def test_batch_parsing_matches_single_parsing():
+    raw = [('aa:bb:cc:dd:ee:01', -70), ('aa:bb:cc:dd:ee:01', '-71'), ('bad', -70),
+           (None, -70), ('AABBCCDDEE02', 'x'), ('AABBCCDDEE03', 5), (0xAABBCCDD, -200)]
+    results = parse_and_validate_many([ble for ble, _ in raw], [rssi for _, rssi in raw])
+
+    assert results[0] == ('AABBCCDDEE01', -70, None)
+    assert results[1] == ('AABBCCDDEE01', -71, None)
+    assert results[2][:2] == (None, None) and 'invalid ble_id' in results[2][2]
+    assert results[3] == (None, None, 'ble_id is required')
+    assert results[4] == (None, None, 'rssi must be numeric')
+    assert results[5] == ('AABBCCDDEE03', -30, None)
+    assert results[6] == (clean_ble_id(str(0xAABBCCDD)), -120, None)
+
+
+def test_ids_are_cleaned_once():
+    _clean_ble_id_cached.cache_clear()
+    parse_and_validate_many(['aa:bb:cc:dd:ee:01'] * 5, [-70] * 5)
+    info = _clean_ble_id_cached.cache_info()
+    assert (info.misses, info.hits) == (1, 4)
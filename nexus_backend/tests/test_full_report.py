@@ -0,0 +1,44 @@
+from app import db
+from app.models.admin_model import Admin
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+
+
+def test_full_report_matches_the_records(client, make_user, make_session, headers):
+    attendant = make_user(Attendant)
+    s1 = make_session(attendant, 'C1')
+    s2 = make_session(attendant, 'C2', is_active=False)
+    ann = make_user(Attendee, units='C1,C2')
+    bob = make_user(Attendee, units='C1')
+    cy = make_user(Attendee)
+    db.session.add_all([
+        Attendance(attendee_id=ann.id, session_id=s1.id, status='Present'),
+        Attendance(attendee_id=ann.id, session_id=s2.id, status='Present'),
+        Attendance(attendee_id=bob.id, session_id=s1.id, status='Late'),
+    ])
+    db.session.commit()
+
+    response = client.get('/api/admin/reports/full', headers=headers(make_user(Admin)))
+    assert response.status_code == 200
+    report = response.get_json()
+
+    assert report['summary'] == {
+        'totalSessions': 2, 'activeSessions': 1, 'totalAttendanceRecords': 3,
+        'totalStudents': 3, 'averageAttendance': 66.67, 'presentCount': 2
+    }
+    sessions = {row['id']: row for row in report['sessions']}
+    assert (sessions[s1.id]['totalAttendees'], sessions[s1.id]['presentCount'], sessions[s1.id]['attendanceRate']) == (2, 1, 50)
+    assert (sessions[s2.id]['totalAttendees'], sessions[s2.id]['isActive']) == (1, False)
+
+    # Lowest attendance first
+    assert [(row['id'], row['totalSessions'], row['presentCount']) for row in report['students']] == [
+        (bob.id, 1, 0), (cy.id, 0, 0), (ann.id, 2, 2)
+    ]
+    assert report['students'][2]['enrolledCourses'] == ['C1', 'C2']
+    assert report['generatedAt']
+
+
+def test_full_report_is_admin_only(client, make_user, headers):
+    assert client.get('/api/admin/reports/full', headers=headers(make_user(Attendant))).status_code == 403
+    assert client.get('/api/admin/reports/full').status_code == 401
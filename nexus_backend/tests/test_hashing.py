@@ -0,0 +1,76 @@
+import time
+import pytest
+from werkzeug.security import check_password_hash
+from app.models.attendee_model import Attendee
+from app.utils.hashing import BatchHasher, HashingPool, HashingPoolBusy, hashing_pool
+
+
+@pytest.fixture
+def pool():
+    pool = HashingPool(workers=1, queue_size=0, timeout=0.2, retry_after=7)
+    yield pool
+    pool.shutdown()
+
+
+def test_inline_pool_hashes_and_verifies():
+    pool = HashingPool(workers=0)
+    pwhash = pool.hash('secret')
+    assert pool.verify(pwhash, 'secret')
+    assert not pool.verify(pwhash, 'wrong')
+    assert pool.metrics()['in_flight'] == 0
+
+
+def test_pool_rejects_when_full(pool):
+    pool._admit()
+    with pytest.raises(HashingPoolBusy) as busy:
+        pool.hash('secret')
+    assert busy.value.retry_after == 7
+    assert pool.metrics()['rejected_total'] == 1
+
+
+def test_timeout_raises_busy_and_keeps_slot_until_worker_finishes(pool):
+    with pytest.raises(HashingPoolBusy):
+        pool._run(time.sleep, 1.0)
+    assert pool.metrics()['timed_out_total'] == 1
+
+    # The worker is still hashing, so the slot is still taken
+    assert pool.metrics()['in_flight'] == 1
+    with pytest.raises(HashingPoolBusy):
+        pool.hash('secret')
+
+    deadline = time.monotonic() + 5
+    while pool.metrics()['in_flight'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pool.metrics()['in_flight'] == 0
+    pool.timeout = 30
+    assert pool.verify(pool.hash('secret'), 'secret')
+
+
+def test_login_answers_503_when_hashing_is_busy(client, make_user, monkeypatch):
+    make_user(Attendee, email='student@example.com', password='secret')
+
+    def busy(*args):
+        raise HashingPoolBusy(3)
+    monkeypatch.setattr(hashing_pool, '_run', busy)
+
+    response = client.post('/api/auth/login', json={'email': 'student@example.com', 'password': 'secret'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+
+
+def test_batch_hasher_keeps_input_order(app):
+    passwords = [f'password-{n}' for n in range(6)]
+    with BatchHasher(workers=2, threshold=4, method='pbkdf2:sha256:1000') as hasher:
+        hashes = hasher.hash_many(passwords)
+        assert hasher._executor is not None
+    assert hasher._executor is None
+    assert [check_password_hash(pwhash, password) for pwhash, password in zip(hashes, passwords)] == [True] * 6
+    assert all(pwhash.startswith('pbkdf2:sha256:1000$') for pwhash in hashes)
+
+
+def test_small_batches_are_hashed_inline(app):
+    hasher = BatchHasher(workers=2, threshold=4)
+    hashes = hasher.hash_many(['a', 'b'])
+    assert hasher._executor is None
+    assert check_password_hash(hashes[1], 'b')
+    assert hasher.method == hashing_pool.method
@@ -0,0 +1,94 @@
+import io
+import os
+from app import db
+from app.models.admin_model import Admin
+from app.models.attendee_model import Attendee
+from app.models.import_job import ImportJob, ImportJobResult
+from app.models.outbound_email import OutboundEmail
+from app.services.import_jobs import JobImporter, import_job_runner
+
+
+def upload(client, auth, content, path='/api/bulk/upload-attendees'):
+    return client.post(path, headers=auth, content_type='multipart/form-data',
+                       data={'file': (io.BytesIO(content.encode()), 'users.csv')})
+
+
+def test_upload_queues_a_job_that_workers_run(app, client, make_user, headers):
+    app.config.update(MAIL_USERNAME='nexus@test.local', MAIL_PASSWORD='secret')
+    auth = headers(make_user(Admin))
+
+    response = upload(client, auth, 'name,email\nAnn,ann@test.local\nBob,bob@test.local\nDup,ann@test.local\n')
+    assert response.status_code == 202
+    job_id = response.get_json()['job']['id']
+    assert client.get(f'/api/bulk/jobs/{job_id}', headers=auth).get_json()['status'] == 'queued'
+
+    token = import_job_runner.claim(job_id)
+    assert token and import_job_runner.claim(job_id) is None
+    import_job_runner.run_job(job_id, token)
+
+    job = client.get(f'/api/bulk/jobs/{job_id}', headers=auth).get_json()
+    assert (job['status'], job['rows_processed'], job['created_count'], job['failed_count']) == ('completed', 3, 2, 1)
+
+    created = client.get(f'/api/bulk/jobs/{job_id}/results', headers=auth).get_json()
+    assert [row['email'] for row in created['results']] == ['ann@test.local', 'bob@test.local']
+    assert all('password' not in row for row in created['results'])
+    failed = client.get(f'/api/bulk/jobs/{job_id}/results?status=failed', headers=auth).get_json()
+    assert failed['results'] == [{'email': 'ann@test.local', 'reason': 'Duplicate email in file'}]
+
+    # The temporary password only exists in the welcome email
+    assert 'password' not in ImportJobResult.__table__.c
+    ann = Attendee.query.filter_by(email='ann@test.local').one()
+    body = db.session.execute(
+        db.select(OutboundEmail.body).where(OutboundEmail.to_email == 'ann@test.local')
+    ).scalar_one()
+    password = body.split('Temporary Password: ')[1].split()[0]
+    assert ann.check_password(password)
+
+
+def test_stale_running_jobs_resume_after_committed_rows(app, make_user):
+    os.makedirs(app.config['IMPORT_UPLOAD_DIR'], exist_ok=True)
+    path = os.path.join(app.config['IMPORT_UPLOAD_DIR'], 'resume.csv')
+    with open(path, 'w') as f:
+        f.write('name,email\nA,a@test.local\nB,b@test.local\n')
+    job = ImportJob(role='Attendee', file_path=path, status='running', rows_processed=1)
+    db.session.add(job)
+    db.session.commit()
+
+    import_job_runner.stale_seconds = -1
+    token = import_job_runner.claim(job.id)
+    import_job_runner.run_job(job.id, token)
+    assert [user.email for user in Attendee.query.all()] == ['b@test.local']
+    assert not os.path.exists(path)
+
+
+def test_upload_requires_a_csv(client, make_user, headers):
+    auth = headers(make_user(Admin))
+    response = client.post('/api/bulk/upload-attendees', headers=auth, content_type='multipart/form-data',
+                           data={'file': (io.BytesIO(b'x'), 'users.txt')})
+    assert response.status_code == 400
+
+
+def test_a_lost_claim_stops_the_job_without_failing_its_rows(app, monkeypatch):
+    os.makedirs(app.config['IMPORT_UPLOAD_DIR'], exist_ok=True)
+    path = os.path.join(app.config['IMPORT_UPLOAD_DIR'], 'lost.csv')
+    with open(path, 'w') as f:
+        f.write('name,email\nA,a@test.local\nB,b@test.local\n')
+    job = ImportJob(role='Attendee', file_path=path)
+    db.session.add(job)
+    db.session.commit()
+    token = import_job_runner.claim(job.id)
+
+    # Another worker takes the job over before our first chunk commits
+    db.session.execute(db.update(ImportJob).where(ImportJob.id == job.id).values(claimed_by='other'))
+    db.session.commit()
+    calls = []
+    on_chunk = JobImporter.on_chunk
+    monkeypatch.setattr(JobImporter, 'on_chunk', lambda self, *args: calls.append(args) or on_chunk(self, *args))
+
+    import_job_runner.run_job(job.id, token)
+    assert len(calls) == 1
+    db.session.expire_all()
+    job = db.session.get(ImportJob, job.id)
+    assert (job.status, job.claimed_by, job.rows_processed, job.failed_count) == ('running', 'other', 0, 0)
+    assert Attendee.query.count() == 0
+    assert ImportJobResult.query.count() == 0
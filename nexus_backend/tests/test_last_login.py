@@ -0,0 +1,62 @@
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.utils.last_login import LastLoginBuffer
+
+
+def buffered(app):
+    """A buffer that only writes when flushed"""
+    buffer = LastLoginBuffer(interval=60)
+    buffer.app = app
+    return buffer
+
+
+def test_logins_are_buffered_until_flushed(app, make_user):
+    attendee = make_user(Attendee)
+    attendant = make_user(Attendant)
+    buffer = buffered(app)
+
+    buffer.record(attendee)
+    buffer.record(attendant)
+    assert buffer.last_login(attendee) is not None
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).last_login is None
+
+    assert buffer.flush() == 2
+    assert buffer.flush() == 0
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).last_login is not None
+    assert db.session.get(Attendant, attendant.id).last_login is not None
+
+
+def test_failed_flush_keeps_the_batch(app, make_user, monkeypatch):
+    attendee = make_user(Attendee)
+    buffer = buffered(app)
+    buffer.record(attendee)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('database is down')
+    monkeypatch.setattr(db.session, 'execute', fail)
+    assert buffer.flush() == 0
+    monkeypatch.undo()
+
+    assert buffer.flush() == 1
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).last_login is not None
+
+
+def test_stop_flushes_pending_logins(app, make_user):
+    attendee = make_user(Attendee)
+    buffer = buffered(app)
+    buffer.record(attendee)
+    buffer.stop()
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).last_login is not None
+
+
+def test_login_reports_last_login(client, make_user):
+    attendee = make_user(Attendee, email='a@test.local')
+    response = client.post('/api/auth/login', json={'email': 'a@test.local', 'password': 'pw'})
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).last_login is not None
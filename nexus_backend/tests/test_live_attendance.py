@@ -0,0 +1,76 @@
+import json
+import pytest
+from app import db
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.services.live_attendance import LiveAttendanceHub
+
+
+@pytest.fixture
+def hub(app):
+    hub = LiveAttendanceHub()
+    hub.configure(app)
+    hub._thread = object()  # publish by hand instead of from the publisher thread
+    yield hub
+    hub._thread = None
+    hub.stop()
+
+
+def events(subscription):
+    frames = []
+    while not subscription.frames.empty():
+        frame = subscription.frames.get_nowait()
+        if frame is None:
+            break
+        name = frame.split('event: ')[1].split('\n')[0]
+        frames.append((name, json.loads(frame.split('data: ')[1])))
+    return frames
+
+
+def check_in(attendee, session, status='Present', row_id=None):
+    db.session.add(Attendance(id=row_id, attendee_id=attendee.id, session_id=session.id, status=status))
+    db.session.commit()
+
+
+def test_checkins_stream_with_running_counts(hub, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann, bob = make_user(Attendee), make_user(Attendee)
+    check_in(ann, session)
+
+    subscription = hub.subscribe(session.id)
+    hub.publish()
+    assert events(subscription) == [('counts', {'sessionId': session.id, 'present': 1, 'total': 1})]
+
+    check_in(bob, session, 'Late')
+    hub.publish()
+    [(name, data)] = events(subscription)
+    assert (name, data['attendance']['attendee_id'], data['present'], data['total']) == ('checkin', bob.id, 1, 2)
+
+    session.is_active = False
+    db.session.commit()
+    hub.publish()
+    assert events(subscription) == [('end', {'sessionId': session.id})]
+    assert subscription.closed
+
+
+def test_late_commits_below_the_mark_are_streamed_once(hub, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann, bob, cy = (make_user(Attendee) for _ in range(3))
+    subscription = hub.subscribe(session.id)
+    hub.publish()
+    events(subscription)
+
+    check_in(ann, session, row_id=10)
+    hub.publish()
+    # Id 7 was allocated before 10 but its transaction committed afterwards
+    check_in(bob, session, row_id=7)
+    hub.publish()
+    hub.publish()
+    streamed = [data['attendance']['id'] for name, data in events(subscription) if name == 'checkin']
+    assert streamed == [10, 7]
+
+    hub.lag_window = 2
+    check_in(cy, session, row_id=3)
+    hub.publish()
+    assert events(subscription) == []
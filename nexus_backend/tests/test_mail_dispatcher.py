@@ -0,0 +1,108 @@
+import smtplib
+from datetime import timedelta
+from types import SimpleNamespace
+import pytest
+from app import db
+from app.models.outbound_email import OutboundEmail
+from app.utils.clock import utcnow
+from app.utils.email import MailDispatcher, send_reset_email
+
+
+class FakeServer:
+    def __init__(self, fail):
+        self.fail = fail
+        self.sent = []
+
+    def send_message(self, msg):
+        if self.fail:
+            raise smtplib.SMTPException('rejected')
+        self.sent.append(msg)
+
+
+class FakePool:
+    def __init__(self, fail=False):
+        self.server = FakeServer(fail)
+
+    def acquire(self):
+        return self.server
+
+    def release(self, server):
+        pass
+
+    def discard(self, server):
+        pass
+
+
+@pytest.fixture
+def dispatcher(app):
+    app.config.update(MAIL_USERNAME='nexus@test.local', MAIL_PASSWORD='secret',
+                      MAIL_MAX_ATTEMPTS=2, MAIL_RETRY_BACKOFF=0)
+    dispatcher = MailDispatcher()
+    dispatcher.configure(app)
+    dispatcher._executor = SimpleNamespace(map=map)
+    return dispatcher
+
+
+def test_sent_emails_are_deleted(dispatcher):
+    send_reset_email('a@test.local', '123456')
+    dispatcher.pool = FakePool()
+
+    assert dispatcher.dispatch_batch() == 1
+    assert '123456' in dispatcher.pool.server.sent[0].get_payload()
+    assert db.session.execute(db.select(db.func.count()).select_from(OutboundEmail)).scalar() == 0
+
+
+def test_failed_emails_are_retried_then_cleared(dispatcher):
+    send_reset_email('a@test.local', '123456')
+    dispatcher.pool = FakePool(fail=True)
+
+    assert dispatcher.dispatch_batch() == 1
+    email = db.session.execute(db.select(OutboundEmail)).scalar_one()
+    assert (email.status, email.attempts) == ('pending', 1)
+    assert '123456' in email.body
+
+    assert dispatcher.dispatch_batch() == 1
+    db.session.expire_all()
+    email = db.session.execute(db.select(OutboundEmail)).scalar_one()
+    assert (email.status, email.attempts, email.body) == ('failed', 2, '')
+    assert email.last_error == 'rejected'
+    assert dispatcher.dispatch_batch() == 0
+
+
+def test_failed_emails_are_purged_after_retention(dispatcher):
+    old = utcnow() - timedelta(days=8)
+    db.session.add_all([
+        OutboundEmail(to_email='old@test.local', subject='s', body='', status='failed', created_at=old),
+        OutboundEmail(to_email='new@test.local', subject='s', body='', status='failed'),
+        OutboundEmail(to_email='queued@test.local', subject='s', body='b', created_at=old),
+    ])
+    db.session.commit()
+
+    assert dispatcher.purge_failed() == 1
+    remaining = db.session.execute(db.select(OutboundEmail.to_email).order_by(OutboundEmail.id)).scalars().all()
+    assert remaining == ['new@test.local', 'queued@test.local']
+
+
+def test_unexpected_errors_count_as_failed_attempts(dispatcher):
+    class PoisonServer(FakeServer):
+        def send_message(self, msg):
+            if msg['To'] == 'poison@test.local':
+                raise ValueError('bad header')
+            super().send_message(msg)
+
+    send_reset_email('poison@test.local', '111111')
+    send_reset_email('ok@test.local', '222222')
+    dispatcher.pool = FakePool()
+    dispatcher.pool.server = PoisonServer(fail=False)
+
+    # The bad message fails on its own; the other one is still sent
+    assert dispatcher.dispatch_batch() == 2
+    assert [msg['To'] for msg in dispatcher.pool.server.sent] == ['ok@test.local']
+    email = db.session.execute(db.select(OutboundEmail)).scalar_one()
+    assert (email.to_email, email.status, email.attempts) == ('poison@test.local', 'pending', 1)
+    assert email.last_error == 'ValueError: bad header'
+
+    assert dispatcher.dispatch_batch() == 1
+    db.session.expire_all()
+    email = db.session.execute(db.select(OutboundEmail)).scalar_one()
+    assert (email.status, email.attempts) == ('failed', 2)
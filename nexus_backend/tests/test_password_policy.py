@@ -0,0 +1,72 @@
+import pytest
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models.admin_model import Admin
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.utils.hashing import hash_method, hashing_pool
+
+
+def test_hash_method_reflects_policy():
+    assert hash_method('pbkdf2', 1000) == 'pbkdf2:sha256:1000'
+    assert hash_method('scrypt', 2 ** 14) == 'scrypt:16384:8:1'
+
+
+def test_new_hashes_use_configured_policy(make_user):
+    attendee = make_user(Attendee)
+    assert attendee.password_hash.startswith('pbkdf2:sha256:1000$')
+    assert not hashing_pool.needs_rehash(attendee.password_hash)
+
+
+def test_login_upgrades_hash_made_with_old_policy(client, app):
+    attendee = Attendee(name='Old', email='old@example.com',
+                        password_hash=generate_password_hash('secret', 'pbkdf2:sha256:500'))
+    db.session.add(attendee)
+    db.session.commit()
+
+    response = client.post('/api/auth/login', json={'email': 'old@example.com', 'password': 'secret'})
+    assert response.status_code == 200
+
+    db.session.expire_all()
+    upgraded = db.session.get(Attendee, attendee.id).password_hash
+    assert upgraded.startswith('pbkdf2:sha256:1000$')
+
+    response = client.post('/api/auth/login', json={'email': 'old@example.com', 'password': 'secret'})
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).password_hash == upgraded
+
+
+def test_failed_login_does_not_rehash(client):
+    old_hash = generate_password_hash('secret', 'pbkdf2:sha256:500')
+    db.session.add(Attendee(name='Old', email='old@example.com', password_hash=old_hash))
+    db.session.commit()
+
+    assert client.post('/api/auth/login', json={'email': 'old@example.com', 'password': 'nope'}).status_code == 401
+    db.session.expire_all()
+    assert Attendee.query.filter_by(email='old@example.com').one().password_hash == old_hash
+
+
+@pytest.mark.parametrize('model', [Admin, Attendant, Attendee])
+def test_every_user_model_upgrades_old_hashes(app, model):
+    user = model(name='Old', email=f'old-{model.__name__.lower()}@example.com',
+                 password_hash=generate_password_hash('secret', 'pbkdf2:sha256:500'))
+    db.session.add(user)
+    db.session.commit()
+
+    assert not user.check_password('wrong')
+    assert user.check_password('secret')
+    db.session.expire_all()
+    assert db.session.get(model, user.id).password_hash.startswith('pbkdf2:sha256:1000$')
+
+
+@pytest.mark.parametrize('role', ['Admin', 'Attendant', 'Attendee'])
+def test_admin_creates_users_of_every_role(client, headers, make_user, role):
+    response = client.post('/api/admin/users', json={'name': 'New', 'email': 'new@example.com', 'role': role},
+                           headers=headers(make_user(Admin)))
+    assert response.status_code == 201, response.get_json()
+    # Admins have no serial; the others derive theirs from the id
+    created = response.get_json()
+    if role != 'Admin':
+        model = Attendant if role == 'Attendant' else Attendee
+        assert created['serial'] == model.serial_for(created['id'])
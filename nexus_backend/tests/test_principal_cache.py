@@ -0,0 +1,51 @@
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.utils.principal_cache import principal_cache
+
+
+def test_principal_is_cached_and_dropped_on_update(app, make_user):
+    attendee = make_user(Attendee, units='C1')
+    identity = f'attendee_{attendee.id}'
+
+    principal = principal_cache.get(identity)
+    assert principal.role == 'Attendee' and principal.units == 'C1'
+    assert principal_cache.get(identity) is principal
+    assert principal.to_dict()['email'] == attendee.email
+
+    attendee.units = 'C1,C2'
+    db.session.commit()
+    assert principal_cache.get(identity).units == 'C1,C2'
+
+
+def test_unknown_identities_have_no_principal(app):
+    assert principal_cache.get('attendee_999') is None
+    assert principal_cache.get('nobody') is None
+
+
+def test_instance_loads_the_current_row(app, make_user):
+    attendee = make_user(Attendee, units='C1')
+    principal = principal_cache.get(f'attendee_{attendee.id}')
+
+    # Another worker's write, which this process's cache never hears about
+    db.session.execute(db.update(Attendee.__table__).where(Attendee.id == attendee.id).values(units='C1,C2'))
+    db.session.commit()
+
+    assert principal.units == 'C1'
+    assert principal.instance().units == 'C1,C2'
+
+
+def test_join_keeps_enrollments_made_elsewhere(client, make_user, make_session, headers):
+    attendant = make_user(Attendant)
+    attendee = make_user(Attendee, units='C1')
+    session = make_session(attendant, course_code='C3')
+    auth = headers(attendee)
+    assert client.get('/api/attendee/profile', headers=auth).status_code == 200
+
+    db.session.execute(db.update(Attendee.__table__).where(Attendee.id == attendee.id).values(units='C1,C2'))
+    db.session.commit()
+
+    response = client.post(f'/api/attendee/sessions/{session.id}/join', headers=auth)
+    assert response.status_code == 201
+    db.session.expire_all()
+    assert db.session.get(Attendee, attendee.id).units == 'C1,C2,C3'
@@ -0,0 +1,35 @@
+from app.services.proximity import ProximityEngine
+
+
+def test_median_smooths_single_spikes():
+    engine = ProximityEngine(window=3, max_devices=4)
+    engine.observe_many('beacon', [('dev', -80), ('dev', -79), ('dev', -78)])
+    assert engine.observe('dev', 'beacon', -40) == (False, -78)
+    assert engine.observe('dev', 'beacon', -50) == (True, -50)
+
+
+def test_hysteresis_keeps_presence_between_thresholds():
+    engine = ProximityEngine(window=1, max_devices=4)
+    assert engine.observe('dev', 'beacon', -68, enter=-65, exit_=-70)[0] is False
+    assert engine.observe('dev', 'beacon', -60, enter=-65, exit_=-70)[0] is True
+    assert engine.observe('dev', 'beacon', -68, enter=-65, exit_=-70)[0] is True
+    assert engine.observe('dev', 'beacon', -72, enter=-65, exit_=-70)[0] is False
+
+
+def test_thresholds_default_from_config_and_session():
+    engine = ProximityEngine(enter_threshold=-65, hysteresis=5)
+    assert engine.thresholds() == (-65, -70)
+    session = type('Session', (), {'rssi_enter_threshold': -60, 'rssi_exit_threshold': -50})()
+    assert engine.thresholds(session) == (-60, -60)
+
+
+def test_least_recently_seen_pair_is_evicted():
+    engine = ProximityEngine(window=2, max_devices=2)
+    engine.observe_many('beacon', [('a', -50), ('b', -50)])
+    engine.observe('a', 'beacon', -50)
+    engine.observe('c', 'beacon', -90)
+    assert len(engine) == 2
+    # 'b' was evicted, so it starts again from a single sample
+    assert engine.observe('b', 'beacon', -90) == (False, -90)
+    engine.forget('b', 'beacon')
+    assert len(engine) == 1
@@ -0,0 +1,120 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from app import db
+from app.models.admin_model import Admin
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+
+REPORT_URLS = [
+    '/api/v1/reports/student/{student}/class/{session}/percentage',
+    '/api/v1/reports/class/{session}/absentees',
+    '/api/v1/reports/student/{student}/history',
+    '/api/v1/reports/class/{session}/summary',
+    '/api/v1/reports/overview',
+]
+
+
+@pytest.mark.parametrize('url', REPORT_URLS)
+def test_reports_are_admin_only(client, headers, make_user, make_session, url):
+    attendant = make_user(Attendant)
+    student = make_user(Attendee)
+    url = url.format(student=student.id, session=make_session(attendant).id)
+
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers=headers(student)).status_code == 403
+    assert client.get(url, headers=headers(attendant)).status_code == 403
+    assert client.get(url, headers=headers(make_user(Admin))).status_code == 200
+
+
+@pytest.fixture
+def term(make_user, make_session):
+    """Two C1 sessions on 1 and 2 September, one C2 session on 1 September"""
+    attendant = make_user(Attendant)
+    s1 = make_session(attendant, 'C1', created_at=datetime(2026, 9, 1, 9), title='C1 week 1')
+    s2 = make_session(attendant, 'C1', created_at=datetime(2026, 9, 2, 9), title='C1 week 2')
+    s3 = make_session(attendant, 'C2', created_at=datetime(2026, 9, 1, 10))
+    ann = make_user(Attendee, name='Ann', units='C1')
+    bob = make_user(Attendee, name='Bob', units='C1')
+    cy = make_user(Attendee, name='Cy', units='C2')
+    db.session.add_all([
+        Attendance(attendee_id=ann.id, session_id=s1.id, status='Present', timestamp=datetime(2026, 9, 1, 9, 5)),
+        Attendance(attendee_id=bob.id, session_id=s1.id, status='Late', timestamp=datetime(2026, 9, 1, 9, 20)),
+        Attendance(attendee_id=ann.id, session_id=s2.id, status='Absent', timestamp=datetime(2026, 9, 2, 9, 5)),
+        Attendance(attendee_id=cy.id, session_id=s3.id, status='Present', timestamp=datetime(2026, 9, 1, 10, 5)),
+    ])
+    db.session.commit()
+    return SimpleNamespace(s1=s1, s2=s2, s3=s3, ann=ann, bob=bob, cy=cy)
+
+
+@pytest.fixture
+def report(client, headers, make_user):
+    admin_headers = headers(make_user(Admin))
+
+    def get(url, status=200):
+        response = client.get(f'/api/v1/reports/{url}', headers=admin_headers)
+        assert response.status_code == status, response.get_json()
+        return response.get_json()
+    return get
+
+
+def test_student_percentage(term, report):
+    # Any session of the class names it; Late counts as attended
+    for student, expected in ((term.ann, 50.0), (term.bob, 50.0), (term.cy, 0.0)):
+        body = report(f'student/{student.id}/class/{term.s2.id}/percentage')
+        assert body['attendance_percentage'] == expected
+    assert report(f'student/{term.ann.id}/class/{term.s1.id}/percentage?start=2026-09-02')['attendance_percentage'] == 0.0
+    assert report(f'student/{term.ann.id}/class/{term.s1.id}/percentage?end=2026-09-01')['attendance_percentage'] == 100.0
+    assert report(f'student/{term.cy.id}/class/{term.s3.id}/percentage')['attendance_percentage'] == 100.0
+
+
+def test_class_absentees(term, report):
+    assert report(f'class/{term.s1.id}/absentees?date=2026-09-01')['absentees'] == []
+    absentees = report(f'class/{term.s1.id}/absentees?date=2026-09-02')['absentees']
+    assert [(row['student_id'], row['name'], row['missed_sessions']) for row in absentees] == [
+        (term.ann.id, 'Ann', [term.s2.id]), (term.bob.id, 'Bob', [term.s2.id])
+    ]
+    assert report(f'class/{term.s1.id}/absentees?date=2026-09-03')['absentees'] == []
+
+
+def test_student_history(term, report):
+    history = report(f'student/{term.ann.id}/history')['attendance_history']
+    assert [(row['session_id'], row['session_title'], row['course_code'], row['status']) for row in history] == [
+        (term.s1.id, 'C1 week 1', 'C1', 'Present'), (term.s2.id, 'C1 week 2', 'C1', 'Absent')
+    ]
+    assert history[0]['timestamp'] == '2026-09-01T09:05:00+00:00'
+    assert report('student/9999/history')['attendance_history'] == []
+
+
+def test_class_summary(term, report):
+    summary = report(f'class/{term.s1.id}/summary')['summary']
+    assert {key: summary[key] for key in
+            ('course_code', 'total_sessions', 'enrolled_students', 'total_records', 'status_counts', 'average_attendance')} == {
+        'course_code': 'C1', 'total_sessions': 2, 'enrolled_students': 2, 'total_records': 3,
+        'status_counts': {'Present': 1, 'Late': 1, 'Absent': 1}, 'average_attendance': 66.67
+    }
+    assert [(row['session_id'], row['total_records'], row['attended'], row['attendance_rate'])
+            for row in summary['sessions']] == [(term.s1.id, 2, 2, 100.0), (term.s2.id, 1, 0, 0)]
+    assert summary['sessions'][0]['held_at'] == '2026-09-01T09:00:00+00:00'
+
+
+def test_overview(term, report):
+    overview = report('overview')['overview']
+    records = db.session.execute(db.select(db.func.count()).select_from(Attendance)).scalar()
+    assert (overview['total_classes'], overview['total_sessions'], overview['total_students'],
+            overview['total_records'], overview['overall_attendance']) == (2, 3, 3, records, 75.0)
+    assert [(row['course_code'], row['total_sessions'], row['total_records'], row['attendance_rate'])
+            for row in overview['classes']] == [('C1', 2, 3, 66.67), ('C2', 1, 1, 100.0)]
+
+    first_day = report('overview?start=2026-09-01&end=2026-09-01')['overview']
+    assert (first_day['total_sessions'], first_day['total_records'], first_day['overall_attendance']) == (2, 3, 100.0)
+
+
+def test_unknown_class_and_bad_dates(term, report):
+    assert report(f'student/{term.ann.id}/class/9999/percentage', 404) == {'error': 'Class not found'}
+    report('class/9999/absentees', 404)
+    report('class/9999/summary', 404)
+    report(f'class/{term.s1.id}/absentees?date=yesterday', 400)
+    report(f'student/{term.ann.id}/class/{term.s1.id}/percentage?start=2026-13-01', 400)
+    report('overview?end=soon', 400)
@@ -0,0 +1,59 @@
+import pytest
+from app import db
+from app.models.attendance import Attendance
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.attendance_counts import AttendanceCounts
+from app.services import attendance_services
+from app.services.attendance_services import AttendanceService
+
+
+def statuses(session_id):
+    return dict(db.session.execute(
+        db.select(Attendance.attendee_id, Attendance.status).where(Attendance.session_id == session_id)
+    ).all())
+
+
+@pytest.fixture(params=['upsert', 'fallback'])
+def upsert_mode(request, monkeypatch):
+    """Run against INSERT ... ON CONFLICT and the SELECT + UPDATE/INSERT fallback"""
+    if request.param == 'fallback':
+        monkeypatch.setattr(attendance_services, 'UPSERT_INSERTS', {})
+    return request.param
+
+
+def test_upsert_inserts_and_updates(app, upsert_mode, make_user, make_session):
+    session = make_session(make_user(Attendant))
+    ann, bob, cy = (make_user(Attendee) for _ in range(3))
+
+    assert AttendanceService.upsert_session_attendance(session.id, [
+        {'attendee_id': ann.id}, {'attendee_id': bob.id, 'status': 'Absent'}, {'status': 'Present'}
+    ]) == 2
+    db.session.commit()
+    assert statuses(session.id) == {ann.id: 'Present', bob.id: 'Absent'}
+
+    # A later record for the same attendee wins, and existing rows are updated in place
+    assert AttendanceService.upsert_session_attendance(session.id, [
+        {'attendee_id': bob.id, 'status': 'Late'}, {'attendee_id': cy.id, 'status': 'Absent'},
+        {'attendee_id': cy.id, 'status': 'Present'}
+    ]) == 2
+    db.session.commit()
+    assert statuses(session.id) == {ann.id: 'Present', bob.id: 'Late', cy.id: 'Present'}
+    assert Attendance.query.count() == 3
+    assert AttendanceCounts.for_attendee(bob.id) == (1, 0)
+    assert AttendanceCounts.for_attendee(cy.id) == (1, 1)
+
+
+def test_roll_call_endpoint(client, make_user, make_session, headers):
+    attendant = make_user(Attendant)
+    session = make_session(attendant)
+    ann = make_user(Attendee)
+
+    body = {'attendance': [{'attendee_id': ann.id, 'status': 'Late'}]}
+    response = client.post(f'/api/attendant/attendance/{session.id}', json=body, headers=headers(attendant))
+    assert response.status_code == 200
+    assert statuses(session.id) == {ann.id: 'Late'}
+
+    other = make_user(Attendant)
+    response = client.post(f'/api/attendant/attendance/{session.id}', json=body, headers=headers(other))
+    assert response.status_code == 404
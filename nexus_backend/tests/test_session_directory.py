@@ -0,0 +1,47 @@
+import json
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.cache_version import CacheVersion
+from app.models.session_model import Session
+from app.utils.session_directory import session_directory
+
+
+def test_index_follows_session_writes(app, make_user, make_session):
+    attendant = make_user(Attendant)
+    c1 = make_session(attendant, 'C1')
+    c2 = make_session(attendant, 'C2')
+    make_session(attendant, 'C3', is_active=False)
+
+    assert len(session_directory) == 2
+    assert [s['id'] for s in json.loads(session_directory.sessions_for_units(['C2', 'C1', 'X']))] == [c1.id, c2.id]
+    assert json.loads(session_directory.sessions_for_units([])) == []
+
+    c1.is_active = False
+    db.session.commit()
+    assert [s['id'] for s in json.loads(session_directory.sessions_for_units(['C1', 'C2']))] == [c2.id]
+    scan = json.loads(session_directory.scan(['C2']))
+    assert [(s['id'], s['isEnrolled']) for s in scan] == [(c2.id, True)]
+
+
+def test_other_workers_writes_are_picked_up(app, make_user, make_session):
+    attendant = make_user(Attendant)
+    make_session(attendant, 'C1')
+    assert len(session_directory) == 1
+
+    # A write this process's mapper events never see
+    db.session.execute(db.update(Session).values(is_active=False))
+    CacheVersion.bump(db.session, 'session_directory')
+    db.session.commit()
+    assert len(session_directory) == 0
+
+
+def test_session_listings_for_attendees(client, make_user, make_session, headers):
+    attendant = make_user(Attendant)
+    c1 = make_session(attendant, 'C1')
+    c2 = make_session(attendant, 'C2')
+    auth = headers(make_user(Attendee, units='C1'))
+
+    assert [s['id'] for s in client.get('/api/attendee/sessions', headers=auth).get_json()] == [c1.id]
+    scan = client.get('/api/attendee/sessions/scan', headers=auth).get_json()
+    assert [(s['id'], s['courseCode'], s['isEnrolled']) for s in scan] == [(c1.id, 'C1', True), (c2.id, 'C2', False)]
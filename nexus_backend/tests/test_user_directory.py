@@ -0,0 +1,43 @@
+from app import db
+from app.models.admin_model import Admin
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.user_directory import UserDirectory
+
+
+def test_directory_tracks_user_inserts_updates_and_deletes(make_user):
+    attendant = make_user(Attendant, email='Teacher@Example.com')
+
+    entry = UserDirectory.lookup('  teacher@EXAMPLE.com ')
+    assert (entry.role, entry.user_id) == ('Attendant', attendant.id)
+
+    attendant.email = 'new@example.com'
+    db.session.commit()
+    assert UserDirectory.lookup('teacher@example.com') is None
+    assert UserDirectory.find_user('NEW@example.com').id == attendant.id
+
+    db.session.delete(attendant)
+    db.session.commit()
+    assert not UserDirectory.exists('new@example.com')
+
+
+def test_login_resolves_any_role_case_insensitively(client, make_user):
+    make_user(Admin, email='admin@example.com', password='secret')
+    attendee = make_user(Attendee, email='student@example.com', password='secret')
+
+    response = client.post('/api/auth/login', json={'email': 'STUDENT@example.com', 'password': 'secret'})
+    assert response.status_code == 200
+    assert response.get_json()['user']['id'] == attendee.id
+    assert response.get_json()['user']['role'] == 'Attendee'
+
+    response = client.post('/api/auth/login', json={'email': 'student@example.com', 'password': 'wrong'})
+    assert response.status_code == 401
+
+
+def test_register_rejects_email_taken_by_another_role(client, make_user):
+    make_user(Attendee, email='taken@example.com')
+
+    response = client.post('/api/auth/register', json={
+        'name': 'Admin', 'email': 'Taken@example.com', 'password': 'pw', 'organizationName': 'Org'
+    })
+    assert response.status_code == 400
@@ -0,0 +1,33 @@
+import pytest
+from app import db
+from app.models.attendant_model import Attendant
+from app.models.attendee_model import Attendee
+from app.models.user_directory import UserDirectory
+from app.utils.hashing import HashingPoolBusy, hashing_pool
+
+
+@pytest.mark.parametrize('path', ['/api/users/attendants', '/api/users/attendees'])
+def test_create_rejects_an_email_used_by_another_role(client, headers, make_user, path):
+    admin_headers = headers(make_user(Attendant))
+    taken = make_user(Attendee if path.endswith('attendants') else Attendant)
+
+    response = client.post(path, json={'name': 'New', 'email': taken.email.upper(), 'password': 'secret1'},
+                           headers=admin_headers)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Email already exists'}
+    assert db.session.execute(db.select(db.func.count()).select_from(UserDirectory)).scalar() == 2
+
+
+@pytest.mark.parametrize('path', ['/api/users/attendants', '/api/users/attendees'])
+def test_create_answers_503_when_hashing_is_saturated(client, headers, make_user, monkeypatch, path):
+    admin_headers = headers(make_user(Attendant))
+
+    def busy(password):
+        raise HashingPoolBusy(3)
+
+    monkeypatch.setattr(hashing_pool, 'hash', busy)
+    response = client.post(path, json={'name': 'New', 'email': 'new@test.local', 'password': 'secret1'},
+                           headers=admin_headers)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+    assert not UserDirectory.exists('new@test.local')